@@ -0,0 +1,142 @@
+# benchmarks/bench_analysis.py
+"""DataAnalysisTool engine: single-pass corpus index vs the per-statistic scans it replaced.
+
+Synthetic extracted records (keywords drawn mostly from one of a few topic
+vocabularies, plus a long tail of rare terms) are analysed by CorpusIndex
+and by the previous implementation, kept here as the reference; outputs
+both compute must match. The full tool is timed too, with the artifact
+already parsed (the per-file record cache) and cold.
+
+    python benchmarks/bench_analysis.py [--papers 50000] [--repeat 3] [--json results.json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from synthetic_corpus import VOCABULARY, paper_metadata  # noqa: E402
+from research_analyst_literature_review_generator.tools.corpus_analysis import CorpusIndex  # noqa: E402
+from research_analyst_literature_review_generator.tools.data_analysis_tool import DataAnalysisTool  # noqa: E402
+from research_analyst_literature_review_generator.tools.paper_record import (  # noqa: E402
+    PaperRecord, iter_paper_records, write_paper_records
+)
+
+TOPICS = [VOCABULARY[i::4] for i in range(4)]
+
+
+def synthetic_record(index: int) -> PaperRecord:
+    rng = random.Random(index)
+    record = paper_metadata(index, f"papers/synthetic_{index:05d}.pdf")
+    record.pop("source")
+    keywords = rng.sample(TOPICS[index % 4], 6) + rng.sample(VOCABULARY, 3) + [f"term{rng.randint(0, 20000)}"]
+    record.update(
+        keywords=list(dict.fromkeys(keywords)),
+        full_text_length=rng.randint(20000, 90000),
+        methodology="..." if rng.random() < 0.9 else "",
+        conclusion="..." if rng.random() < 0.8 else "",
+    )
+    return PaperRecord.from_dict(record)
+
+
+def reference_analysis(papers: list) -> dict:
+    """The statistics as the tool computed them before, one scan each"""
+    keyword_freq = Counter(k for p in papers for k in p.keywords)
+    themes = []
+    for keyword, _ in keyword_freq.most_common(10):
+        related = [{"title": p.title, "year": p.year} for p in papers if keyword in p.keywords]
+        themes.append({"theme_name": keyword.capitalize(), "paper_count": len(related), "papers": related[:5]})
+    return {
+        "year_distribution": dict(sorted(Counter(p.year for p in papers if p.year).items())),
+        "keyword_frequency": dict(keyword_freq.most_common(20)),
+        "themes": themes,
+        "statistics": {
+            "avg_text_length": sum(p.full_text_length or 0 for p in papers) // len(papers),
+            "papers_with_methodology": sum(1 for p in papers if p.methodology),
+            "papers_with_conclusion": sum(1 for p in papers if p.conclusion),
+            "unique_authors": len(set(a for p in papers for a in p.authors)),
+        },
+        "recent_papers": sum(1 for p in papers if p.year in (2024, 2025)),
+        "older_papers": sum(1 for p in papers if p.year in (2020, 2021, 2022, 2023)),
+    }
+
+
+def index_analysis(papers: list) -> dict:
+    index = CorpusIndex(papers)
+    groups = index.year_groups((2020, 2025))
+    return {
+        "year_distribution": index.year_distribution(),
+        "keyword_frequency": index.keyword_frequency(),
+        "themes": index.themes(),
+        "statistics": index.statistics(),
+        "recent_papers": groups["recent_papers"],
+        "older_papers": groups["older_papers"],
+        "theme_clusters": index.theme_clusters(),
+        "keyword_cooccurrence": index.cooccurrence(),
+    }
+
+
+def best_of(fn, repeat: int) -> tuple:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    papers = [synthetic_record(i) for i in range(args.papers)]
+    reference_s, expected = best_of(lambda: reference_analysis(papers), 1)
+    index_s, got = best_of(lambda: index_analysis(papers), args.repeat)
+    mismatches = [key for key in expected if got[key] != expected[key]]
+
+    with tempfile.TemporaryDirectory() as directory:
+        content_file = os.path.join(directory, "extracted_content.json")
+        write_paper_records(content_file, papers)
+        tool = DataAnalysisTool(output_dir=directory)
+        start = time.perf_counter()
+        tool._run(content_file)
+        cold_s = time.perf_counter() - start
+        warm_s, _ = best_of(lambda: tool._run(content_file), args.repeat)
+        load_s, _ = best_of(lambda: list(iter_paper_records(content_file)), 1)
+
+    results = {
+        "papers": args.papers,
+        "reference_s": round(reference_s, 3),
+        "index_s": round(index_s, 3),
+        "tool_cold_s": round(cold_s, 3),
+        "tool_warm_s": round(warm_s, 3),
+        "artifact_load_s": round(load_s, 3),
+        "theme_clusters": len(got["theme_clusters"]),
+        "mismatches": mismatches,
+    }
+    print(f"📚 {args.papers} papers, {len(got['theme_clusters'])} theme clusters")
+    print(f"🐢 Reference (scan per statistic): {reference_s:.3f} s")
+    print(f"⚡ Corpus index (all statistics):  {index_s:.3f} s")
+    print(f"🧰 Tool: {warm_s:.3f} s with the artifact cached, {cold_s:.3f} s cold "
+          f"(of which parsing the artifact {load_s:.3f} s)")
+    print(f"{'✅' if not mismatches else '❌'} Shared outputs match the reference"
+          + (f" (differs: {', '.join(mismatches)})" if mismatches else ""))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
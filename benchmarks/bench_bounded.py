@@ -0,0 +1,208 @@
+# benchmarks/bench_bounded.py
+"""Bounded vs unbounded PDF parsing on pathological documents.
+
+Each document is parsed in a fresh forked process, once without limits and
+once under bounded limits (--timeout and --memory-mb per document, the
+default page and text budgets, early stop and text-less page skipping),
+recording wall time, peak memory and what the limits did. A bounded parse
+runs in a sandbox interpreter, so its time includes starting one (about
+0.3 s, paid once per thread in a real run):
+
+- paper: a normal synthetic paper (its sections must come out identical)
+- supplement: the paper followed by --book-pages pages of supplementary material
+- book: a single --book-pages page document
+- scanned: --scanned-pages image-only pages
+- heavy_page: one page with --heavy-ops text operations (slow and memory hungry)
+
+The PDF Parser Tool is then run over all of them to check that skipped and
+truncated documents are reported, and over the supplement bounded and then
+unbounded, to check that an extraction cached by a bounded run (which
+stops once the paper's sections are found) isn't served to an unbounded one.
+
+    python benchmarks/bench_bounded.py [--timeout 3] [--memory-mb 256] [--json results.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pymupdf  # noqa: E402
+from synthetic_corpus import PAGE_RECT, paper_metadata, synthetic_paper_pdf  # noqa: E402
+from research_analyst_literature_review_generator.tools import pdf_limits  # noqa: E402
+from research_analyst_literature_review_generator.tools.paper_record import PaperRecord  # noqa: E402
+from research_analyst_literature_review_generator.tools.pdf_parser_tool import PDFParserTool, parse_paper  # noqa: E402
+
+SECTION_FIELDS = ("abstract", "introduction", "methodology", "results", "conclusion")
+
+
+def supplement_pdf(pages: int) -> bytes:
+    doc = pymupdf.open(stream=synthetic_paper_pdf(0))
+    doc.insert_pdf(pymupdf.open(stream=synthetic_paper_pdf(1, pages)))
+    return doc.tobytes(garbage=3, deflate=True)
+
+
+def scanned_pdf(pages: int) -> bytes:
+    rng = random.Random(0)
+    doc = pymupdf.open()
+    for _ in range(pages):
+        pixmap = pymupdf.Pixmap(pymupdf.csGRAY, 1240, 1754, rng.randbytes(1240 * 1754), 0)
+        page = doc.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+        page.insert_image(page.rect, stream=pixmap.tobytes("png"))
+    return doc.tobytes(deflate=True)
+
+
+def heavy_page_pdf(ops: int) -> bytes:
+    rng = random.Random(0)
+    doc = pymupdf.open()
+    page = doc.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+    page.insert_text((56, 56), "Dense plot labels", fontname="helv")
+    stream = b"".join(b"BT 1 0 0 1 %d %d Tm /helv 2 Tf (w%d) Tj ET\n" % (rng.randint(0, 590), rng.randint(0, 840), i)
+                      for i in range(ops))
+    doc.update_stream(page.get_contents()[0], stream)
+    return doc.tobytes(deflate=True)
+
+
+def measure(paper: PaperRecord, limits) -> dict:
+    """Parse in a forked process; wall time, peak RSS (incl. its own children) and the content"""
+    reader, writer = os.pipe()
+    start = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        os.close(reader)
+        with contextlib.redirect_stdout(io.StringIO()):
+            content = parse_paper(paper, limits=limits)
+        with os.fdopen(writer, "wb") as f:
+            pickle.dump(content, f)
+        os._exit(0)
+    os.close(writer)
+    with os.fdopen(reader, "rb") as f:
+        data = f.read()
+    _, _, usage = os.wait4(pid, 0)
+    return {"seconds": time.perf_counter() - start, "peak_mb": usage.ru_maxrss // 1024,
+            "content": pickle.loads(data) if data else None}
+
+
+def outcome(content: dict | None) -> str:
+    if content is None:
+        return "failed"
+    if "skipped" in content:
+        return f"skipped ({content['skipped']})"
+    processing = content.get("processing") or {}
+    found = sum(1 for field in SECTION_FIELDS if content.get(field))
+    read = f"{processing.get('pages_read', '?')}/{processing.get('pages', '?')} pages"
+    stopped = processing.get("stopped")
+    return f"{found}/5 sections, {read}" + (f", stopped: {stopped}" if stopped else "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timeout", type=float, default=3.0, help="Per-document timeout of the bounded run (s)")
+    parser.add_argument("--memory-mb", type=int, default=256, help="Per-document memory cap of the bounded run")
+    parser.add_argument("--book-pages", type=int, default=400)
+    parser.add_argument("--scanned-pages", type=int, default=40)
+    parser.add_argument("--heavy-ops", type=int, default=250000)
+    parser.add_argument("--json", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    unbounded = pdf_limits.ParseLimits()
+    bounded = pdf_limits.ParseLimits.from_env(True)._replace(timeout=args.timeout, memory_mb=args.memory_mb)
+    documents = {
+        "paper": lambda: synthetic_paper_pdf(0),
+        "supplement": lambda: supplement_pdf(args.book_pages),
+        "book": lambda: synthetic_paper_pdf(2, args.book_pages),
+        "scanned": lambda: scanned_pdf(args.scanned_pages),
+        "heavy_page": lambda: heavy_page_pdf(args.heavy_ops),
+    }
+
+    results, failures = {}, []
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            records = []
+            full_lengths = {}
+            print(f"{'document':<12} {'MB':>6} {'unbounded':>10} {'peak':>7} {'bounded':>9} {'peak':>7}  outcome")
+            for index, (name, build) in enumerate(documents.items()):
+                path = os.path.join(workdir, f"{name}.pdf")
+                with open(path, "wb") as f:
+                    f.write(build())
+                records.append({**paper_metadata(index, path), "title": name})
+                paper = PaperRecord.from_dict(records[-1])
+                free, capped = measure(paper, unbounded), measure(paper, bounded)
+                full_lengths[name] = free["content"]["full_text_length"]
+                results[name] = {
+                    "file_mb": round(os.path.getsize(path) / 2 ** 20, 2),
+                    "unbounded_s": round(free["seconds"], 3), "unbounded_peak_mb": free["peak_mb"],
+                    "bounded_s": round(capped["seconds"], 3), "bounded_peak_mb": capped["peak_mb"],
+                    "unbounded": outcome(free["content"]), "bounded": outcome(capped["content"]),
+                }
+                r = results[name]
+                print(f"{name:<12} {r['file_mb']:>6} {r['unbounded_s']:>9.2f}s {r['unbounded_peak_mb']:>5}MB "
+                      f"{r['bounded_s']:>8.2f}s {r['bounded_peak_mb']:>5}MB  {r['bounded']}  (unbounded: {r['unbounded']})")
+                if capped["seconds"] > args.timeout + 2:
+                    failures.append(f"{name} took {capped['seconds']:.1f} s under a {args.timeout} s timeout")
+                if name == "paper" and any(free["content"].get(f) != capped["content"].get(f) for f in SECTION_FIELDS):
+                    failures.append("bounded sections differ from the unbounded parse")
+
+            metadata_file = os.path.join(workdir, "paper_metadata.json")
+            with open(metadata_file, "w", encoding="utf-8") as f:
+                json.dump(records, f)
+            pdf_limits.PDF_TIMEOUT, pdf_limits.PDF_MEMORY_MB = args.timeout, args.memory_mb
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                report = json.loads(PDFParserTool(output_dir=workdir)._run(metadata_file, bounded=True,
+                                                                           refresh_cache=True))
+            tool_s = time.perf_counter() - start
+
+            # A bounded run fills the extraction cache; the unbounded run after it must read every page
+            supplement_file = os.path.join(workdir, "supplement_metadata.json")
+            with open(supplement_file, "w", encoding="utf-8") as f:
+                json.dump([r for r in records if r["title"] == "supplement"], f)
+            with contextlib.redirect_stdout(io.StringIO()):
+                for run_bounded in (True, False):
+                    rerun = json.loads(PDFParserTool(output_dir=workdir)._run(
+                        supplement_file, bounded=run_bounded, refresh_cache=run_bounded, index_passages=False))
+            after_bounded = {p["title"]: p["full_text_length"] for p in rerun["papers"]}
+        finally:
+            os.chdir(previous)
+
+    skipped = {d["title"]: d["reason"] for d in report["skipped_documents"]}
+    truncated = {d["title"]: d["reason"] for d in report["truncated_documents"]}
+    print(f"\n🧰 Tool over all {len(documents)} documents (bounded): {tool_s:.2f} s, "
+          f"{report['extracted_papers']} extracted")
+    print(f"⛔ Skipped: {skipped or 'none'}")
+    print(f"✂️ Truncated: {truncated or 'none'}")
+    if "heavy_page" not in skipped:
+        failures.append("the heavy page was not reported as skipped")
+    if truncated.get("scanned") != "no_text":
+        failures.append("the scanned document was not reported as text-less")
+    if args.book_pages > bounded.max_pages and truncated.get("book") != "pages":
+        failures.append("the book was not reported as truncated")
+    stale = [name for name, length in after_bounded.items() if length != full_lengths[name]]
+    if not after_bounded:
+        failures.append("the unbounded run after a bounded one extracted nothing")
+    print(f"♻️ Unbounded parse after a bounded one: {'partial cached text for ' + ', '.join(stale) if stale else 'full text'}")
+    if stale:
+        failures.append(f"an unbounded parse was served bounded extractions ({', '.join(stale)})")
+    print("✅ Every document stayed within its budget" if not failures else "❌ " + "; ".join(failures))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"documents": results, "tool_s": round(tool_s, 3), "skipped": skipped,
+                       "truncated": truncated, "unbounded_after_bounded": after_bounded,
+                       "failures": failures}, f, indent=2)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
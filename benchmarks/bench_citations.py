@@ -0,0 +1,149 @@
+# benchmarks/bench_citations.py
+"""Bulk bibliography engine vs one CitationFormatterTool call per style.
+
+A synthetic paper_metadata.json of --papers entries is formatted as the
+report agent used to do it (APA, IEEE and MLA in separate calls, each
+reloading the file and formatting from scratch; kept here as the
+reference) and with the bibliography engine: per-style calls, one call
+for all three styles, and one call that also exports BibTeX and CSL-JSON.
+A "session" repeats APA after the three styles, as the agent tends to.
+"Cold" runs start with empty record and entry caches. APA, IEEE and MLA
+output must match the reference.
+
+    python benchmarks/bench_citations.py [--papers 20000] [--repeat 3] [--json results.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from synthetic_corpus import paper_metadata  # noqa: E402
+from research_analyst_literature_review_generator.tools import bibliography, paper_record  # noqa: E402
+from research_analyst_literature_review_generator.tools.citation_tool import CitationFormatterTool  # noqa: E402
+
+STYLES = ("APA", "IEEE", "MLA")
+# What a report agent typically does: each style once, then APA again while writing
+SESSION = STYLES + ("APA",)
+
+
+def reference_citations(metadata_file: str, style: str) -> list:
+    """One style per call, as the tool did before: reload, then format every paper"""
+    with open(metadata_file, "r", encoding="utf-8") as f:
+        papers = json.load(f)
+    citations = []
+    for paper in papers:
+        authors = paper.get("authors") or ["Unknown"]
+        title, year, doi = paper.get("title") or "Untitled", paper.get("year") or "n.d.", paper.get("doi") or ""
+        if style == "APA":
+            citation = f"{', '.join(authors[:3])}{', et al.' if len(authors) > 3 else ''} ({year}). {title}."
+            if doi:
+                citation += f" https://doi.org/{doi.replace('https://doi.org/', '')}"
+        elif style == "IEEE":
+            citation = f'{", ".join(a.split()[-1] for a in authors[:3])}, "{title}," {year}.'
+        else:
+            citation = f'{authors[0]}. "{title}." {year}.'
+        citations.append(citation)
+    return citations
+
+
+def clear_caches():
+    paper_record._record_cache.clear()
+    bibliography._entries.clear()
+
+
+def timed(fn, repeat: int, cold: bool) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        metadata_file = os.path.join(directory, "paper_metadata.json")
+        records = [paper_metadata(i, f"papers/synthetic_{i:05d}.pdf") for i in range(args.papers)]
+        with open(metadata_file, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+        tool = CitationFormatterTool(output_dir=directory)
+
+        def per_style(styles):
+            for style in styles:
+                tool._run(metadata_file, style=style)
+
+        runs = {
+            "reference_per_style": timed(lambda: [reference_citations(metadata_file, s) for s in STYLES],
+                                         args.repeat, cold=True),
+            "reference_session": timed(lambda: [reference_citations(metadata_file, s) for s in SESSION],
+                                       args.repeat, cold=True),
+            "tool_per_style_cold": timed(lambda: per_style(STYLES), args.repeat, cold=True),
+            "tool_session_cold": timed(lambda: per_style(SESSION), args.repeat, cold=True),
+            "tool_bulk_cold": timed(lambda: tool._run(metadata_file, style="APA, IEEE, MLA"), args.repeat, cold=True),
+            "tool_bulk_warm": timed(lambda: tool._run(metadata_file, style="APA, IEEE, MLA"), args.repeat, cold=False),
+            "tool_all_formats_cold": timed(lambda: tool._run(metadata_file, style="all"), args.repeat, cold=True),
+        }
+
+        mismatches = []
+        for style in STYLES:
+            path = os.path.join(directory, "bibliography", bibliography.STYLE_FILES[style])
+            with open(path, "r", encoding="utf-8") as f:
+                if f.read().splitlines() != reference_citations(metadata_file, style):
+                    mismatches.append(style)
+        with open(os.path.join(directory, "bibliography", "references.csl.json"), "r", encoding="utf-8") as f:
+            csl_ids = [item["id"] for item in json.load(f)]
+        csl_items = len(csl_ids)
+        with open(os.path.join(directory, "bibliography", "references.bib"), "r", encoding="utf-8") as f:
+            bibtex_entries = f.read().count("@article{")
+
+        # A suffixed key must not take another entry's base key
+        writer = bibliography.BibliographyWriter(os.path.join(directory, "keys"), ["BIBTEX"], keep=0)
+        with writer:
+            keys = [writer._unique_key(base) for base in ("smith2020", "smith2020", "smith2020b", "smith2020")]
+        keys_unique = len(set(keys)) == len(keys) and len(set(csl_ids)) == csl_items
+
+    results = {
+        "papers": args.papers,
+        **{name: round(seconds, 4) for name, seconds in runs.items()},
+        "speedup_bulk_vs_reference": round(runs["reference_per_style"] / runs["tool_bulk_cold"], 2),
+        "speedup_session_vs_reference": round(runs["reference_session"] / runs["tool_session_cold"], 2),
+        "bibtex_entries": bibtex_entries,
+        "csl_items": csl_items,
+        "keys_unique": keys_unique,
+        "mismatches": mismatches,
+    }
+    print(f"📚 {args.papers} papers, styles {', '.join(STYLES)}")
+    for name, seconds in runs.items():
+        print(f"  {name:<24} {seconds:8.3f} s")
+    print(f"⚡ One bulk call: {results['speedup_bulk_vs_reference']}x the speed of one call per style; "
+          f"a {len(SESSION)}-call session: {results['speedup_session_vs_reference']}x")
+    print(f"📄 Exported {bibtex_entries} BibTeX entries and {csl_items} CSL-JSON items")
+    print(f"{'✅' if keys_unique else '❌'} BibTeX/CSL-JSON keys unique")
+    print(f"{'✅' if not mismatches else '❌'} APA/IEEE/MLA match the reference"
+          + (f" (differs: {', '.join(mismatches)})" if mismatches else ""))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if mismatches or not keys_unique or bibtex_entries != args.papers or csl_items != args.papers:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_download.py
+"""Wall-clock comparison of sequential vs concurrent PaperDownloadTool runs.
+
+Runs both acquisition modes against the local stand-in server and checks
+that they report the same papers in the same order. The sequential loop
+sleeps 0.8 s after each download; the concurrent mode instead limits PDF
+requests per host (PDF_HOST_RATE). The stand-in serves every PDF from one
+host, so concurrent mode is timed both with that limit (what a single
+publisher would see) and without it (papers spread over many hosts).
+
+    python benchmarks/bench_download.py --sizes 5 50 500 --workers 16
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from standin_server import StandInServer  # noqa: E402
+from research_analyst_literature_review_generator.tools import paper_download_tool  # noqa: E402
+from research_analyst_literature_review_generator.tools.paper_download_tool import PaperDownloadTool  # noqa: E402
+
+
+@contextlib.contextmanager
+def scratch_workdir():
+    """Run a tool inside a throwaway working directory"""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            yield workdir
+        finally:
+            os.chdir(previous)
+
+
+def timed_run(target_count: int, concurrent: bool, workers: int, host_rate: float | None = None) -> tuple[float, list]:
+    # Fresh Unpaywall cache per run so neither mode benefits from the other
+    paper_download_tool._resolvers.clear()
+    paper_download_tool._host_limiters.clear()
+    default_rate = paper_download_tool.PDF_HOST_RATE
+    if host_rate is not None:
+        paper_download_tool.PDF_HOST_RATE = host_rate
+    with scratch_workdir(), open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        result = json.loads(PaperDownloadTool()._run(
+            topic="stand-in ledgers",
+            target_count=target_count,
+            concurrent=concurrent,
+            max_workers=workers,
+        ))
+        elapsed = time.perf_counter() - start
+    paper_download_tool.PDF_HOST_RATE = default_rate
+    return elapsed, [p["title"] for p in result["papers"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--api-latency", type=float, default=0.05)
+    parser.add_argument("--pdf-latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{'papers':>7} {'sequential':>12} {'one host':>12} {'speedup':>8} {'no limit':>12} {'speedup':>8}  order")
+    for size in args.sizes:
+        # Over-supply candidates so failures never exhaust the stream
+        with StandInServer(paper_count=size * 2, api_latency=args.api_latency,
+                           pdf_latency=args.pdf_latency) as server:
+            os.environ.update(server.env())
+            # Measure acquisition, not OpenAlex cache hits from the previous run
+            os.environ["OPENALEX_CACHE_MODE"] = "off"
+            seq_time, seq_titles = timed_run(size, False, args.workers)
+            con_time, con_titles = timed_run(size, True, args.workers)
+            free_time, free_titles = timed_run(size, True, args.workers, host_rate=0)
+        order = "same" if seq_titles == con_titles == free_titles else "DIFFERENT"
+        print(f"{size:>7} {seq_time:>11.2f}s {con_time:>11.2f}s {seq_time / con_time:>7.1f}x "
+              f"{free_time:>11.2f}s {seq_time / free_time:>7.1f}x  {order}")
+
+
+if __name__ == "__main__":
+    main()
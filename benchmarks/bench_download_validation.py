@@ -0,0 +1,170 @@
+# benchmarks/bench_download_validation.py
+"""Validated, atomic and resumable PDF downloads against bad responses.
+
+Each stand-in server route (a good PDF, an HTML paywall page, a paywall page
+labelled as PDF, a truncated PDF, an interrupted PDF on a server taking
+Range requests and an oversized PDF) is fetched with download_pdf and with
+the previous implementation, kept here as the reference, recording what
+ended up on disk and how many bytes the server had to send. A transfer cut
+off with no retries left is then finished by a second call, as a later run
+would. Finally PaperDownloadTool runs over a corpus where some OpenAlex
+links are bad: every file it reports must be a readable PDF. (It takes longer
+than the reference, which counts the bad links as papers: rejected ones
+fall back to Unpaywall, whose lookups are rate-limited.)
+
+    python benchmarks/bench_download_validation.py [--papers 24] [--pages 4] [--json results.json]
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pymupdf  # noqa: E402
+from standin_server import HUGE_PDF_BYTES, StandInServer  # noqa: E402
+from research_analyst_literature_review_generator.tools import paper_download_tool  # noqa: E402
+from research_analyst_literature_review_generator.tools.paper_download_tool import (  # noqa: E402
+    SESSION, PaperDownloadTool, download_pdf, is_pdf_file
+)
+
+# Route -> whether the download must succeed
+ROUTES = {"pdf": True, "html": False, "mislabeled": False, "truncated": False, "flaky": True, "huge": False}
+
+
+def reference_download_pdf(pdf_url, filepath, cancel=None):
+    """The previous download_pdf: any 200 response is streamed straight into ``filepath``"""
+    try:
+        with SESSION.get(pdf_url, headers={"Accept": "application/pdf"}, timeout=60, stream=True,
+                         allow_redirects=True) as r:
+            if r.status_code != 200:
+                return False
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, "wb") as f:
+                for chunk in r.iter_content(chunk_size=1024 * 64):
+                    if chunk:
+                        f.write(chunk)
+        return True
+    except Exception:
+        return False
+
+
+def readable_pdf(path: str) -> bool:
+    if not os.path.exists(path) or not is_pdf_file(path):
+        return False
+    try:
+        with pymupdf.open(path) as doc:
+            return doc.page_count > 0 and bool(doc[doc.page_count - 1].get_text())
+    except Exception:
+        return False
+
+
+def fetch(server: StandInServer, fn, route: str, directory: str, name: str) -> dict:
+    before = dict(server.bytes_sent)
+    filepath = os.path.join(directory, f"{name}.pdf")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ok = fn(f"{server.base_url}/{route}/7.pdf", filepath)
+    sent = server.bytes_sent.get(route, 0) - before.get(route, 0)
+    return {
+        "ok": ok,
+        "seconds": round(time.perf_counter() - start, 3),
+        "readable": readable_pdf(filepath),
+        "file_left": os.path.exists(filepath),
+        "partials_left": len(glob.glob(filepath + ".*.part")),
+        "bytes_sent": sent,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=24, help="Papers the tool is asked for")
+    parser.add_argument("--pages", type=int, default=4, help="Pages per synthetic PDF")
+    parser.add_argument("--json", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    failures = []
+    results = {"routes": {}}
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir, \
+            StandInServer(paper_count=args.papers * 3, api_latency=0, pdf_latency=0, pdf_pages=args.pages,
+                          hazards=True) as server:
+        os.chdir(workdir)
+        try:
+            print(f"{'route':<11} {'new':>4} {'file':>9} {'sent KB':>9} {'s':>6}   {'old':>4} {'file':>9} {'sent KB':>9}")
+            for route, should_succeed in ROUTES.items():
+                new = fetch(server, download_pdf, route, os.path.join(workdir, "new"), route)
+                # The reference would stream all 512 MB of the oversized body to disk
+                old = fetch(server, reference_download_pdf, route, os.path.join(workdir, "old"), route) \
+                    if route != "huge" else None
+                results["routes"][route] = {"new": new, "old": old}
+
+                def describe(r):
+                    file = "valid" if r["readable"] else "corrupt" if r["file_left"] else "none"
+                    return f"{'yes' if r['ok'] else 'no':>4} {file:>9} {r['bytes_sent'] // 1024:>9}"
+                print(f"{route:<11} {describe(new)} {new['seconds']:>6.2f}   {describe(old) if old else '   -':>4}")
+
+                if new["ok"] != should_succeed or new["ok"] != new["readable"]:
+                    failures.append(f"{route}: download_pdf returned {new['ok']}")
+                if not new["ok"] and (new["file_left"] or new["partials_left"]):
+                    failures.append(f"{route}: a rejected download left files behind")
+                if route == "huge" and new["bytes_sent"] > 64 * 1024 * 1024:
+                    failures.append(f"huge: {new['bytes_sent']} bytes read of {HUGE_PDF_BYTES}")
+
+            # A transfer cut off with no retries left is kept and finished by the next call
+            paper_download_tool.PDF_DOWNLOAD_ATTEMPTS = 1
+            ranges_before = server.range_requests
+            first = fetch(server, download_pdf, "flaky", os.path.join(workdir, "later"), "flaky")
+            paper_download_tool.PDF_DOWNLOAD_ATTEMPTS = 3
+            second = fetch(server, download_pdf, "flaky", os.path.join(workdir, "later"), "flaky")
+            resumed = not first["ok"] and first["partials_left"] == 1 and second["ok"] and second["readable"] \
+                and server.range_requests > ranges_before and second["bytes_sent"] < first["bytes_sent"] * 1.5
+            results["resume_across_calls"] = {"first": first, "second": second, "resumed": resumed}
+            print(f"\n↪️ Cut-off transfer finished by a later call with a Range request: {'yes' if resumed else 'no'} "
+                  f"({first['bytes_sent'] // 1024} KB, then {second['bytes_sent'] // 1024} KB)")
+            if not resumed:
+                failures.append("an interrupted transfer was not resumed by the next call")
+
+            # End to end: bad OpenAlex links fall back to Unpaywall instead of counting as papers
+            os.environ.update(server.env())
+            os.environ["OPENALEX_CACHE_MODE"] = "off"
+            tool_runs = {}
+            for label, downloader in (("new", download_pdf), ("old", reference_download_pdf)):
+                paper_download_tool._resolvers.clear()
+                paper_download_tool.download_pdf = downloader
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        start = time.perf_counter()
+                        report = json.loads(PaperDownloadTool(output_dir=os.path.join(workdir, label))._run(
+                            topic=f"stand-in ledgers {label}", target_count=args.papers, concurrent=True,
+                            use_store=False, rank_candidates=False))
+                        seconds = time.perf_counter() - start
+                finally:
+                    paper_download_tool.download_pdf = download_pdf
+                unusable = [p["file_path"] for p in report["papers"] if not readable_pdf(p["file_path"])]
+                tool_runs[label] = {"downloaded": report["downloaded_count"], "unusable": len(unusable),
+                                    "seconds": round(seconds, 3)}
+                print(f"🧰 Tool ({label} downloader): {report['downloaded_count']} papers reported, "
+                      f"{len(unusable)} of them not readable PDFs, {seconds:.2f} s")
+            results["tool"] = tool_runs
+            if tool_runs["new"]["unusable"] or tool_runs["new"]["downloaded"] != args.papers:
+                failures.append("the tool reported unusable or too few papers")
+        finally:
+            os.chdir(previous)
+
+    print("✅ Only complete PDFs were accepted" if not failures else "❌ " + "; ".join(failures))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**results, "failures": failures}, f, indent=2)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_import.py
+"""Import-time budget check for the CLI and the tools package.
+
+Each module is imported in a fresh interpreter with ``-X importtime``; the
+cumulative time of the module itself (best of --repeat) must stay within its
+budget, and none of the heavy dependencies listed for it may be loaded.
+Exits 1 on any regression, so it can gate CI.
+
+    python benchmarks/bench_import.py [--repeat 5] [--scale 2.0] [--json results.json]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+PACKAGE = "research_analyst_literature_review_generator"
+
+HEAVY = ("crewai", "crewai_tools", "pymupdf", "requests", "litellm", "openai")
+
+# module: (budget in ms, heavy modules it must not import)
+BUDGETS = {
+    f"{PACKAGE}.main": (300, HEAVY),
+    f"{PACKAGE}.tools": (50, HEAVY),
+    f"{PACKAGE}.tools.artifacts": (50, HEAVY),
+    f"{PACKAGE}.tools.keyword_engine": (400, HEAVY),
+    f"{PACKAGE}.checkpoints": (300, HEAVY),
+}
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def import_profile(module: str) -> dict:
+    """{imported module: cumulative microseconds} for a cold import of ``module``"""
+    env = {**os.environ, "PYTHONPATH": os.path.abspath(SRC)}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    profile = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            profile[match.group(4)] = int(match.group(2))
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Cold imports per module (best of)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Budget multiplier for slow machines")
+    parser.add_argument("--json", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'module':<66} {'ms':>8} {'budget':>8}  status")
+    for module, (budget, forbidden) in BUDGETS.items():
+        profiles = [import_profile(module) for _ in range(args.repeat)]
+        best = min(p[module] for p in profiles) / 1000
+        heavy = sorted(name for name in forbidden if name in profiles[0])
+        limit = budget * args.scale
+        ok = best <= limit and not heavy
+        status = "ok" if ok else ("loads " + ", ".join(heavy) if heavy else "over budget")
+        print(f"{module:<66} {best:>8.1f} {limit:>8.0f}  {status}")
+        results.append({"module": module, "ms": round(best, 2), "budget_ms": limit, "heavy_imports": heavy, "ok": ok})
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    failed = [r["module"] for r in results if not r["ok"]]
+    if failed:
+        print(f"\n❌ Import-time regression: {', '.join(failed)}")
+        sys.exit(1)
+    print("\n✅ All imports within budget")
+
+
+if __name__ == "__main__":
+    main()
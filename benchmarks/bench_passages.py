@@ -0,0 +1,147 @@
+# benchmarks/bench_passages.py
+"""Build and query latency of the BM25 passage index over thousands of papers.
+
+Synthetic full texts (synthetic_corpus.py vocabulary, no PDFs) are indexed
+one segment per paper, exactly as the parser workers do, then registered
+and compacted; a second batch measures the incremental update. Queries are
+timed over the whole index and scoped to one review's papers, and the
+top results are checked against a brute-force BM25 over every passage.
+
+    python benchmarks/bench_passages.py [--papers 2000] [--add 50] [--queries 200] [--json results.json]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from synthetic_corpus import VOCABULARY, paper_title, paragraph  # noqa: E402
+from research_analyst_literature_review_generator.tools.passage_index import (  # noqa: E402
+    B, K1, PassageIndex, chunk_passages, index_document, tokenize
+)
+
+
+def synthetic_text(index: int, paragraphs: int) -> tuple[str, dict]:
+    """Full text and section spans of synthetic paper ``index``"""
+    rng = random.Random(index)
+    parts, spans, offset = [], {}, 0
+    for section in ("abstract", "introduction", "methodology", "results", "conclusion"):
+        body = "\n\n".join(paragraph(rng) for _ in range(paragraphs))
+        spans[section] = (offset, offset + len(body))
+        parts.append(body)
+        offset += len(body) + 2
+    return "\n\n".join(parts), spans
+
+
+def sha_of(index: int) -> str:
+    return f"{index:064x}"
+
+
+def add_papers(root: str, indexes, paragraphs: int):
+    for i in indexes:
+        text, spans = synthetic_text(i, paragraphs)
+        meta = {"title": paper_title(i), "year": 2020 + i % 6, "doi": f"10.5555/synthetic.{i}"}
+        index_document(root, sha_of(i), meta, text, spans)
+
+
+def brute_force(passages: list, query: str, top_k: int) -> list:
+    """Reference BM25 scores over (doc, passage text) pairs, best first"""
+    tokenized = [tokenize(text) for _, text in passages]
+    lengths = np.array([len(t) for t in tokenized], dtype=np.float64)
+    avgdl = lengths.mean()
+    scores = np.zeros(len(passages))
+    for term in dict.fromkeys(tokenize(query)):
+        tf = np.array([t.count(term) for t in tokenized], dtype=np.float64)
+        df = np.count_nonzero(tf)
+        idf = np.log1p((len(passages) - df + 0.5) / (df + 0.5))
+        scores += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * lengths / avgdl))
+    return sorted(scores[scores > 0], reverse=True)[:top_k]
+
+
+def percentile(values: list, q: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=2000, help="Papers in the initial index")
+    parser.add_argument("--add", type=int, default=50, help="Papers added incrementally afterwards")
+    parser.add_argument("--paragraphs", type=int, default=6, help="Paragraphs per section of each paper")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--json", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="passage-bench-")
+    try:
+        index = PassageIndex(root)
+        start = time.perf_counter()
+        add_papers(root, range(args.papers), args.paragraphs)
+        written = time.perf_counter() - start
+        index.refresh()
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        add_papers(root, range(args.papers, args.papers + args.add), args.paragraphs)
+        index.refresh()
+        incremental = time.perf_counter() - start
+        stats = index.stats()
+
+        rng = random.Random(0)
+        queries = [" ".join(rng.sample(VOCABULARY, rng.randint(2, 5))) for _ in range(args.queries)]
+        scope = {sha_of(i) for i in rng.sample(range(args.papers), 20)}
+        latencies = {"all": [], "scoped": []}
+        for query in queries:
+            for name, shas in (("all", None), ("scoped", scope)):
+                t = time.perf_counter()
+                index.search(query, top_k=args.top_k, shas=shas)
+                latencies[name].append((time.perf_counter() - t) * 1000)
+
+        # Ranking check against a brute-force BM25 over a fresh, smaller index
+        check_root = os.path.join(root, "check")
+        check = PassageIndex(check_root, max_segments=4)
+        add_papers(check_root, range(40), args.paragraphs)
+        check.refresh()
+        passages = [p for i in range(40) for p in chunk_passages(*synthetic_text(i, args.paragraphs))]
+        mismatches = 0
+        for query in queries[:20]:
+            got = [r["score"] for r in check.search(query, top_k=args.top_k)]
+            expected = brute_force(passages, query, args.top_k)
+            mismatches += not np.allclose(got, expected, atol=2e-3)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    results = {
+        **stats,
+        "build_s": round(build, 3),
+        "segments_written_s": round(written, 3),
+        "incremental_add": args.add,
+        "incremental_s": round(incremental, 3),
+        "query_ms": {name: {"p50": round(statistics.median(v), 3), "p95": round(percentile(v, 0.95), 3)}
+                     for name, v in latencies.items()},
+        "ranking_mismatches": mismatches,
+    }
+    print(f"📚 {stats['papers']} papers, {stats['passages']} passages in {stats['segments']} segments")
+    print(f"🏗️ Build {build:.2f} s (segments {written:.2f} s); +{args.add} papers in {incremental:.2f} s")
+    for name, v in results["query_ms"].items():
+        print(f"🔎 Query ({name}): p50 {v['p50']:.2f} ms, p95 {v['p95']:.2f} ms")
+    print(f"{'✅' if not mismatches else '❌'} Ranking matches brute-force BM25 on {20 - mismatches}/20 queries")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# benchmarks/bench_records.py
+"""Microbenchmark: PaperRecord codec vs plain dicts with the json module.
+
+Builds a synthetic extracted_content corpus (metadata plus section text),
+then times for each path: loading the artifact, reading the fields the
+tools use, writing it back, and a repeated load of the unchanged file (as
+when the citation tool runs once per style). Retained memory of the loaded
+corpus is measured with tracemalloc.
+
+    python benchmarks/bench_records.py [--papers 10000] [--repeat 3] [--json results.json]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from synthetic_corpus import paper_metadata, paragraph  # noqa: E402
+from research_analyst_literature_review_generator.tools import paper_record  # noqa: E402
+from research_analyst_literature_review_generator.tools.paper_record import (  # noqa: E402
+    iter_paper_records, load_paper_records, write_paper_records
+)
+
+SECTIONS = {"abstract": 1000, "introduction": 1500, "methodology": 1500, "results": 1500, "conclusion": 1000}
+
+
+def synthetic_record(index: int, with_text: bool) -> dict:
+    rng = random.Random(index)
+    record = paper_metadata(index, f"papers/synthetic_{index:05d}.pdf")
+    record.pop("source")
+    record["sha256"] = f"{index:064x}"
+    record["keywords"] = paragraph(rng, 1).rstrip(".").lower().split()[:10]
+    if with_text:
+        record["full_text_length"] = rng.randint(20000, 90000)
+        for section, chars in SECTIONS.items():
+            record[section] = paragraph(rng, 12)[:chars]
+    return record
+
+
+def consume_dicts(papers: list) -> int:
+    """The field reads the tools do, dict style"""
+    total = 0
+    for p in papers:
+        year = p.get("year") if str(p.get("year", "")).isdigit() else None
+        authors = [a for a in p.get("authors", []) if a]
+        total += len(p.get("title") or "") + len(authors) + (year or 0) + len(p.get("keywords", []))
+        total += len(p.get("methodology") or "") + (p.get("full_text_length") or 0)
+    return total
+
+
+def consume_records(papers: list) -> int:
+    total = 0
+    for p in papers:
+        total += len(p.title or "") + len(p.authors) + (p.year or 0) + len(p.keywords)
+        total += len(p.methodology or "") + (p.full_text_length or 0)
+    return total
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def retained_bytes(load) -> int:
+    """Memory still allocated after ``load()`` returns (what the loaded corpus costs)"""
+    gc.collect()
+    tracemalloc.start()
+    data = load()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return current
+
+
+def run(directory: str, papers: int, with_text: bool, repeat: int) -> dict:
+    path = os.path.join(directory, f"records_{'text' if with_text else 'meta'}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([synthetic_record(i, with_text) for i in range(papers)], f, indent=2, ensure_ascii=False)
+
+    def dict_load():
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def dict_cycle():
+        data = dict_load()
+        consume_dicts(data)
+        with open(path + ".out", "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def record_cycle():
+        data = list(iter_paper_records(path))
+        consume_records(data)
+        write_paper_records(path + ".out", data)
+
+    load_paper_records(path)  # warm the per-file cache for the repeated-load timing
+    results = {
+        "dict_json": {
+            "load_s": best_of(dict_load, repeat),
+            "cycle_s": best_of(dict_cycle, repeat),
+            "reload_s": best_of(dict_load, repeat),
+            "memory_mb": retained_bytes(dict_load) / 1e6,
+        },
+        "paper_record": {
+            "load_s": best_of(lambda: list(iter_paper_records(path)), repeat),
+            "cycle_s": best_of(record_cycle, repeat),
+            "reload_s": best_of(lambda: load_paper_records(path), repeat),
+            "memory_mb": retained_bytes(lambda: list(iter_paper_records(path))) / 1e6,
+        },
+    }
+    return {name: {k: round(v, 4) for k, v in r.items()} for name, r in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    print(f"codec: {'orjson' if paper_record.orjson is not None else 'json'}, {args.papers} papers")
+    print(f"{'corpus':<10} {'path':<13} {'load s':>8} {'cycle s':>8} {'reload s':>9} {'memory MB':>10}")
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for with_text in (False, True):
+            corpus = "extracted" if with_text else "metadata"
+            results[corpus] = run(directory, args.papers, with_text, args.repeat)
+            for name, r in results[corpus].items():
+                print(f"{corpus:<10} {name:<13} {r['load_s']:>8.3f} {r['cycle_s']:>8.3f} {r['reload_s']:>9.4f} "
+                      f"{r['memory_mb']:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
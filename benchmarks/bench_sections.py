@@ -0,0 +1,155 @@
+# benchmarks/bench_sections.py
+"""Speed and accuracy of section segmentation vs the legacy keyword scan.
+
+Accuracy is scored against benchmarks/fixtures/sections.json, built from the
+papers in papers/blockchain/ and from synthetic papers whose headings the
+fixture names (e.g. "Proposed Methodology", "EXPERIMENTAL RESULTS"): a
+section counts as correct when its slice contains the expected opening
+words, or is absent when none is expected.
+Besides the text scan and the open + extract + segment pass, each PDF is
+timed through the layout (font) pass, which now only runs as a fallback,
+and through the whole of parse_paper (keywords and signature included).
+
+    python benchmarks/bench_sections.py [extra.pdf ...] [--repeat 10]
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pymupdf  # noqa: E402
+from synthetic_corpus import synthetic_paper_pdf  # noqa: E402
+from research_analyst_literature_review_generator.tools.paper_record import PaperRecord  # noqa: E402
+from research_analyst_literature_review_generator.tools.pdf_extraction import extract_sections  # noqa: E402
+from research_analyst_literature_review_generator.tools.pdf_parser_tool import parse_paper  # noqa: E402
+from research_analyst_literature_review_generator.tools.section_segmenter import (  # noqa: E402
+    TARGET_SECTIONS,
+    segment_document,
+    select_sections,
+)
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "sections.json")
+
+
+def legacy_extract_sections(text: str) -> dict:
+    """The original multi-scan: lowercase copy, first str.find hit per keyword, fixed 1000-char slice"""
+    text_lower = text.lower()
+    sections = {}
+    section_keywords = {
+        "abstract": ["abstract"],
+        "introduction": ["introduction", "1. introduction"],
+        "methodology": ["methodology", "methods", "materials and methods"],
+        "results": ["results", "findings"],
+        "conclusion": ["conclusion", "discussion"]
+    }
+    for section, keywords in section_keywords.items():
+        for keyword in keywords:
+            idx = text_lower.find(keyword)
+            if idx != -1:
+                sections[section] = text[idx:idx+1000]
+                break
+    return sections
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def score(sections: dict, expected: dict) -> int:
+    correct = 0
+    for name in TARGET_SECTIONS:
+        want = expected.get(name)
+        got = " ".join(sections.get(name, "").split())
+        correct += (not got) if want is None else (want in got)
+    return correct
+
+
+def layout_sections(path: str, layout: bool = False) -> tuple[str, dict]:
+    with pymupdf.open(path) as doc:
+        text, boundaries = segment_document(doc, layout=layout)
+    return text, extract_sections(text, select_sections(boundaries))
+
+
+def full_parse(path: str) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parse_paper(PaperRecord(title=os.path.basename(path), file_path=path))
+
+
+def legacy_pass(path: str) -> dict:
+    with pymupdf.open(path) as doc:
+        text = "".join([page.get_text() for page in doc])
+    return legacy_extract_sections(text)
+
+
+def write_synthetic(fixtures: dict, directory: str) -> list:
+    """Write the fixtures' synthetic papers into ``directory`` under their fixture names"""
+    paths = []
+    for name, expected in fixtures.items():
+        spec = expected.get("synthetic")
+        if spec:
+            paths.append(os.path.join(directory, name))
+            with open(paths[-1], "wb") as f:
+                f.write(synthetic_paper_pdf(spec["index"], spec["pages"], tuple(spec["sections"]),
+                                             spec.get("numbered", True)))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", nargs="*", help="Extra PDFs to time (no accuracy fixtures)")
+    parser.add_argument("--repeat", type=int, default=10, help="Timing repetitions (best of)")
+    parser.add_argument("--scale", type=int, default=20, help="Text multiplier for the large-document case")
+    args = parser.parse_args()
+
+    with open(FIXTURES, "r", encoding="utf-8") as f:
+        fixtures = json.load(f)
+    workdir = tempfile.TemporaryDirectory()
+    pdfs = sorted(glob.glob(os.path.join(ROOT, "papers", "blockchain", "*.pdf"))) \
+        + write_synthetic(fixtures, workdir.name) + args.pdfs
+
+    print(f"{'document':<42} {'chars':>9} {'scan old':>9} {'scan new':>9} {'pass old':>9} "
+          f"{'pass new':>9} {'layout':>9} {'parse':>9} {'acc old':>8} {'acc new':>8}")
+    for path in pdfs:
+        name = os.path.basename(path)
+        text, sections = layout_sections(path)
+        expected = fixtures.get(name)
+        acc_old = f"{score(legacy_extract_sections(text), expected)}/5" if expected else "-"
+        acc_new = f"{score(sections, expected)}/5" if expected else "-"
+
+        cases = [(name[:42], text)]
+        if args.scale > 1:
+            cases.append((f"  x{args.scale} (book-length)", text * args.scale))
+        for label, body in cases:
+            scan_old = best_of(lambda: legacy_extract_sections(body), args.repeat)
+            scan_new = best_of(lambda: extract_sections(body), args.repeat)
+            if body is text:
+                pass_old = f"{best_of(lambda: legacy_pass(path), 3) * 1000:>8.1f}m"
+                pass_new = f"{best_of(lambda: layout_sections(path), 3) * 1000:>8.1f}m"
+                layout = f"{best_of(lambda: layout_sections(path, layout=True), 3) * 1000:>8.1f}m"
+                parse = f"{best_of(lambda: full_parse(path), 3) * 1000:>8.1f}m"
+            else:
+                pass_old = pass_new = layout = parse = f"{'-':>9}"
+            print(f"{label:<42} {len(body):>9} {scan_old * 1000:>8.2f}m {scan_new * 1000:>8.2f}m "
+                  f"{pass_old} {pass_new} {layout} {parse} {acc_old:>8} {acc_new:>8}")
+            acc_old = acc_new = ""
+    print("\nscan = segmentation of extracted text (ms); pass = PDF open + extraction + segmentation (ms); "
+          "layout = pass forced through the font-based heading detector (ms); parse = parse_paper end to end (ms)")
+    workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+# benchmarks/bench_suite.py
+"""Offline throughput and latency suite for every tool and the full crew.
+
+Everything runs against local stand-ins: a synthetic corpus of real PDFs
+(synthetic_corpus.py) served with OpenAlex/Unpaywall responses by the
+stand-in server (or recorded OpenAlex works with --recorded), and the stub
+LLM (LLM_BACKEND=stub) scripted to call the tools. Results are written as
+JSON; with --baseline, any benchmark slower than the baseline by more than
+--tolerance fails the run (exit 1).
+
+    python benchmarks/bench_suite.py --papers 20 --pages 8 --json results.json
+    python benchmarks/bench_suite.py --json new.json --baseline results.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from standin_server import StandInServer, load_recorded_works  # noqa: E402
+from research_analyst_literature_review_generator.tools import paper_download_tool  # noqa: E402
+from research_analyst_literature_review_generator.tools.artifacts import load_records, write_json  # noqa: E402
+from research_analyst_literature_review_generator.tools.citation_tool import CitationFormatterTool  # noqa: E402
+from research_analyst_literature_review_generator.tools.data_analysis_tool import DataAnalysisTool  # noqa: E402
+from research_analyst_literature_review_generator.tools.paper_record import load_paper_records  # noqa: E402
+from research_analyst_literature_review_generator.tools.paper_download_tool import PaperDownloadTool  # noqa: E402
+from research_analyst_literature_review_generator.tools.pdf_parser_tool import PDFParserTool, parse_paper  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+TOPIC = "stand-in ledgers"
+CITATION_STYLES = ("APA", "IEEE", "MLA")
+# Timings below this are mostly noise and never count as regressions
+MIN_COMPARABLE_S = 0.005
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the tools' progress output while timing"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def timed(fn, repeat: int) -> tuple[list, object]:
+    """Wall-clock seconds of ``repeat`` calls, and the last call's result"""
+    runs, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with quiet():
+            result = fn()
+        runs.append(time.perf_counter() - start)
+    return runs, result
+
+
+def summarize_runs(runs: list, items: int, latencies: list | None = None) -> dict:
+    best = min(runs)
+    summary = {
+        "items": items,
+        "runs_s": [round(r, 4) for r in runs],
+        "best_s": round(best, 4),
+        "median_s": round(statistics.median(runs), 4),
+        "throughput_per_s": round(items / best, 2) if best else None,
+    }
+    if latencies:
+        ordered = sorted(latencies)
+        summary["latency_ms"] = {
+            "p50": round(ordered[len(ordered) // 2] * 1000, 2),
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+            "max": round(ordered[-1] * 1000, 2),
+        }
+    return summary
+
+
+def bench_download(args, results: dict) -> str:
+    def run():
+        # Cold acquisition every repeat: no PDF store, no Unpaywall memo, fresh papers/
+        paper_download_tool._resolvers.clear()
+        shutil.rmtree("papers", ignore_errors=True)
+        return json.loads(PaperDownloadTool(output_dir="bench")._run(
+            topic=TOPIC, target_count=args.papers, concurrent=True,
+            max_workers=args.workers, use_store=False))
+
+    runs, result = timed(run, args.repeat)
+    results["download"] = summarize_runs(runs, result["downloaded_count"])
+    return result["metadata_file"]
+
+
+def bench_parse(args, results: dict, metadata_file: str) -> str:
+    tool = PDFParserTool(output_dir="bench")
+    runs, result = timed(lambda: json.loads(tool._run(
+        metadata_file, parallel=args.parallel, refresh_cache=True)), args.repeat)
+
+    # Per-document latency, parsed one at a time in this process
+    latencies = []
+    with quiet():
+        for paper in load_paper_records(metadata_file):
+            start = time.perf_counter()
+            parse_paper(paper)
+            latencies.append(time.perf_counter() - start)
+    results["parse_cold"] = summarize_runs(runs, result["extracted_papers"], latencies)
+
+    runs, result = timed(lambda: json.loads(tool._run(metadata_file, parallel=args.parallel)), args.repeat)
+    results["parse_cached"] = summarize_runs(runs, result["extracted_papers"])
+    return result["output_file"]
+
+
+def bench_analysis(args, results: dict, content_file: str):
+    tool = DataAnalysisTool(output_dir="bench")
+    papers = load_records(content_file)
+    runs, _ = timed(lambda: tool._run(content_file), args.repeat)
+    results["data_analysis"] = summarize_runs(runs, len(papers))
+
+    # The same corpus replicated, to see how analysis scales
+    scaled_file = os.path.join("bench", f"extracted_content_x{args.scale}.json")
+    write_json(scaled_file, papers * args.scale)
+    runs, _ = timed(lambda: tool._run(scaled_file), args.repeat)
+    results[f"data_analysis_x{args.scale}"] = summarize_runs(runs, len(papers) * args.scale)
+
+
+def bench_citations(args, results: dict, metadata_file: str):
+    tool = CitationFormatterTool(output_dir="bench")
+    papers = len(load_records(metadata_file))
+    total = []
+    for style in CITATION_STYLES:
+        runs, _ = timed(lambda: tool._run(metadata_file, style=style), args.repeat)
+        results[f"citations_{style.lower()}"] = summarize_runs(runs, papers)
+        total.append(runs)
+    results["citations_all_styles"] = summarize_runs([sum(r) for r in zip(*total)], papers * len(CITATION_STYLES))
+    runs, _ = timed(lambda: tool._run(metadata_file, style=", ".join(CITATION_STYLES)), args.repeat)
+    results["citations_bulk"] = summarize_runs(runs, papers * len(CITATION_STYLES))
+
+
+def stub_script(args, output_dir: str) -> list:
+    """Scripted stub answers that make each agent call its tool once"""
+    evaluation = {"paper_evaluations": [], "research_gaps": {}, "future_directions": {}}
+    return [
+        {"match": "Download exactly", "tool": "Paper Download Tool",
+         "tool_input": {"topic": TOPIC, "target_count": args.papers, "concurrent": True,
+                        "max_workers": args.workers, "use_store": False},
+         "response": f"Downloaded papers, metadata in {output_dir}/paper_metadata.json"},
+        {"match": "Extract detailed content from all", "tool": "PDF Parser Tool",
+         "tool_input": {"metadata_file": f"{output_dir}/paper_metadata.json", "parallel": args.parallel},
+         "response": f"Extracted content saved to {output_dir}/extracted_content.json"},
+        {"match": "Conduct comprehensive synthesis", "tool": "Data Analysis Tool",
+         "tool_input": {"extracted_content_file": f"{output_dir}/extracted_content.json"},
+         "response": f"Synthesis saved to {output_dir}/synthesis.json"},
+        {"match": "Critically evaluate the quality of all", "response": json.dumps(evaluation)},
+        {"match": "Create a comprehensive literature review", "tool": "Citation Formatter Tool",
+         "tool_input": {"metadata_file": f"{output_dir}/paper_metadata.json", "style": "APA"},
+         "response": "# Literature Review\n\nStand-in review."},
+    ]
+
+
+def bench_crew(args, results: dict):
+    output_dir = "crew"
+    with open("stub_responses.json", "w", encoding="utf-8") as f:
+        json.dump(stub_script(args, output_dir), f)
+    os.environ["LLM_STUB_RESPONSES"] = os.path.abspath("stub_responses.json")
+
+    from research_analyst_literature_review_generator.crew import ResearchPaperAnalyzerCrew
+
+    def run():
+        paper_download_tool._resolvers.clear()
+        shutil.rmtree("papers", ignore_errors=True)
+        crew = ResearchPaperAnalyzerCrew(output_dir=output_dir)
+        crew.run(inputs={"topic": TOPIC, "target_count": args.papers}, mode=args.mode, resume=False)
+        return len(load_records(os.path.join(output_dir, "extracted_content.json")))
+
+    runs, papers = timed(run, args.crew_repeat)
+    results["crew_end_to_end"] = summarize_runs(runs, papers)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline_file: str, tolerance: float) -> list:
+    """Benchmarks whose best time regressed past ``tolerance`` relative to the baseline"""
+    with open(baseline_file, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    print(f"\n{'benchmark':<26} {'baseline':>10} {'now':>10} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]["best_s"], result["best_s"]
+        change = (new - old) / old if old else 0.0
+        flag = "  ❌" if change > tolerance and max(old, new) >= MIN_COMPARABLE_S else ""
+        print(f"{name:<26} {old:>9.3f}s {new:>9.3f}s {change:>+7.0%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=20, help="Papers in the synthetic corpus")
+    parser.add_argument("--pages", type=int, default=8, help="Pages per synthetic PDF")
+    parser.add_argument("--workers", type=int, default=8, help="Download worker pool size")
+    parser.add_argument("--parallel", action="store_true", help="Parse on the process pool")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="Stand-in API latency (s)")
+    parser.add_argument("--pdf-latency", type=float, default=0.0, help="Stand-in PDF latency (s)")
+    parser.add_argument("--recorded", help="Recorded OpenAlex works (JSON) to serve instead of synthetic ones")
+    parser.add_argument("--scale", type=int, default=50, help="Corpus multiplier for the scaled analysis run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per tool benchmark")
+    parser.add_argument("--crew-repeat", type=int, default=1, help="Runs of the end-to-end crew")
+    parser.add_argument("--mode", default="sequential", help="Crew execution mode: sequential or map_reduce")
+    parser.add_argument("--skip-crew", action="store_true", help="Only benchmark the tools")
+    parser.add_argument("--json", help="Write machine-readable results to this file")
+    parser.add_argument("--baseline", help="Earlier --json results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs the baseline")
+    args = parser.parse_args()
+    json_path = os.path.abspath(args.json) if args.json else None
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    works = load_recorded_works(args.recorded) if args.recorded else None
+
+    os.environ.update({
+        "LLM_BACKEND": "stub",
+        "OPENALEX_CACHE_MODE": "off",
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+    })
+    # The stand-in serves every PDF from one host, where the per-host limit
+    # would only time its own spacing (bench_download.py shows both)
+    paper_download_tool.PDF_HOST_RATE = 0
+    results = {}
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            # Over-supply candidates so unreachable ones never exhaust the stream
+            with StandInServer(paper_count=args.papers * 2, api_latency=args.api_latency,
+                               pdf_latency=args.pdf_latency, pdf_pages=args.pages, works=works) as server:
+                os.environ.update(server.env())
+                metadata_file = bench_download(args, results)
+                content_file = bench_parse(args, results, metadata_file)
+                bench_analysis(args, results, content_file)
+                bench_citations(args, results, metadata_file)
+                if not args.skip_crew:
+                    bench_crew(args, results)
+        finally:
+            os.chdir(previous)
+
+    print(f"{'benchmark':<26} {'items':>7} {'best':>9} {'median':>9} {'items/s':>10} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, r in results.items():
+        latency = r.get("latency_ms", {})
+        print(f"{name:<26} {r['items']:>7} {r['best_s']:>8.3f}s {r['median_s']:>8.3f}s "
+              f"{r['throughput_per_s'] or 0:>10.1f} {latency.get('p50', '-'):>8} {latency.get('p95', '-'):>8}")
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": vars(args),
+        "results": results,
+    }
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📊 Results: {json_path}")
+
+    if baseline_path:
+        regressions = compare(results, baseline_path, args.tolerance)
+        if regressions:
+            print(f"\n❌ Slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
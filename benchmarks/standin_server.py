@@ -0,0 +1,257 @@
+# benchmarks/standin_server.py
+"""Local HTTP stand-in for OpenAlex, Unpaywall and publisher PDF hosts.
+
+Serves a deterministic synthetic corpus with configurable per-request latency
+so the download stage can be timed without touching the network. Point the
+tools at it with the environment returned by ``StandInServer.env()``.
+Recorded OpenAlex works (``load_recorded_works``) can be replayed in place of
+the synthetic ones.
+
+Besides /pdf/<n>.pdf (which honours Range requests) it serves the responses a
+downloader must not count as papers, under the same naming:
+
+- /html/: a paywall page (text/html)
+- /mislabeled/: a paywall page labelled application/pdf
+- /truncated/: a PDF cut off half way, with the full Content-Length and no Range support
+- /flaky/: the same cut-off PDF, but Range requests for the rest succeed
+- /huge/: a PDF announced (and streamed) at HUGE_PDF_BYTES
+"""
+import copy
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from synthetic_corpus import synthetic_paper_pdf
+
+
+HUGE_PDF_BYTES = 512 * 1024 * 1024
+PAYWALL_HTML = (b"<!DOCTYPE html><html><head><title>Access this article</title></head><body>"
+                + b"<p>Log in or purchase access to read the full text.</p>" * 2000 + b"</body></html>")
+# Every n-th paper's OpenAlex PDF link points at a bad response (with hazards on);
+# Unpaywall still resolves it to a good copy
+HAZARD_ROUTES = {1: "html", 2: "flaky", 5: "truncated", 6: "mislabeled"}
+HAZARD_CYCLE = 8
+
+
+def synthetic_pdf_bytes(index: int, size: int) -> bytes:
+    """Minimal PDF-looking payload padded to ``size`` bytes"""
+    head = f"%PDF-1.4\n% stand-in paper {index}\n".encode()
+    tail = b"\n%%EOF\n"
+    return head + b"%" * max(0, size - len(head) - len(tail)) + tail
+
+
+def load_recorded_works(path: str) -> list:
+    """OpenAlex work records from a saved response (``{"results": [...]}``) or a list of them"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data["results"] if isinstance(data, dict) else data
+
+
+class StandInServer:
+    """Threaded local server emulating the APIs used by PaperDownloadTool.
+
+    Every 4th paper has no OpenAlex ``pdf_url`` (resolved via Unpaywall) and
+    every 10th paper has no reachable PDF at all (counts as a failure).
+    With ``pdf_pages`` the PDFs are real synthetic papers of that many pages
+    (see synthetic_corpus.py) instead of padded placeholders. With ``works``
+    those recorded OpenAlex records are served, each with a local PDF link.
+    With ``hazards`` some OpenAlex PDF links lead to HTML, truncated or
+    interrupted responses (see HAZARD_ROUTES).
+    """
+
+    def __init__(self, paper_count=500, api_latency=0.05, pdf_latency=0.2, pdf_size=64 * 1024,
+                 pdf_pages=0, works=None, hazards=False):
+        self.works = works
+        self.paper_count = len(works) if works else paper_count
+        self.api_latency = api_latency
+        self.pdf_latency = pdf_latency
+        self.pdf_size = pdf_size
+        self.pdf_pages = pdf_pages
+        self.hazards = hazards
+        self.requests_served = 0
+        # Body bytes written per route ("pdf", "html", ...), and Range requests answered
+        self.bytes_sent = {}
+        self.range_requests = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> dict:
+        """Environment variables that redirect the tools to this server"""
+        return {
+            "OPENALEX_BASE_URL": f"{self.base_url}/openalex/works",
+            "UNPAYWALL_BASE_URL": f"{self.base_url}/unpaywall",
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def work(self, index: int) -> dict:
+        """Synthetic (or recorded) OpenAlex work record"""
+        if self.works:
+            return self.recorded_work(index)
+        unreachable = index % 10 == 9
+        via_unpaywall = index % 4 == 3
+        pdf_url = None
+        if not via_unpaywall:
+            route = "missing" if unreachable else "pdf"
+            if self.hazards and not unreachable:
+                route = HAZARD_ROUTES.get(index % HAZARD_CYCLE, route)
+            pdf_url = f"{self.base_url}/{route}/{index}.pdf"
+        return {
+            "id": f"https://openalex.org/W{index}",
+            "title": f"Stand-in paper {index:05d} on distributed ledgers",
+            "publication_year": 2020 + index % 6,
+            "doi": None if unreachable else f"https://doi.org/10.5555/standin.{index}",
+            "authorships": [
+                {"author": {"display_name": f"Author {index}-{k}"}} for k in range(3)
+            ],
+            "best_oa_location": {"pdf_url": pdf_url} if pdf_url else None,
+            "primary_location": None,
+            "locations": [],
+            "abstract_inverted_index": {"Stand-in": [0], "abstract": [1], str(index): [2]},
+        }
+
+    def recorded_work(self, index: int) -> dict:
+        """A recorded work with its PDF served locally (never falls through to Sci-Hub)"""
+        work = copy.deepcopy(self.works[index])
+        work["best_oa_location"] = {"pdf_url": f"{self.base_url}/pdf/{index}.pdf"}
+        work["primary_location"] = None
+        work["locations"] = []
+        return work
+
+    def pdf_bytes(self, index: int) -> bytes:
+        if self.pdf_pages:
+            return synthetic_paper_pdf(index, self.pdf_pages)
+        return synthetic_pdf_bytes(index, self.pdf_size)
+
+    def count_bytes(self, route: str, size: int):
+        with self._lock:
+            self.bytes_sent[route] = self.bytes_sent.get(route, 0) + size
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body: bytes, content_type="application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _range_start(self) -> int | None:
+                value = self.headers.get("Range", "")
+                if value.startswith("bytes=") and value.endswith("-") and value[6:-1].isdigit():
+                    return int(value[6:-1])
+                return None
+
+            def _send_pdf(self, route: str, body: bytes, ranges: bool, cut: bool):
+                """``body`` (from a Range request's start if ``ranges``), stopping half way if ``cut``"""
+                start = self._range_start() if ranges else None
+                if start is not None and start >= len(body):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(body)}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(206 if start is not None else 200)
+                self.send_header("Content-Type", "application/pdf")
+                if ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                    self.send_header("ETag", f'"{route}-{len(body)}"')
+                if start is not None:
+                    with server._lock:
+                        server.range_requests += 1
+                    self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+                    body = body[start:]
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if cut and start is None:
+                    # The connection drops after half the announced body
+                    body = body[:len(body) // 2]
+                    self.close_connection = True
+                self.wfile.write(body)
+                server.count_bytes(route, len(body))
+
+            def _send_huge(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/pdf")
+                self.send_header("Content-Length", str(HUGE_PDF_BYTES))
+                self.end_headers()
+                chunk = b"%PDF-1.4\n" + b"0" * (1024 * 1024 - 9)
+                try:
+                    for _ in range(HUGE_PDF_BYTES // len(chunk)):
+                        self.wfile.write(chunk)
+                        server.count_bytes("huge", len(chunk))
+                        chunk = b"0" * len(chunk)
+                except OSError:
+                    # The client hung up, as it should
+                    self.close_connection = True
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests_served += 1
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                parts = url.path.strip("/").split("/")
+
+                if parts[:2] == ["openalex", "works"]:
+                    time.sleep(server.api_latency)
+                    cursor = query.get("cursor", ["*"])[0]
+                    offset = 0 if cursor == "*" else int(cursor)
+                    per_page = int(query.get("per_page", ["25"])[0])
+                    end = min(offset + per_page, server.paper_count)
+                    payload = {
+                        "meta": {"next_cursor": str(end) if end < server.paper_count else None},
+                        "results": [server.work(i) for i in range(offset, end)],
+                    }
+                    return self._send(200, json.dumps(payload).encode())
+
+                if parts[0] == "unpaywall":
+                    time.sleep(server.api_latency)
+                    suffix = parts[-1].rsplit(".", 1)[-1]
+                    if not suffix.isdigit():
+                        return self._send(404, b'{"error": true}')
+                    index = int(suffix)
+                    payload = {"best_oa_location": {"url_for_pdf": f"{server.base_url}/pdf/{index}.pdf"}}
+                    return self._send(200, json.dumps(payload).encode())
+
+                if parts[0] in ("pdf", "html", "mislabeled", "truncated", "flaky", "huge"):
+                    time.sleep(server.pdf_latency)
+                    index = int(parts[1].split(".")[0])
+                    if parts[0] in ("html", "mislabeled"):
+                        server.count_bytes(parts[0], len(PAYWALL_HTML))
+                        return self._send(200, PAYWALL_HTML, "text/html" if parts[0] == "html" else "application/pdf")
+                    if parts[0] == "huge":
+                        return self._send_huge()
+                    return self._send_pdf(parts[0], server.pdf_bytes(index), ranges=parts[0] != "truncated",
+                                          cut=parts[0] in ("truncated", "flaky"))
+
+                time.sleep(server.api_latency)
+                return self._send(404, b"<html>not found</html>", "text/html")
+
+        return Handler
@@ -0,0 +1,127 @@
+# benchmarks/synthetic_corpus.py
+"""Deterministic synthetic research papers as real, parseable PDFs.
+
+Each paper has a bold title, an abstract, numbered section headings in a
+larger bold font (Introduction, Methodology, Results, Conclusion,
+References) and body text drawn from a small domain vocabulary, spread over
+the requested number of pages. The same ``(index, pages)`` always yields the
+same bytes.
+
+    python benchmarks/synthetic_corpus.py out_dir --papers 50 --pages 12
+"""
+import argparse
+import json
+import os
+import random
+from functools import lru_cache
+
+import pymupdf  # PyMuPDF
+
+VOCABULARY = """
+    blockchain ledger consensus validator throughput latency sharding smart contract token federated
+    learning gradient privacy differential aggregation client server model accuracy benchmark dataset
+    transformer attention embedding retrieval graph network node edge protocol security adversarial
+    robustness energy efficiency scheduling cluster cloud edge device sensor healthcare diagnosis imaging
+    clinical patient outcome regression classification evaluation baseline ablation hyperparameter
+    convergence simulation deployment scalability interoperability governance incentive verification
+""".split()
+
+SECTIONS = ("Introduction", "Methodology", "Results", "Conclusion")
+PAGE_RECT = pymupdf.paper_rect("a4")
+MARGIN = 56
+BODY_SIZE = 10
+HEADING_SIZE = 12
+
+
+def sentence(rng: random.Random) -> str:
+    words = rng.choices(VOCABULARY, k=rng.randint(10, 22))
+    return " ".join(words).capitalize() + "."
+
+
+def paragraph(rng: random.Random, sentences: int = 6) -> str:
+    return " ".join(sentence(rng) for _ in range(sentences))
+
+
+def paper_title(index: int) -> str:
+    rng = random.Random(f"title-{index}")
+    return f"Synthetic study {index:05d} on " + " ".join(rng.sample(VOCABULARY, 3))
+
+
+@lru_cache(maxsize=256)
+def synthetic_paper_pdf(index: int, pages: int = 8, sections: tuple = SECTIONS, numbered: bool = True) -> bytes:
+    """PDF bytes for synthetic paper ``index`` with (at least) ``pages`` pages
+    and the section headings ``sections`` (numbered "1. ...", or bare)"""
+    rng = random.Random(index)
+    doc = pymupdf.open()
+    # Body pages per section, spread evenly over what's left after the first page
+    per_section = [max(1, (pages - 1) // len(sections))] * len(sections)
+    for i in range(max(0, pages - 1 - sum(per_section))):
+        per_section[i] += 1
+
+    page = doc.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+    y = MARGIN
+    page.insert_text((MARGIN, y), paper_title(index), fontsize=16, fontname="hebo")
+    y += 36
+    page.insert_text((MARGIN, y), "Abstract", fontsize=HEADING_SIZE, fontname="hebo")
+    rect = pymupdf.Rect(MARGIN, y + 8, PAGE_RECT.width - MARGIN, PAGE_RECT.height - MARGIN)
+    page.insert_textbox(rect, paragraph(rng, 8), fontsize=BODY_SIZE, fontname="helv")
+
+    for number, (title, count) in enumerate(zip(sections, per_section), 1):
+        for part in range(count):
+            page = doc.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+            y = MARGIN
+            if part == 0:
+                heading = f"{number}. {title}" if numbered else title
+                page.insert_text((MARGIN, y), heading, fontsize=HEADING_SIZE, fontname="hebo")
+                y += 10
+            rect = pymupdf.Rect(MARGIN, y + 8, PAGE_RECT.width - MARGIN, PAGE_RECT.height - MARGIN)
+            text = "\n\n".join(paragraph(rng) for _ in range(5))
+            page.insert_textbox(rect, text, fontsize=BODY_SIZE, fontname="helv")
+
+    page.insert_text((MARGIN, PAGE_RECT.height - MARGIN - 40), "References", fontsize=HEADING_SIZE, fontname="hebo")
+    page.insert_text((MARGIN, PAGE_RECT.height - MARGIN - 24), f"[1] Stand-in reference {index}.",
+                     fontsize=BODY_SIZE, fontname="helv")
+    data = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return data
+
+
+def paper_metadata(index: int, file_path: str) -> dict:
+    """paper_metadata.json record for a synthetic paper"""
+    return {
+        "title": paper_title(index),
+        "authors": [f"Author {index}-{k}" for k in range(3)],
+        "year": 2020 + index % 6,
+        "doi": f"https://doi.org/10.5555/synthetic.{index}",
+        "file_path": file_path,
+        "source": "synthetic",
+    }
+
+
+def write_corpus(directory: str, papers: int, pages: int = 8) -> list:
+    """Write ``papers`` PDFs into ``directory`` and return their metadata records"""
+    os.makedirs(directory, exist_ok=True)
+    records = []
+    for index in range(papers):
+        path = os.path.join(directory, f"synthetic_{index:05d}.pdf")
+        with open(path, "wb") as f:
+            f.write(synthetic_paper_pdf(index, pages))
+        records.append(paper_metadata(index, path))
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="Where to write the PDFs and paper_metadata.json")
+    parser.add_argument("--papers", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=8)
+    args = parser.parse_args()
+
+    records = write_corpus(args.directory, args.papers, args.pages)
+    with open(os.path.join(args.directory, "paper_metadata.json"), "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2)
+    print(f"✅ Wrote {len(records)} papers of {args.pages} pages to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
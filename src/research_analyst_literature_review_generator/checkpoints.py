@@ -0,0 +1,169 @@
+# src/research_analyst_literature_review_generator/checkpoints.py
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import yaml
+
+from .tools.artifacts import write_json
+from .tools.paper_record import load_paper_records
+from .tools.pdf_store import sha256_file
+
+PACKAGE_DIR = os.path.dirname(__file__)
+CHECKPOINT_DIRNAME = ".checkpoints"
+
+# Pipeline stages (crew task names) in execution order, with the artifact each
+# produces in the output directory
+STAGE_OUTPUTS = {
+    "create_research_strategy": "research_strategy.json",
+    "search_and_download_papers": "paper_metadata.json",
+    "extract_paper_content": "extracted_content.json",
+    "synthesize_findings": "synthesis.json",
+    "evaluate_research_quality": "evaluation.json",
+    "generate_literature_review": "literature_review_final.md",
+}
+STAGES = tuple(STAGE_OUTPUTS)
+
+# Stages whose artifacts a stage reads (mirrors the task context in tasks.yaml)
+STAGE_UPSTREAM = {
+    "create_research_strategy": (),
+    "search_and_download_papers": ("create_research_strategy",),
+    "extract_paper_content": ("search_and_download_papers",),
+    "synthesize_findings": ("extract_paper_content",),
+    "evaluate_research_quality": ("extract_paper_content",),
+    "generate_literature_review": ("create_research_strategy", "search_and_download_papers",
+                                   "extract_paper_content", "synthesize_findings", "evaluate_research_quality"),
+}
+
+# Extra task configs a stage may run (map-reduce units)
+STAGE_UNIT_TASKS = {
+    "extract_paper_content": ("extract_paper_unit",),
+    "evaluate_research_quality": ("evaluate_paper_unit", "evaluate_research_gaps"),
+}
+
+# Tool modules behind each stage; their source hash stands in for a tool version
+STAGE_TOOLS = {
+    "search_and_download_papers": ("paper_download_tool", "openalex_cache", "unpaywall_resolver", "pdf_store"),
+    "extract_paper_content": ("pdf_parser_tool", "pdf_extraction", "section_segmenter", "pdf_limits",
+                              "keyword_engine", "passage_index"),
+    "synthesize_findings": ("data_analysis_tool", "corpus_analysis", "relevance", "context_packer",
+                            "passage_search_tool", "passage_index"),
+    "evaluate_research_quality": ("context_packer", "passage_search_tool", "passage_index"),
+    "generate_literature_review": ("citation_tool", "bibliography", "context_packer"),
+}
+
+_configs = None
+
+
+def load_configs() -> tuple[dict, dict]:
+    """Raw agents.yaml and tasks.yaml (CrewBase replaces names with objects, so read the files)"""
+    global _configs
+    if _configs is None:
+        with open(os.path.join(PACKAGE_DIR, "config", "agents.yaml"), "r", encoding="utf-8") as f:
+            agents = yaml.safe_load(f)
+        with open(os.path.join(PACKAGE_DIR, "config", "tasks.yaml"), "r", encoding="utf-8") as f:
+            tasks = yaml.safe_load(f)
+        _configs = (agents, tasks)
+    return _configs
+
+
+def resolve_artifact(path: str) -> str:
+    """The .json or .jsonl variant of an artifact, whichever was written last"""
+    root, ext = os.path.splitext(path)
+    if ext not in (".json", ".jsonl"):
+        return path
+    existing = [p for p in (f"{root}.json", f"{root}.jsonl") if os.path.exists(p)]
+    return max(existing, key=os.path.getmtime) if existing else path
+
+
+def stage_output(stage: str, output_dir: str = "outputs") -> str:
+    """Path of the artifact a stage produced (.json or .jsonl)"""
+    return resolve_artifact(os.path.join(output_dir, STAGE_OUTPUTS[stage]))
+
+
+def tool_version(module: str) -> str:
+    with open(os.path.join(PACKAGE_DIR, "tools", f"{module}.py"), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def stage_inputs(stage: str, inputs: dict, llm_signature: str = "", output_dir: str = "outputs") -> dict:
+    """Everything a stage's output depends on"""
+    agents, tasks = load_configs()
+    task_names = (stage,) + STAGE_UNIT_TASKS.get(stage, ())
+    upstream = {}
+    for name in STAGE_UPSTREAM[stage]:
+        path = stage_output(name, output_dir)
+        upstream[name] = sha256_file(path) if os.path.exists(path) else None
+    return {
+        "stage": stage,
+        "inputs": inputs,
+        "tasks": {name: tasks.get(name) for name in task_names},
+        "agent": agents.get(tasks[stage].get("agent")),
+        "upstream": upstream,
+        "tools": {module: tool_version(module) for module in STAGE_TOOLS.get(stage, ())},
+        "llm": llm_signature,
+    }
+
+
+def stage_hash(stage: str, inputs: dict, llm_signature: str = "", output_dir: str = "outputs") -> str:
+    blob = json.dumps(stage_inputs(stage, inputs, llm_signature, output_dir), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def checkpoint_path(stage: str, output_dir: str = "outputs") -> str:
+    return os.path.join(output_dir, CHECKPOINT_DIRNAME, f"{stage}.json")
+
+
+def load_checkpoint(stage: str, output_dir: str = "outputs") -> dict | None:
+    try:
+        with open(checkpoint_path(stage, output_dir), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def record_checkpoint(stage: str, inputs: dict, raw: str = "", llm_signature: str = "",
+                      output_dir: str = "outputs") -> dict:
+    """Store the input hash next to the stage output once the stage has finished"""
+    output = stage_output(stage, output_dir)
+    checkpoint = {
+        "stage": stage,
+        "input_hash": stage_hash(stage, inputs, llm_signature, output_dir),
+        "output_file": output,
+        "output_sha256": sha256_file(output) if os.path.exists(output) else None,
+        "raw": raw,
+        "completed_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    path = checkpoint_path(stage, output_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_json(path, checkpoint)
+    return checkpoint
+
+
+def valid_checkpoint(stage: str, inputs: dict, llm_signature: str = "", output_dir: str = "outputs") -> dict | None:
+    """The stage's checkpoint if its inputs are unchanged and its output is intact"""
+    checkpoint = load_checkpoint(stage, output_dir)
+    if not checkpoint or not checkpoint.get("output_sha256"):
+        return None
+    output = checkpoint["output_file"]
+    if not os.path.exists(output) or sha256_file(output) != checkpoint["output_sha256"]:
+        return None
+    if checkpoint["input_hash"] != stage_hash(stage, inputs, llm_signature, output_dir):
+        return None
+    if stage == "search_and_download_papers":
+        # The PDFs are part of this stage's output too
+        if not all(p.file_path and os.path.exists(p.file_path) for p in load_paper_records(output)):
+            return None
+    return checkpoint
+
+
+def resume_point(inputs: dict, llm_signature: str = "", output_dir: str = "outputs") -> tuple[int, list]:
+    """Index of the first stage to run, and the valid checkpoints before it"""
+    checkpoints = []
+    for stage in STAGES:
+        checkpoint = valid_checkpoint(stage, inputs, llm_signature, output_dir)
+        if checkpoint is None:
+            break
+        checkpoints.append(checkpoint)
+    return len(checkpoints), checkpoints
@@ -1,25 +1,86 @@
 # src/research_analyst_literature_generator/crew.py
+import json
 import os
-from crewai import Agent, Crew, Process, Task, LLM
+from concurrent.futures import ThreadPoolExecutor
+from crewai import Agent, Crew, Process, Task
+from crewai.llms.base_llm import BaseLLM
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import FileReadTool
+from crewai.tasks.task_output import TaskOutput
 from dotenv import load_dotenv
 
+from .checkpoints import STAGE_UNIT_TASKS, STAGES, record_checkpoint, resume_point, stage_output
+from .llm_cache import build_llm, llm_backend
 from .tools import (
     PaperDownloadTool,
     PDFParserTool,
     DataAnalysisTool,
-    CitationFormatterTool
+    CitationFormatterTool,
+    ContextPackerTool,
+    PassageSearchTool
 )
+from .tools.artifacts import JSONLWriter, parse_json_text, write_json
+from .tools.context_packer import compact, dumps_compact
+from .tools.paper_record import load_paper_records
+from .tracing import TRACE_FILENAME, format_summary, get_tracer, span, start_tracing, stop_tracing, tracing_enabled
 
 load_dotenv()
 
-# Configure LLM (OpenAI)
-llm = LLM(
-    model="gpt-4o-mini",
-    api_key=os.getenv("OPENAI_API_KEY"),
-    temperature=0.7,
-)
+_llm = None
+
+
+def get_llm() -> BaseLLM:
+    """The crew's LLM, built on first use.
+
+    OpenAI, or the offline stub with LLM_BACKEND=stub, behind the response
+    cache (LLM_CACHE_MODE=record/replay/refresh, off by default).
+    """
+    global _llm
+    if _llm is None:
+        _llm = build_llm(
+            model="gpt-4o-mini",
+            api_key=os.getenv("OPENAI_API_KEY"),
+            temperature=0.7,
+        )
+    return _llm
+
+# sequential: one agent handles every paper in a single conversation
+# map_reduce: one extraction/evaluation unit per paper, run concurrently
+EXECUTION_MODES = ("sequential", "map_reduce")
+FANOUT_CONCURRENCY = int(os.getenv("FANOUT_CONCURRENCY", 4))
+
+# Stages that only depend on the extraction, run side by side in map_reduce mode
+PARALLEL_STAGES = ("synthesize_findings", "evaluate_research_quality")
+
+# Bibliographic fields come from the parser; unit answers never override them
+BIBLIOGRAPHIC_FIELDS = ("paper_id", "title", "year", "doi", "authors")
+# Per-paper text passed to a unit (characters per field)
+UNIT_TEXT_CHARS = 1500
+# Pipeline stage each map-reduce unit task belongs to (for trace summaries)
+UNIT_STAGES = {unit: stage for stage, units in STAGE_UNIT_TASKS.items() for unit in units}
+
+
+def llm_signature() -> str:
+    """Identifies the model behind every stage for checkpoint hashes"""
+    llm = get_llm()
+    return f"{llm_backend()}:{llm.model}:{llm.temperature}"
+
+
+def parse_unit_output(raw: str) -> dict:
+    """The JSON object a unit answered with ({} if it didn't)"""
+    try:
+        data = parse_json_text(raw.strip())
+    except ValueError:
+        return {}
+    if isinstance(data, list) and len(data) == 1:
+        data = data[0]
+    return data if isinstance(data, dict) else {}
+
+
+def export_trace(tracer, path: str):
+    """Write the Chrome trace and print the per-stage summary"""
+    tracer.export(path)
+    print(f"\n🧭 Trace written to {path} (open in chrome://tracing or ui.perfetto.dev)")
+    print(format_summary(tracer.summary()))
 
 
 @CrewBase
@@ -29,12 +90,18 @@ class ResearchPaperAnalyzerCrew():
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
     
-    def __init__(self):
+    def __init__(self, output_dir: str = "outputs"):
+        # crewai_tools is slow to import and only needed once a crew is built
+        from crewai_tools import FileReadTool
+        # Every artifact of this crew goes under output_dir (one per topic in batch runs)
+        self.output_dir = output_dir
         self.file_read_tool = FileReadTool()
-        self.paper_download_tool = PaperDownloadTool()
-        self.pdf_parser_tool = PDFParserTool()
-        self.data_analysis_tool = DataAnalysisTool()
-        self.citation_tool = CitationFormatterTool()
+        self.paper_download_tool = PaperDownloadTool(output_dir=output_dir)
+        self.pdf_parser_tool = PDFParserTool(output_dir=output_dir)
+        self.data_analysis_tool = DataAnalysisTool(output_dir=output_dir)
+        self.citation_tool = CitationFormatterTool(output_dir=output_dir)
+        self.context_packer_tool = ContextPackerTool(output_dir=output_dir)
+        self.passage_search_tool = PassageSearchTool(output_dir=output_dir)
     
     # ... all agent definitions stay the same ...
     
@@ -43,7 +110,7 @@ class ResearchPaperAnalyzerCrew():
         return Agent(
             config=self.agents_config['research_coordinator'],
             tools=[],
-            llm=llm,
+            llm=get_llm(),
             allow_delegation=False,
             max_iter=10,
             memory=False,
@@ -54,7 +121,7 @@ class ResearchPaperAnalyzerCrew():
         return Agent(
             config=self.agents_config['paper_discovery'],
             tools=[self.paper_download_tool],
-            llm=llm,
+            llm=get_llm(),
             allow_delegation=False,
             max_iter=10,
             memory=False,
@@ -65,7 +132,7 @@ class ResearchPaperAnalyzerCrew():
         return Agent(
             config=self.agents_config['content_extractor'],
             tools=[self.pdf_parser_tool, self.file_read_tool],
-            llm=llm,
+            llm=get_llm(),
             allow_delegation=False,
             max_iter=10,
             memory=False,
@@ -75,8 +142,8 @@ class ResearchPaperAnalyzerCrew():
     def synthesis_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['synthesis_analyst'],
-            tools=[self.data_analysis_tool, self.file_read_tool],
-            llm=llm,
+            tools=[self.data_analysis_tool, self.context_packer_tool, self.passage_search_tool, self.file_read_tool],
+            llm=get_llm(),
             allow_delegation=False,
             max_iter=10,
             memory=False,
@@ -86,8 +153,8 @@ class ResearchPaperAnalyzerCrew():
     def critical_evaluator(self) -> Agent:
         return Agent(
             config=self.agents_config['critical_evaluator'],
-            tools=[self.file_read_tool],
-            llm=llm,
+            tools=[self.context_packer_tool, self.passage_search_tool, self.file_read_tool],
+            llm=get_llm(),
             allow_delegation=False,
             max_iter=10,
             memory=False,
@@ -97,8 +164,8 @@ class ResearchPaperAnalyzerCrew():
     def report_generator(self) -> Agent:
         return Agent(
             config=self.agents_config['report_generator'],
-            tools=[self.citation_tool, self.file_read_tool],
-            llm=llm,
+            tools=[self.citation_tool, self.context_packer_tool, self.file_read_tool],
+            llm=get_llm(),
             allow_delegation=False,
             max_iter=10,
             memory=False,
@@ -110,7 +177,7 @@ class ResearchPaperAnalyzerCrew():
     def create_research_strategy(self) -> Task:
         return Task(
             config=self.tasks_config['create_research_strategy'],
-            output_file='outputs/research_strategy.json'
+            output_file='{output_dir}/research_strategy.json'
         )
     
     @task
@@ -135,16 +202,189 @@ class ResearchPaperAnalyzerCrew():
     def evaluate_research_quality(self) -> Task:
         return Task(
             config=self.tasks_config['evaluate_research_quality'],
-            output_file='outputs/evaluation.json'
+            output_file='{output_dir}/evaluation.json'
         )
     
     @task
     def generate_literature_review(self) -> Task:
         return Task(
             config=self.tasks_config['generate_literature_review'],
-            output_file='outputs/literature_review_final.md'
+            output_file='{output_dir}/literature_review_final.md'
         )
     
+    def run(self, inputs: dict, mode: str = None, max_concurrency: int = None, resume: bool = None,
+            trace: bool = None):
+        """Run the pipeline in the configured execution mode (EXECUTION_MODE).
+        
+        Stages whose input hash still matches their checkpoint are skipped and
+        the run resumes at the first stage that changed (RESUME_STAGES=0 or
+        resume=False reruns everything). With trace=True (or TRACE=1) every
+        task, agent iteration, tool run, HTTP request and LLM call is timed
+        and written to <output_dir>/trace.json (Chrome trace-event format).
+        """
+        # A caller that is already tracing (e.g. a batch) owns the trace
+        tracer = start_tracing() if tracing_enabled(trace) and get_tracer() is None else None
+        try:
+            return self._run_pipeline(inputs, mode, max_concurrency, resume)
+        finally:
+            if tracer:
+                stop_tracing()
+                export_trace(tracer, os.path.join(self.output_dir, TRACE_FILENAME))
+    
+    def _run_pipeline(self, inputs: dict, mode: str = None, max_concurrency: int = None, resume: bool = None):
+        mode = (mode or os.getenv("EXECUTION_MODE", "sequential")).lower()
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode: {mode} (expected one of {', '.join(EXECUTION_MODES)})")
+        if resume is None:
+            resume = os.getenv("RESUME_STAGES", "1") != "0"
+        inputs = {**inputs, "output_dir": self.output_dir}
+        os.makedirs(self.output_dir, exist_ok=True)
+        
+        start, checkpoints = resume_point(inputs, llm_signature(), self.output_dir) if resume else (0, [])
+        for checkpoint in checkpoints:
+            print(f"⏭️ Checkpoint matches, skipping: {checkpoint['stage']}")
+            self._record_stage_output(getattr(self, checkpoint["stage"])(), checkpoint["raw"])
+        
+        pending = STAGES[start:]
+        if mode == "map_reduce":
+            return self.run_map_reduce(inputs, max_concurrency, pending)
+        for stage in pending:
+            self._run_stage(stage, inputs)
+        return self.generate_literature_review().output
+    
+    def run_map_reduce(self, inputs: dict, max_concurrency: int = None, stages: tuple = STAGES):
+        """Fan extraction and evaluation out to one unit per paper, then merge.
+        
+        Wall-clock time for those stages follows the slowest paper instead of
+        the sum, and each LLM call only sees one paper. Synthesis runs
+        alongside the evaluation units since both only need the extraction.
+        """
+        concurrency = max(1, max_concurrency or FANOUT_CONCURRENCY)
+        pending = list(stages)
+        while pending:
+            stage = pending.pop(0)
+            if stage in PARALLEL_STAGES and pending and pending[0] in PARALLEL_STAGES:
+                other = pending.pop(0)
+                with ThreadPoolExecutor(max_workers=1) as pool:
+                    future = pool.submit(self._run_stage, stage, inputs, concurrency)
+                    self._run_stage(other, inputs, concurrency)
+                    future.result()
+            else:
+                self._run_stage(stage, inputs, concurrency)
+        return self.generate_literature_review().output
+    
+    def _run_stage(self, stage: str, inputs: dict, fan_out: int = None):
+        """Run one pipeline stage and checkpoint it; ``fan_out`` maps per-paper stages over units"""
+        task = getattr(self, stage)()
+        with span(stage, "task", fan_out=fan_out):
+            if fan_out and stage == "extract_paper_content":
+                self._map_extraction(inputs, fan_out)
+            elif fan_out and stage == "evaluate_research_quality":
+                self._map_evaluation(inputs, fan_out)
+            else:
+                self._stage_crew([task]).kickoff(inputs=inputs)
+        record_checkpoint(stage, inputs, task.output.raw if task.output else "", llm_signature(), self.output_dir)
+    
+    def _stage_crew(self, tasks: list) -> Crew:
+        """A crew for a slice of the pipeline; tasks keep their context from earlier stages"""
+        return Crew(
+            agents=[task.agent for task in tasks],
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+            memory=False,
+        )
+    
+    def _map_extraction(self, inputs: dict, concurrency: int):
+        """Parse PDFs once, extract each paper in its own unit, merge into extracted_content"""
+        metadata_file = stage_output("search_and_download_papers", self.output_dir)
+        parsed = json.loads(self.pdf_parser_tool._run(metadata_file))
+        if "error" in parsed:
+            raise RuntimeError(parsed["error"])
+        output_file = parsed["output_file"]
+        papers = [record.to_dict() for record in load_paper_records(output_file)]
+        
+        answers = self._fan_out("content_extractor", "extract_paper_unit", [
+            {**inputs, "paper_id": i, "paper": dumps_compact(compact(paper, UNIT_TEXT_CHARS))}
+            for i, paper in enumerate(papers, 1)
+        ], concurrency)
+        
+        records = []
+        for i, (paper, answer) in enumerate(zip(papers, answers), 1):
+            unit = {key: value for key, value in parse_unit_output(answer).items() if key not in BIBLIOGRAPHIC_FIELDS}
+            records.append({"paper_id": i, **paper, **unit})
+        
+        if output_file.endswith(".jsonl"):
+            with JSONLWriter(output_file) as writer:
+                for record in records:
+                    writer.write(record)
+        else:
+            write_json(output_file, records)
+        print(f"✅ Merged extraction for {len(records)} papers into {output_file}")
+        self._record_stage_output(self.extract_paper_content(), f"Per-paper extraction of {len(records)} papers "
+                                                                f"merged into {output_file}")
+        return records
+    
+    def _map_evaluation(self, inputs: dict, concurrency: int):
+        """Evaluate each paper in its own unit, reduce gaps and directions, write evaluation.json"""
+        content_file = stage_output("extract_paper_content", self.output_dir)
+        papers = [record.to_dict() for record in load_paper_records(content_file)]
+        
+        answers = self._fan_out("critical_evaluator", "evaluate_paper_unit", [
+            {**inputs, "paper_id": paper.get("paper_id", i), "paper": dumps_compact(compact(paper, UNIT_TEXT_CHARS))}
+            for i, paper in enumerate(papers, 1)
+        ], concurrency)
+        paper_evaluations = [
+            {"paper_id": paper.get("paper_id", i), **{k: v for k, v in parse_unit_output(answer).items() if k != "paper_id"}}
+            for i, (paper, answer) in enumerate(zip(papers, answers), 1)
+        ]
+        
+        # Reduce: gaps and directions need every evaluation, so one more (small) call
+        gaps = parse_unit_output(self._run_unit("critical_evaluator", "evaluate_research_gaps", {
+            **inputs, "evaluations": dumps_compact(compact(paper_evaluations, 300))
+        }))
+        evaluation = {
+            "paper_evaluations": paper_evaluations,
+            "research_gaps": gaps.get("research_gaps", {}),
+            "future_directions": gaps.get("future_directions", {})
+        }
+        output_file = os.path.join(self.output_dir, "evaluation.json")
+        write_json(output_file, evaluation)
+        print(f"✅ Merged evaluation for {len(paper_evaluations)} papers into {output_file}")
+        self._record_stage_output(self.evaluate_research_quality(), json.dumps(evaluation, ensure_ascii=False))
+        return evaluation
+    
+    def _fan_out(self, agent_name: str, task_name: str, unit_inputs: list, concurrency: int) -> list:
+        """Run one unit per input, at most ``concurrency`` at a time; answers keep input order"""
+        if not unit_inputs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(unit_inputs))) as pool:
+            return list(pool.map(lambda unit: self._run_unit(agent_name, task_name, unit), unit_inputs))
+    
+    def _run_unit(self, agent_name: str, task_name: str, inputs: dict) -> str:
+        """One single-task crew with a fresh agent (agents keep per-run state, so units never share one)"""
+        config = self.tasks_config[task_name]
+        agent = Agent(
+            config=self.agents_config[agent_name],
+            tools=[],
+            llm=get_llm(),
+            allow_delegation=False,
+            max_iter=10,
+            memory=False,
+        )
+        task = Task(description=config["description"], expected_output=config["expected_output"], agent=agent)
+        try:
+            with span(task_name, "task", stage=UNIT_STAGES.get(task_name), paper_id=inputs.get("paper_id")):
+                unit_crew = Crew(agents=[agent], tasks=[task], process=Process.sequential, verbose=False, memory=False)
+                return unit_crew.kickoff(inputs=inputs).raw
+        except Exception as e:
+            print(f"❌ {task_name} failed for paper {inputs.get('paper_id', '-')}: {e}")
+            return ""
+    
+    def _record_stage_output(self, task: Task, raw: str):
+        """Give a fanned-out task an output so later tasks still see it as context"""
+        task.output = TaskOutput(description=task.description, raw=raw, agent=task.agent.role)
+    
     @crew
     def crew(self) -> Crew:
         """Creates the Research Paper Analyzer crew"""
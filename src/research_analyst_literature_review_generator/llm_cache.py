@@ -0,0 +1,281 @@
+# src/research_analyst_literature_review_generator/llm_cache.py
+import hashlib
+import json
+import os
+import time
+from typing import Any
+
+from crewai.llms.base_llm import BaseLLM, call_stop_override
+from pydantic import BaseModel, Field
+
+from .tools.context_packer import count_tokens
+from .tools.sqlite_cache import SQLiteCache
+from .tracing import agent_finished, agent_iteration, span
+
+# record:  serve cached responses, call the model on a miss and store it
+# replay:  serve cached responses only; a miss is an error (offline / CI)
+# refresh: always call the model and overwrite the cached response
+# off:     no caching (default: the crew samples at temperature 0.7, and a
+#          rerun should get fresh answers unless LLM_CACHE_MODE asks otherwise)
+LLM_CACHE_MODES = ("record", "replay", "refresh", "off")
+LLM_BACKENDS = ("openai", "stub")
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+_llm_cache = None
+
+
+class LLMCacheMiss(RuntimeError):
+    """Raised in replay mode when a prompt has no recorded response"""
+
+
+def get_llm_cache() -> SQLiteCache:
+    """Persistent LLM response store, LRU-evicted past LLM_CACHE_MAX_BYTES"""
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = SQLiteCache("llm.sqlite", max_bytes=LLM_CACHE_MAX_BYTES)
+    return _llm_cache
+
+
+def llm_cache_mode(mode: str | None = None) -> str:
+    """Resolve the cache mode from the argument or LLM_CACHE_MODE"""
+    mode = (mode or os.getenv("LLM_CACHE_MODE", "off")).lower()
+    if mode not in LLM_CACHE_MODES:
+        raise ValueError(f"Unknown LLM cache mode: {mode} (expected one of {', '.join(LLM_CACHE_MODES)})")
+    return mode
+
+
+def llm_backend(backend: str | None = None) -> str:
+    """Resolve the LLM backend from the argument or LLM_BACKEND"""
+    backend = (backend or os.getenv("LLM_BACKEND", "openai")).lower()
+    if backend not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM backend: {backend} (expected one of {', '.join(LLM_BACKENDS)})")
+    return backend
+
+
+def normalize_messages(messages) -> list:
+    """Messages as a list of dicts, the form every provider receives"""
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+    return [dict(message) for message in messages]
+
+
+def request_key(llm: BaseLLM, messages, tools=None, response_model=None) -> str:
+    """Stable hash of everything that determines a response: model, messages and parameters"""
+    request = {
+        "provider": llm.provider,
+        "model": llm.model,
+        "messages": normalize_messages(messages),
+        "params": {
+            "temperature": llm.temperature,
+            "top_p": llm.top_p,
+            "max_tokens": llm.max_tokens,
+            "seed": llm.seed,
+            "frequency_penalty": llm.frequency_penalty,
+            "presence_penalty": llm.presence_penalty,
+            "stop": sorted(llm.stop_sequences),
+            "additional": llm.additional_params,
+        },
+        "tools": tools,
+        "response_model": response_model.model_json_schema() if response_model else None,
+    }
+    blob = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def record_usage(s, messages, result):
+    """Prompt and completion tokens on an "llm" span (gpt-4o tokenizer, for every backend)"""
+    if not s.active:
+        return
+    prompt = "\n".join(str(m.get("content", "")) for m in normalize_messages(messages))
+    completion = result if isinstance(result, str) else json.dumps(encode_response(result), default=str)
+    s.set(prompt_tokens=count_tokens(prompt), completion_tokens=count_tokens(completion))
+
+
+def is_final_answer(result) -> bool:
+    """False for native tool calls and ReAct actions, which start another iteration"""
+    if isinstance(result, list):
+        return False
+    return not (isinstance(result, str) and "Action:" in result and "Final Answer:" not in result)
+
+
+def encode_response(result) -> dict | None:
+    """JSON-safe form of a response, or None if it can't be replayed"""
+    if isinstance(result, str):
+        return {"kind": "text", "value": result}
+    if isinstance(result, BaseModel):
+        return {"kind": "model", "value": result.model_dump(mode="json")}
+    if isinstance(result, list):
+        # Native tool calls (OpenAI SDK objects); the executor accepts plain dicts
+        calls = [call.model_dump(mode="json") if isinstance(call, BaseModel) else call for call in result]
+        if all(isinstance(call, dict) for call in calls):
+            return {"kind": "tool_calls", "value": calls}
+    return None
+
+
+def decode_response(entry: dict, response_model=None):
+    if entry["kind"] == "model" and response_model is not None:
+        return response_model.model_validate(entry["value"])
+    return entry["value"]
+
+
+class CachedLLM(BaseLLM):
+    """Deterministic response cache in front of another LLM.
+
+    Responses are keyed on model, messages and sampling parameters and kept
+    in a persistent SQLite store, so a rerun with identical prompts replays
+    instantly. Calls that execute tools inside the LLM (``available_functions``)
+    always go to the model, since replaying them would skip the tool.
+    """
+
+    llm_type: str = "cached"
+    inner: Any = None
+    mode: str = "off"
+
+    @classmethod
+    def wrap(cls, inner: BaseLLM, mode: str | None = None) -> "CachedLLM":
+        return cls(
+            model=inner.model,
+            provider=inner.provider,
+            temperature=inner.temperature,
+            stop=list(inner.stop),
+            inner=inner,
+            mode=llm_cache_mode(mode),
+        )
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        agent_iteration(from_agent)
+        # The executor sets stop words on the LLM it holds; hand them to the real model
+        with span(self.model, "llm", agent=getattr(from_agent, "role", None)) as s, \
+                call_stop_override(self.inner, self.stop_sequences):
+            result, source = self._cached_call(messages, tools, callbacks, available_functions,
+                                               from_task, from_agent, response_model)
+            s.set(cache=source)
+            record_usage(s, messages, result)
+        if is_final_answer(result):
+            agent_finished(from_agent)
+        return result
+
+    def _cached_call(self, messages, tools, callbacks, available_functions, from_task, from_agent, response_model):
+        """(response, where it came from: "hit", "miss" or "bypass")"""
+        if available_functions or self.mode == "off":
+            return self._call_inner(messages, tools, callbacks, available_functions,
+                                    from_task, from_agent, response_model), "bypass"
+
+        cache = get_llm_cache()
+        key = request_key(self.inner, messages, tools, response_model)
+        if self.mode != "refresh":
+            entry = cache.get_json(key, allow_expired=True)
+            if entry is not None:
+                return decode_response(entry, response_model), "hit"
+        if self.mode == "replay":
+            raise LLMCacheMiss(f"No recorded response for {self.model} prompt {key[:12]} (LLM_CACHE_MODE=replay)")
+
+        result = self._call_inner(messages, tools, callbacks, available_functions,
+                                  from_task, from_agent, response_model)
+        entry = encode_response(result)
+        if entry is not None:
+            cache.set_json(key, entry)
+        return result, "miss"
+
+    def _call_inner(self, messages, tools, callbacks, available_functions, from_task, from_agent, response_model):
+        return self.inner.call(
+            messages,
+            tools=tools,
+            callbacks=callbacks,
+            available_functions=available_functions,
+            from_task=from_task,
+            from_agent=from_agent,
+            response_model=response_model,
+        )
+
+    def supports_function_calling(self) -> bool:
+        supports = getattr(self.inner, "supports_function_calling", None)
+        return bool(supports and supports())
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+    def get_token_usage_summary(self):
+        return self.inner.get_token_usage_summary()
+
+
+def load_stub_responses(path: str | None = None) -> list:
+    """Scripted stub responses from ``path`` or LLM_STUB_RESPONSES (empty if unset)"""
+    path = path or os.getenv("LLM_STUB_RESPONSES")
+    if not path:
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class StubLLM(BaseLLM):
+    """Offline stand-in for the OpenAI model.
+
+    Answers every prompt immediately with a deterministic ReAct final answer.
+    Responses can be scripted with LLM_STUB_RESPONSES, a JSON file of
+    ``[{"match": "substring of the task prompt", "response": "..."}]``;
+    unmatched prompts get a small JSON echo of the request. An entry with
+    ``"tool"`` and ``"tool_input"`` first calls that tool once, then answers,
+    so agent tool use can be exercised offline.
+    """
+
+    llm_type: str = "stub"
+    responses: list = Field(default_factory=lambda: load_stub_responses())
+    # Simulated model latency per call (LLM_STUB_LATENCY seconds), for timing runs
+    latency: float = Field(default_factory=lambda: float(os.getenv("LLM_STUB_LATENCY", 0)))
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        agent_iteration(from_agent)
+        with span(self.model, "llm", agent=getattr(from_agent, "role", None)) as s:
+            result = self._answer(messages, response_model)
+            record_usage(s, messages, result)
+        if is_final_answer(result):
+            agent_finished(from_agent)
+        return result
+
+    def _answer(self, messages, response_model=None):
+        if self.latency:
+            time.sleep(self.latency)
+        messages = normalize_messages(messages)
+        # The task prompt is the first user message; later ones follow tool results
+        prompt = next((str(m.get("content", "")) for m in messages if m.get("role") == "user"), "")
+        scripted = next((r for r in self.responses if r.get("match", "") in prompt), None)
+        if scripted and scripted.get("tool") and not any(
+                m.get("role") == "assistant" and "Observation:" in str(m.get("content", "")) for m in messages):
+            tool_input = json.dumps(scripted.get("tool_input", {}), ensure_ascii=False)
+            return f"Thought: I need the {scripted['tool']}\nAction: {scripted['tool']}\nAction Input: {tool_input}"
+        answer = scripted.get("response") if scripted else None
+        if answer is None:
+            digest = hashlib.sha256(json.dumps(messages, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            answer = json.dumps({"stub": True, "model": self.model, "prompt_sha256": digest[:16]})
+        if response_model is not None:
+            return response_model.model_validate_json(answer)
+        return f"Thought: I now know the final answer\nFinal Answer: {answer}"
+
+    def supports_function_calling(self) -> bool:
+        # Forces the text (ReAct) protocol, which the stub answers directly
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 128000
+
+
+def build_llm(model: str, temperature: float | None = None, backend: str | None = None,
+              cache_mode: str | None = None, **kwargs) -> BaseLLM:
+    """The crew's LLM: the configured backend behind the response cache.
+
+    LLM_BACKEND=stub runs fully offline; LLM_CACHE_MODE picks record, replay,
+    refresh or off (the default).
+    """
+    if llm_backend(backend) == "stub":
+        return StubLLM(model=model, temperature=temperature)
+
+    from crewai import LLM
+    inner = LLM(model=model, temperature=temperature, **kwargs)
+    # Wrapped even with the cache off, so LLM calls are still traced
+    return CachedLLM.wrap(inner, llm_cache_mode(cache_mode))
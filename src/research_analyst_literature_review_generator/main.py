@@ -1,14 +1,16 @@
 #!/usr/bin/env python
 # src/research_analyst_literature_generator/main.py
+import argparse
+import json
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
 
-# Fix: Use relative import or correct package name
-from .crew import ResearchPaperAnalyzerCrew
-# OR
-# from research_analyst_literature_generator.crew import ResearchPaperAnalyzerCrew
+# The crew (crewai, crewai_tools, PyMuPDF, ...) is imported inside each command,
+# so argument errors and --help return without loading it
 
 # Load environment variables
 load_dotenv()
@@ -46,10 +48,11 @@ def run():
         }
         
         print("🚀 Initializing crew...")
+        from .crew import ResearchPaperAnalyzerCrew
         crew = ResearchPaperAnalyzerCrew()
         
         print("⚙️ Starting workflow...\n")
-        result = crew.crew().kickoff(inputs=inputs)
+        result = crew.run(inputs=inputs)
         
         print("\n" + "="*70)
         print("✅ LITERATURE REVIEW GENERATION COMPLETE!")
@@ -82,9 +85,15 @@ def train():
     Train the crew for a given number of iterations (optional).
     """
     inputs = {
-        "topic": "Machine Learning in Healthcare"
+        "topic": "Machine Learning in Healthcare",
+        "target_count": 5,
+        "output_dir": "outputs"
     }
+    # Iterations need fresh model answers unless LLM_CACHE_MODE asks for
+    # recorded ones (e.g. replay for offline CI runs)
+    os.environ.setdefault("LLM_CACHE_MODE", "off")
     try:
+        from .crew import ResearchPaperAnalyzerCrew
         crew = ResearchPaperAnalyzerCrew()
         crew.crew().train(n_iterations=int(sys.argv[1]), inputs=inputs)
     except Exception as e:
@@ -96,6 +105,7 @@ def replay():
     Replay the crew execution from a specific task.
     """
     try:
+        from .crew import ResearchPaperAnalyzerCrew
         crew = ResearchPaperAnalyzerCrew()
         crew.crew().replay(task_id=sys.argv[1])
     except Exception as e:
@@ -107,10 +117,102 @@ def test():
     Test the crew execution with a sample topic.
     """
     inputs = {
-        "topic": "Explainable AI"
+        "topic": "Explainable AI",
+        "target_count": 5,
+        "output_dir": "outputs"
     }
+    # Iterations need fresh model answers unless LLM_CACHE_MODE asks for
+    # recorded ones (e.g. replay for offline CI runs)
+    os.environ.setdefault("LLM_CACHE_MODE", "off")
     try:
+        from .crew import ResearchPaperAnalyzerCrew
         crew = ResearchPaperAnalyzerCrew()
         crew.crew().test(n_iterations=int(sys.argv[1]), openai_model_name=sys.argv[2], inputs=inputs)
     except Exception as e:
         raise Exception(f"Test failed: {e}")
+
+
+def read_topics(path: str) -> list:
+    """One topic per line; blank lines and # comments are ignored"""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return list(dict.fromkeys(line for line in lines if line))
+
+
+def run_topic(topic: str, target_count: int, output_root: str) -> dict:
+    """Run the whole pipeline for one topic in its own output directory"""
+    from .crew import ResearchPaperAnalyzerCrew
+    from .tools.paper_download_tool import sanitize_filename
+
+    output_dir = os.path.join(output_root, sanitize_filename(topic))
+    started = time.perf_counter()
+    status = {"topic": topic, "output_dir": output_dir}
+    try:
+        crew = ResearchPaperAnalyzerCrew(output_dir=output_dir)
+        crew.run(inputs={"topic": topic, "target_count": target_count})
+        status["status"] = "ok"
+    except Exception as e:
+        print(f"❌ {topic}: {e}")
+        status.update(status="failed", error=str(e))
+    status["duration_s"] = round(time.perf_counter() - started, 2)
+    return status
+
+
+def batch():
+    """
+    Run the crew for every topic in a file, without prompts.
+
+    Topics run side by side (--parallel) and share the HTTP session, the PDF
+    store and the PDF parsing process pool; each gets its own output directory
+    under --output-root. Per-topic status goes to batch_summary.json.
+    """
+    parser = argparse.ArgumentParser(description="Generate literature reviews for many topics")
+    parser.add_argument("topics_file", help="Text file with one research topic per line")
+    parser.add_argument("--parallel", type=int, default=int(os.getenv("BATCH_PARALLEL", 2)),
+                        help="Topics processed at the same time")
+    parser.add_argument("--target-count", type=int, default=5, help="Papers per topic")
+    parser.add_argument("--output-root", default="outputs", help="Directory holding one folder per topic")
+    parser.add_argument("--trace", action="store_true", default=None,
+                        help="Trace all topics into <output-root>/trace.json (default: TRACE)")
+    args = parser.parse_args()
+
+    topics = read_topics(args.topics_file)
+    if not topics:
+        print(f"❌ Error: No topics in {args.topics_file}")
+        sys.exit(1)
+
+    # Load the crew once here rather than concurrently from the worker threads
+    from .crew import export_trace
+    from .tracing import TRACE_FILENAME, start_tracing, stop_tracing, tracing_enabled
+
+    # Parsing goes through the shared process pool unless explicitly disabled
+    os.environ.setdefault("PARSE_PARALLEL", "1")
+    os.makedirs(args.output_root, exist_ok=True)
+    os.makedirs("papers", exist_ok=True)
+
+    print(f"\n🚀 Batch of {len(topics)} topics, {args.parallel} at a time → {args.output_root}/")
+    started = time.perf_counter()
+    tracer = start_tracing() if tracing_enabled(args.trace) else None
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(args.parallel, len(topics)))) as pool:
+            results = list(pool.map(lambda topic: run_topic(topic, args.target_count, args.output_root), topics))
+    finally:
+        if tracer:
+            stop_tracing()
+            export_trace(tracer, os.path.join(args.output_root, TRACE_FILENAME))
+
+    summary = {
+        "topics": len(topics),
+        "succeeded": sum(r["status"] == "ok" for r in results),
+        "failed": sum(r["status"] != "ok" for r in results),
+        "duration_s": round(time.perf_counter() - started, 2),
+        "results": results
+    }
+    summary_path = os.path.join(args.output_root, "batch_summary.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    print(f"\n✅ {summary['succeeded']}/{len(topics)} topics completed in {summary['duration_s']}s")
+    print(f"📊 Summary: {summary_path}")
+    if summary["failed"]:
+        sys.exit(1)
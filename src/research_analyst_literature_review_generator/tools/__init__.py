@@ -1,12 +1,43 @@
 # tools/__init__.py
-from .paper_download_tool import PaperDownloadTool
-from .pdf_parser_tool import PDFParserTool
-from .data_analysis_tool import DataAnalysisTool
-from .citation_tool import CitationFormatterTool
+# Tools are imported on first attribute access: each one pulls in crewai, so
+# importing a helper module (artifacts, keyword_engine, ...) stays cheap.
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .paper_download_tool import PaperDownloadTool
+    from .pdf_parser_tool import PDFParserTool
+    from .data_analysis_tool import DataAnalysisTool
+    from .citation_tool import CitationFormatterTool
+    from .context_packer import ContextPackerTool
+    from .passage_search_tool import PassageSearchTool
+
+_TOOL_MODULES = {
+    'PaperDownloadTool': '.paper_download_tool',
+    'PDFParserTool': '.pdf_parser_tool',
+    'DataAnalysisTool': '.data_analysis_tool',
+    'CitationFormatterTool': '.citation_tool',
+    'ContextPackerTool': '.context_packer',
+    'PassageSearchTool': '.passage_search_tool',
+}
 
 __all__ = [
     'PaperDownloadTool',
     'PDFParserTool',
     'DataAnalysisTool',
-    'CitationFormatterTool'
+    'CitationFormatterTool',
+    'ContextPackerTool',
+    'PassageSearchTool'
 ]
+
+
+def __getattr__(name):
+    if name in _TOOL_MODULES:
+        value = getattr(importlib.import_module(_TOOL_MODULES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,77 @@
+# tools/artifacts.py
+import json
+import os
+import re
+
+from .paper_record import dumps, iter_json_records
+
+# "json": one indented array per file (default)
+# "jsonl": one record per line, appended as each paper completes
+ARTIFACT_FORMATS = ("json", "jsonl")
+
+# Agent-written artifacts (task output_file) often arrive wrapped in ```json fences
+CODE_FENCE_RE = re.compile(r"^\s*```[a-zA-Z]*\s*\n(.*?)\n?\s*```\s*$", re.DOTALL)
+
+
+def artifact_format(fmt: str | None = None) -> str:
+    """Resolve the artifact format from the argument or ARTIFACT_FORMAT"""
+    fmt = (fmt or os.getenv("ARTIFACT_FORMAT", "json")).lower()
+    if fmt not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unknown artifact format: {fmt} (expected one of {', '.join(ARTIFACT_FORMATS)})")
+    return fmt
+
+
+def artifact_path(path: str, fmt: str) -> str:
+    """``outputs/x.json`` → ``outputs/x.jsonl`` for the JSON Lines format"""
+    root, _ = os.path.splitext(path)
+    return f"{root}.{fmt}"
+
+
+class JSONLWriter:
+    """Appends one JSON record (a dict or a PaperRecord) per line, flushed as it is written.
+
+    Lines are encoded with the paper_record codec; a crash leaves every
+    completed line readable, and ``iter_records`` ignores a torn final line.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "wb")
+
+    def write(self, record):
+        self._file.write(dumps(record) + b"\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_records(path: str):
+    """Yield records from a .jsonl file lazily, or from a .json array, as plain data"""
+    return iter_json_records(path)
+
+
+def load_records(path: str) -> list:
+    """All records from a .json or .jsonl artifact"""
+    return list(iter_records(path))
+
+
+def parse_json_text(text: str):
+    """Parse JSON text, tolerating a surrounding Markdown code fence"""
+    match = CODE_FENCE_RE.match(text)
+    return json.loads(match.group(1) if match else text)
+
+
+def write_json(path: str, data):
+    """Write a whole artifact as indented JSON"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
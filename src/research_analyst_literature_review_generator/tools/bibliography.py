@@ -0,0 +1,308 @@
+# tools/bibliography.py
+import os
+import re
+import string
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import NamedTuple
+
+from .doi import normalize_doi
+from .paper_record import PaperRecord, dumps
+
+# Normalized entries kept across calls; the least recently used go past this
+ENTRY_CACHE_SIZE = int(os.getenv("CITATION_CACHE_ENTRIES", 100000))
+
+# Style name -> file the style is streamed to, in output order
+STYLE_FILES = {
+    "APA": "references.apa.txt",
+    "IEEE": "references.ieee.txt",
+    "MLA": "references.mla.txt",
+    "BIBTEX": "references.bib",
+    "CSL-JSON": "references.csl.json",
+}
+STYLE_ALIASES = {"BIB": "BIBTEX", "CSL": "CSL-JSON", "CSLJSON": "CSL-JSON", "CSL_JSON": "CSL-JSON", "JSON": "CSL-JSON"}
+
+# Lowercase name parts that belong to the family name ("Ludwig van Beethoven")
+PARTICLES = frozenset("da das de del della der des di do dos du la le ten ter van von".split())
+SUFFIXES = frozenset("jr jr. sr sr. ii iii iv".split())
+
+KEY_WORD_RE = re.compile(r"[a-z0-9]+")
+BIBTEX_ESCAPES = {
+    "\\": r"\textbackslash{}", "{": r"\{", "}": r"\}", "&": r"\&", "%": r"\%", "$": r"\$", "#": r"\#", "_": r"\_",
+}
+BIBTEX_SPECIAL_RE = re.compile(r"[\\{}&%$#_]")
+TITLE_STOPWORDS = frozenset("a an the of on in for and to with".split())
+
+
+class Name(NamedTuple):
+    display: str
+    given: str
+    family: str
+    suffix: str = ""
+
+
+def parse_name(name: str) -> Name:
+    """Split an author string into given and family names.
+
+    Handles "Family, Given", "Given Middle Family", lowercase particles
+    ("Jan van der Berg" -> family "van der Berg") and generational
+    suffixes. A single word is taken as the family name.
+    """
+    if "," in name:
+        family, _, given = name.partition(",")
+        return Name(name, given.strip(), family.strip())
+    parts = name.split()
+    if len(parts) <= 2:
+        return Name(name, parts[0] if len(parts) == 2 else "", parts[-1] if parts else "")
+    suffix = ""
+    if parts[-1].lower() in SUFFIXES:
+        suffix = parts.pop()
+    start = len(parts) - 1
+    while start > 1 and parts[start - 1].lower() in PARTICLES:
+        start -= 1
+    return Name(name, " ".join(parts[:start]), " ".join(parts[start:]), suffix)
+
+
+def family_name(name: str) -> str:
+    """The family name ``parse_name`` would give, without building the rest"""
+    if "," in name:
+        return name.partition(",")[0].strip()
+    parts = name.split()
+    return parts[-1] if len(parts) <= 2 else parse_name(name).family
+
+
+def _ascii(text: str) -> str:
+    if text.isascii():
+        return text.lower()
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+
+
+class BibEntry:
+    """A paper's bibliographic data, normalized once and reused by every style.
+
+    Author names and the citation key are parsed on first use (APA and MLA
+    need neither), and formatted citations are cached per style, so asking
+    for the same style again costs a lookup. Entries hold few objects of
+    their own: long bibliographies are built faster with less for the
+    garbage collector to traverse.
+    """
+
+    __slots__ = ("paper", "doi", "_names", "_base_key", "formatted")
+
+    def __init__(self, paper: PaperRecord, doi: str | None):
+        self.paper = paper
+        self.doi = doi
+        self._names = None
+        self._base_key = None
+        self.formatted = None
+
+    @property
+    def title(self) -> str:
+        return self.paper.title or "Untitled"
+
+    @property
+    def year(self) -> int | None:
+        return self.paper.year
+
+    @property
+    def authors(self) -> list:
+        return self.paper.authors
+
+    @property
+    def names(self) -> tuple:
+        if self._names is None:
+            self._names = tuple(map(parse_name, self.paper.authors))
+        return self._names
+
+    @property
+    def base_key(self) -> str:
+        """Citation key before de-duplication: first author's family name, year, first title word"""
+        if self._base_key is None:
+            family = "".join(KEY_WORD_RE.findall(_ascii(self.names[0].family))) if self.authors else ""
+            word = next((w for w in KEY_WORD_RE.findall(_ascii(self.title)) if w not in TITLE_STOPWORDS), "")
+            self._base_key = f"{family or 'anon'}{self.year or 'nd'}{word}"
+        return self._base_key
+
+    def matches(self, paper: PaperRecord) -> bool:
+        """Whether ``paper`` still has the metadata this entry was built from"""
+        cited = self.paper
+        return paper is cited or (paper.title == cited.title and paper.year == cited.year
+                                  and paper.doi == cited.doi and paper.authors == cited.authors)
+
+    def format(self, style: str):
+        if self.formatted is None:
+            self.formatted = {}
+        text = self.formatted.get(style)
+        if text is None:
+            text = self.formatted[style] = FORMATTERS[style](self)
+        return text
+
+
+_entries = OrderedDict()
+_entries_lock = threading.Lock()
+
+
+def bib_entry(paper: PaperRecord) -> BibEntry:
+    """The cached entry for ``paper`` (keyed by DOI, which is case-insensitive, else title and year).
+
+    An entry is rebuilt when the paper's metadata no longer matches it.
+    """
+    doi = normalize_doi(paper.doi)
+    key = doi.lower() if doi else (paper.title, paper.year)
+    with _entries_lock:
+        entry = _entries.get(key)
+        if entry is not None and entry.matches(paper):
+            _entries.move_to_end(key)
+            return entry
+    entry = BibEntry(paper, doi)
+    with _entries_lock:
+        _entries[key] = entry
+        while len(_entries) > ENTRY_CACHE_SIZE:
+            _entries.popitem(last=False)
+    return entry
+
+
+def format_apa(entry: BibEntry) -> str:
+    authors = entry.authors or ["Unknown"]
+    author_str = ", ".join(authors[:3])
+    if len(authors) > 3:
+        author_str += ", et al."
+    citation = f"{author_str} ({entry.year or 'n.d.'}). {entry.title}."
+    if entry.doi:
+        citation += f" https://doi.org/{entry.doi}"
+    return citation
+
+
+def format_ieee(entry: BibEntry) -> str:
+    author_str = ", ".join(family_name(a) for a in entry.authors[:3]) or "Unknown"
+    return f'{author_str}, "{entry.title}," {entry.year or "n.d."}.'
+
+
+def format_mla(entry: BibEntry) -> str:
+    author_str = entry.authors[0] if entry.authors else "Unknown"
+    return f'{author_str}. "{entry.title}." {entry.year or "n.d."}.'
+
+
+TEXT_STYLES = {"APA": format_apa, "IEEE": format_ieee, "MLA": format_mla}
+
+
+def _bibtex_escape(text: str) -> str:
+    return BIBTEX_SPECIAL_RE.sub(lambda m: BIBTEX_ESCAPES[m.group()], text) if BIBTEX_SPECIAL_RE.search(text) else text
+
+
+def bibtex_fields(entry: BibEntry) -> str:
+    """The fields of the entry's BibTeX record; the key is added per bibliography"""
+    lines = []
+    if entry.names:
+        authors = " and ".join(f"{n.family}, {n.suffix}, {n.given}" if n.suffix else
+                               f"{n.family}, {n.given}" if n.given else n.family for n in entry.names)
+        lines.append(f"  author = {{{_bibtex_escape(authors)}}}")
+    lines.append(f"  title = {{{{{_bibtex_escape(entry.title)}}}}}")
+    if entry.year:
+        lines.append(f"  year = {{{entry.year}}}")
+    if entry.doi:
+        # Verbatim fields in biblatex: escaping would end up in the link
+        lines.append(f"  doi = {{{entry.doi}}}")
+        lines.append(f"  url = {{https://doi.org/{entry.doi}}}")
+    return ",\n".join(lines)
+
+
+def _csl_name(name: Name) -> dict:
+    if not name.given:
+        return {"literal": name.display}
+    if name.suffix:
+        return {"family": name.family, "given": name.given, "suffix": name.suffix}
+    return {"family": name.family, "given": name.given}
+
+
+def csl_fields(entry: BibEntry) -> dict:
+    """The entry's CSL-JSON item without its "id" (added per bibliography)"""
+    item = {"type": "article-journal", "title": entry.title}
+    if entry.names:
+        item["author"] = list(map(_csl_name, entry.names))
+    if entry.year:
+        item["issued"] = {"date-parts": [[entry.year]]}
+    if entry.doi:
+        item["DOI"] = entry.doi
+        item["URL"] = f"https://doi.org/{entry.doi}"
+    return item
+
+
+# Cached per entry by BibEntry.format
+FORMATTERS = {**TEXT_STYLES, "BIBTEX": bibtex_fields, "CSL-JSON": csl_fields}
+
+
+def parse_styles(style: str) -> list:
+    """Canonical style names from "APA", "apa, bibtex", "all", ...; unknown names fall back to MLA"""
+    names = [s.strip().upper() for s in re.split(r"[,;\s]+", style or "APA") if s.strip()]
+    if "ALL" in names:
+        return list(STYLE_FILES)
+    styles = [STYLE_ALIASES.get(name, name) for name in names]
+    return list(dict.fromkeys(name if name in STYLE_FILES else "MLA" for name in styles)) or ["APA"]
+
+
+class BibliographyWriter:
+    """Streams citations of several styles to one file per style.
+
+    Entries are added one at a time and written immediately, so memory
+    stays flat however long the bibliography is; ``keep`` citations per
+    style are also collected for the tool's inline answer. BibTeX and
+    CSL-JSON keys are made unique across the bibliography (a second
+    "smith2021federated" becomes "smith2021federatedb").
+    """
+
+    def __init__(self, directory: str, styles: list, keep: int):
+        self.directory = directory
+        self.styles = styles
+        self.keep = keep
+        self.count = 0
+        self.kept = {style: [] for style in styles}
+        self.paths = {style: os.path.join(directory, STYLE_FILES[style]) for style in styles}
+        self._keys = {}
+        self._issued = set()
+        os.makedirs(directory, exist_ok=True)
+        self._files = {style: open(path, "w", encoding="utf-8") for style, path in self.paths.items()}
+        if "CSL-JSON" in self._files:
+            self._files["CSL-JSON"].write("[")
+
+    def _unique_key(self, base: str) -> str:
+        # A suffixed key may be another entry's base key ("smith2020a"), so
+        # every key handed out is checked, not just the base
+        seen = self._keys.get(base, 0)
+        key = base
+        while key in self._issued:
+            seen += 1
+            key = base + (string.ascii_lowercase[seen] if seen < 26 else str(seen))
+        self._keys[base] = seen
+        self._issued.add(key)
+        return key
+
+    def add(self, entry: BibEntry):
+        key = self._unique_key(entry.base_key) if "BIBTEX" in self._files or "CSL-JSON" in self._files else None
+        keep = self.count < self.keep
+        for style, f in self._files.items():
+            if style in TEXT_STYLES:
+                citation = entry.format(style)
+                f.write(citation + "\n")
+            elif style == "BIBTEX":
+                citation = f"@article{{{key},\n{entry.format(style)}\n}}"
+                f.write(citation + "\n\n")
+            else:
+                citation = {"id": key, **entry.format(style)}
+                f.write(("\n  " if not self.count else ",\n  ") + dumps(citation).decode("utf-8"))
+            if keep:
+                self.kept[style].append(citation)
+        self.count += 1
+
+    def close(self):
+        if "CSL-JSON" in self._files:
+            self._files["CSL-JSON"].write("\n]\n")
+        for f in self._files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -5,84 +5,61 @@ from typing import Type
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from ..tracing import traced_tool
+from .bibliography import BibliographyWriter, bib_entry, parse_styles
+from .paper_record import load_paper_records
+
+# Citations returned in the answer per style; longer bibliographies are only complete in the files
+INLINE_CITATIONS = int(os.getenv("CITATION_INLINE_LIMIT", 500))
+
 
 class CitationInput(BaseModel):
     """Input schema for CitationTool"""
-    metadata_file: str = Field(..., description="Path to paper_metadata.json")
-    style: str = Field(default="APA", description="Citation style: APA, IEEE, or MLA")
+    metadata_file: str = Field(..., description="Path to paper_metadata.json (or .jsonl)")
+    style: str = Field(default="APA", description="Citation style(s), comma-separated: APA, IEEE, MLA, BibTeX, CSL-JSON, or all")
 
 
 class CitationFormatterTool(BaseTool):
     name: str = "Citation Formatter Tool"
     description: str = """
-    Formats academic citations in APA, IEEE, or MLA style.
-    Input: Path to metadata JSON and citation style (APA/IEEE/MLA).
+    Formats academic citations in APA, IEEE, or MLA style, and exports BibTeX and CSL-JSON.
+    Ask for every style you need in one call (e.g. style="APA, BibTeX"); each style is
+    also written to a file under <output_dir>/bibliography/.
+    Input: Path to metadata JSON and citation style(s).
     """
     args_schema: Type[BaseModel] = CitationInput
+    # Where the bibliography files are written (one directory per topic in batch runs)
+    output_dir: str = "outputs"
 
+    @traced_tool
     def _run(self, metadata_file: str, style: str = "APA") -> str:
         """Format citations"""
         print(f"\n📚 Formatting citations in {style} style")
         
         if not os.path.exists(metadata_file):
             return json.dumps({"error": f"Metadata file not found: {metadata_file}"})
+        # Unknown style names fall back to MLA
+        styles = parse_styles(style)
         
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            papers = json.load(f)
-        
-        citations = []
+        # Accepts both .json arrays and streamed .jsonl artifacts; every style
+        # is produced in the same pass over the (cached) entries
+        directory = os.path.join(self.output_dir, "bibliography")
+        with BibliographyWriter(directory, styles, keep=INLINE_CITATIONS) as writer:
+            for paper in load_paper_records(metadata_file):
+                writer.add(bib_entry(paper))
         
-        for paper in papers:
-            if style.upper() == "APA":
-                citation = self._format_apa(paper)
-            elif style.upper() == "IEEE":
-                citation = self._format_ieee(paper)
-            else:
-                citation = self._format_mla(paper)
-            
-            citations.append(citation)
+        truncated = writer.count > INLINE_CITATIONS
+        if truncated:
+            print(f"📄 {writer.count} citations; the answer lists the first {INLINE_CITATIONS}, files have all")
         
         result = {
             "style": style,
-            "citation_count": len(citations),
-            "citations": citations
+            "citation_count": writer.count,
+            # A list for a single style (as before), else {style: list}
+            "citations": writer.kept[styles[0]] if len(styles) == 1 else writer.kept,
+            "files": writer.paths,
         }
+        if truncated:
+            result["truncated"] = True
         
         return json.dumps(result, indent=2, ensure_ascii=False)
-    
-    def _format_apa(self, paper: dict) -> str:
-        """Format citation in APA style"""
-        authors = paper.get("authors", ["Unknown"])
-        author_str = ", ".join(authors[:3])
-        if len(authors) > 3:
-            author_str += ", et al."
-        
-        title = paper.get("title", "Untitled")
-        year = paper.get("year", "n.d.")
-        doi = paper.get("doi", "")
-        
-        citation = f"{author_str} ({year}). {title}."
-        if doi:
-            citation += f" https://doi.org/{doi.replace('https://doi.org/', '')}"
-        
-        return citation
-    
-    def _format_ieee(self, paper: dict) -> str:
-        """Format citation in IEEE style"""
-        authors = paper.get("authors", ["Unknown"])
-        author_str = ", ".join([a.split()[-1] if a else "Unknown" for a in authors[:3]])
-        
-        title = paper.get("title", "Untitled")
-        year = paper.get("year", "n.d.")
-        
-        return f'{author_str}, "{title}," {year}.'
-    
-    def _format_mla(self, paper: dict) -> str:
-        """Format citation in MLA style"""
-        authors = paper.get("authors", ["Unknown"])
-        author_str = authors[0] if authors else "Unknown"
-        
-        title = paper.get("title", "Untitled")
-        year = paper.get("year", "n.d.")
-        
-        return f'{author_str}. "{title}." {year}.'
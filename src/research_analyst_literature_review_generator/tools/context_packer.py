@@ -0,0 +1,206 @@
+# tools/context_packer.py
+import json
+import os
+import re
+from typing import Type
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from ..tracing import traced_tool
+from .artifacts import load_records, parse_json_text, write_json
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", 3000))
+STATS_FILENAME = "context_stats.json"
+
+# Long text fields start at this many characters and shrink to fit the budget
+TEXT_CHARS = 600
+MIN_TEXT_CHARS = 60
+
+# Fields each task actually uses, per artifact (None keeps every field)
+TASK_VIEWS = {
+    "extract_paper_content": {
+        "paper_metadata": ["title", "authors", "year", "doi", "file_path"],
+    },
+    "synthesize_findings": {
+        "extracted_content": ["title", "year", "authors", "keywords", "abstract", "methodology", "results",
+                              "conclusion"],
+    },
+    "evaluate_research_quality": {
+        "extracted_content": ["title", "year", "methodology", "results", "conclusion"],
+    },
+    "generate_literature_review": {
+        "research_strategy": None,
+        "paper_metadata": ["title", "authors", "year", "doi"],
+        "extracted_content": ["title", "year", "abstract", "methodology", "results", "conclusion"],
+        "synthesis": None,
+        "evaluation": None,
+    },
+}
+
+WHITESPACE_RE = re.compile(r"\s+")
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9(\"])")
+
+_encoder = None
+
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens for ``text`` with the gpt-4o tokenizer, or ~4 chars/token without it"""
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            # tiktoken missing, or its vocabulary can't be downloaded
+            _encoder = False
+    if _encoder:
+        return len(_encoder.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def summarize(text: str, max_chars: int) -> str:
+    """Collapse whitespace and keep the leading sentences that fit in ``max_chars``"""
+    text = WHITESPACE_RE.sub(" ", text).strip()
+    if len(text) <= max_chars:
+        return text
+    kept = ""
+    for sentence in SENTENCE_RE.split(text):
+        if len(kept) + len(sentence) + 1 > max_chars:
+            break
+        kept = f"{kept} {sentence}" if kept else sentence
+    if not kept:
+        # A single long sentence (or extraction noise): cut at a word boundary
+        kept = text[:max_chars].rsplit(" ", 1)[0]
+    return kept + " …"
+
+
+def compact(value, max_chars: int):
+    """Drop empty values and summarize long strings, recursively"""
+    if isinstance(value, str):
+        return summarize(value, max_chars)
+    if isinstance(value, dict):
+        packed = {key: compact(item, max_chars) for key, item in value.items()}
+        return {key: item for key, item in packed.items() if item not in ("", None, [], {})}
+    if isinstance(value, list):
+        return [item for item in (compact(item, max_chars) for item in value) if item not in ("", None, [], {})]
+    return value
+
+
+def select_fields(data, fields: list | None):
+    """Keep only the fields a task uses from each record of a list artifact"""
+    if fields is None or not isinstance(data, list):
+        return data
+    return [{key: record[key] for key in fields if key in record} if isinstance(record, dict) else record
+            for record in data]
+
+
+def dumps_compact(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def pack(data, fields: list | None, budget: int) -> tuple[str, dict]:
+    """Compact ``data`` to fit ``budget`` tokens; returns the packed text and packing info.
+
+    Long text fields are shrunk step by step; if even the shortest summaries
+    overflow, trailing records of a list artifact are left out.
+    """
+    data = select_fields(data, fields)
+    max_chars = TEXT_CHARS
+    while True:
+        text = dumps_compact(compact(data, max_chars))
+        tokens = count_tokens(text)
+        if tokens <= budget or max_chars <= MIN_TEXT_CHARS:
+            break
+        max_chars = max(MIN_TEXT_CHARS, int(max_chars * budget / tokens * 0.9))
+
+    omitted = 0
+    if tokens > budget and isinstance(data, list):
+        records = compact(data, max_chars)
+        while records and tokens > budget:
+            records.pop()
+            omitted += 1
+            text = dumps_compact(records)
+            tokens = count_tokens(text)
+
+    return text, {"text_chars": max_chars, "omitted_records": omitted}
+
+
+def record_stats(stats_file: str, task: str, artifact: str, stats: dict):
+    """Merge one measurement into the stats file (outputs/context_stats.json)"""
+    all_stats = {}
+    if os.path.exists(stats_file):
+        try:
+            with open(stats_file, "r", encoding="utf-8") as f:
+                all_stats = json.load(f)
+        except (OSError, ValueError):
+            all_stats = {}
+    all_stats.setdefault(task, {})[artifact] = stats
+    os.makedirs(os.path.dirname(stats_file) or ".", exist_ok=True)
+    write_json(stats_file, all_stats)
+
+
+class ContextPackerInput(BaseModel):
+    """Input schema for ContextPackerTool"""
+    file_path: str = Field(..., description="Path to an outputs/ artifact, e.g. outputs/extracted_content.json")
+    task: str = Field(default=None, description="Task the view is for, e.g. synthesize_findings")
+    token_budget: int = Field(default=None, description="Maximum prompt tokens for the packed view")
+
+
+class ContextPackerTool(BaseTool):
+    name: str = "Context Packer Tool"
+    description: str = """
+    Reads an outputs/ artifact as a compact, task-specific view that fits a token budget.
+    Whitespace is collapsed, fields the task doesn't use are dropped and long text
+    fields are summarized to their leading sentences.
+    Input: file_path (required), task (task name from tasks.yaml), token_budget (optional).
+    """
+    args_schema: Type[BaseModel] = ContextPackerInput
+    # Where context_stats.json is written (one directory per topic in batch runs)
+    output_dir: str = "outputs"
+
+    @traced_tool
+    def _run(self, file_path: str, task: str = None, token_budget: int = None) -> str:
+        """Pack an artifact for an agent prompt"""
+        budget = token_budget or CONTEXT_TOKEN_BUDGET
+        print(f"\n🗜️ Packing {file_path} for {task or 'any task'} ({budget} tokens)")
+
+        if not os.path.exists(file_path):
+            return json.dumps({"error": f"File not found: {file_path}"})
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            raw = f.read()
+        artifact = os.path.splitext(os.path.basename(file_path))[0]
+
+        if file_path.endswith((".json", ".jsonl")):
+            try:
+                data = load_records(file_path) if file_path.endswith(".jsonl") else parse_json_text(raw)
+            except ValueError as e:
+                return json.dumps({"error": f"Invalid JSON in {file_path}: {e}"})
+            fields = TASK_VIEWS.get(task, {}).get(artifact)
+            packed, info = pack(data, fields, budget)
+            content = json.loads(packed)
+        else:
+            packed = WHITESPACE_RE.sub(" ", raw).strip()
+            tokens = count_tokens(packed)
+            if tokens > budget:
+                packed = summarize(packed, int(len(packed) * budget / tokens * 0.95))
+            content = packed
+            info = {}
+
+        stats = {
+            "tokens_before": count_tokens(raw),
+            "tokens_after": count_tokens(packed),
+            "budget": budget,
+            **info
+        }
+        if task:
+            record_stats(os.path.join(self.output_dir, STATS_FILENAME), task, artifact, stats)
+
+        print(f"✅ {stats['tokens_before']} → {stats['tokens_after']} tokens")
+
+        return json.dumps({
+            "file": file_path,
+            "task": task,
+            **stats,
+            "content": content
+        }, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,183 @@
+# tools/corpus_analysis.py
+import numpy as np
+
+# Keywords reported in keyword_frequency, as themes and in the co-occurrence matrix
+TOP_KEYWORDS = 20
+THEME_KEYWORDS = 10
+# Keywords grouped into theme clusters, and the mean cosine similarity
+# (of their paper sets) a keyword needs to join an existing cluster
+CLUSTER_KEYWORDS = 30
+CLUSTER_SIMILARITY = 0.3
+# Papers listed per theme or cluster
+THEME_PAPERS = 5
+# The newest years of the review's range count as "recent"
+RECENT_YEARS = 2
+
+
+class CorpusIndex:
+    """Columnar view of a paper corpus plus a keyword -> paper inverted index.
+
+    Built in one pass over the records; every statistic the analysis tool
+    reports is then computed from NumPy columns and the posting lists
+    rather than by walking the papers again. Keyword ids follow first
+    occurrence, so frequency ties rank like ``Counter.most_common``.
+    """
+
+    def __init__(self, papers: list):
+        self.papers = papers
+        flat, per_paper = [], []
+        years, lengths, methodology, conclusion = [], [], [], []
+        authors = set()
+        for paper in papers:
+            years.append(paper.year or 0)
+            lengths.append(paper.full_text_length or 0)
+            methodology.append(bool(paper.methodology))
+            conclusion.append(bool(paper.conclusion))
+            authors.update(paper.authors)
+            flat.extend(paper.keywords)
+            per_paper.append(len(paper.keywords))
+
+        n = len(papers)
+        vocab = {keyword: i for i, keyword in enumerate(dict.fromkeys(flat))}
+        self.vocab = list(vocab)
+        self.years = np.array(years, dtype=np.int32)
+        self.text_lengths = np.array(lengths, dtype=np.int64)
+        self.has_methodology = np.array(methodology, dtype=bool)
+        self.has_conclusion = np.array(conclusion, dtype=bool)
+        self.unique_authors = len(authors)
+
+        keyword_ids = np.fromiter(map(vocab.__getitem__, flat), dtype=np.int64, count=len(flat))
+        rows = np.repeat(np.arange(n, dtype=np.int64), np.array(per_paper, dtype=np.int64))
+        # Occurrences (a keyword repeated in one paper counts twice, as before)
+        self.keyword_counts = np.bincount(keyword_ids, minlength=len(self.vocab))
+        # Posting lists: distinct (keyword, paper) pairs sorted by keyword, then paper
+        pairs = np.sort(keyword_ids * n + rows)
+        pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))] if len(pairs) else pairs
+        self.postings = pairs % max(n, 1)
+        self.offsets = np.searchsorted(pairs // max(n, 1), np.arange(len(self.vocab) + 1))
+
+    def papers_with(self, keyword_id: int) -> np.ndarray:
+        """Rows of the papers listing keyword ``keyword_id``, in corpus order"""
+        return self.postings[self.offsets[keyword_id]:self.offsets[keyword_id + 1]]
+
+    def top_keywords(self, k: int) -> np.ndarray:
+        """Ids of the ``k`` most frequent keywords (ties by first occurrence)"""
+        return np.argsort(-self.keyword_counts, kind="stable")[:k]
+
+    def incidence(self, keyword_ids: np.ndarray) -> np.ndarray:
+        """(papers x keywords) 0/1 matrix for ``keyword_ids``"""
+        matrix = np.zeros((len(self.papers), len(keyword_ids)), dtype=np.float32)
+        for column, keyword_id in enumerate(keyword_ids):
+            matrix[self.papers_with(keyword_id), column] = 1.0
+        return matrix
+
+    def paper_refs(self, rows) -> list:
+        return [{"title": self.papers[row].title, "year": self.papers[row].year} for row in rows]
+
+    def year_distribution(self) -> dict:
+        years, counts = np.unique(self.years[self.years > 0], return_counts=True)
+        return dict(zip(years.tolist(), counts.tolist()))
+
+    def year_span(self) -> tuple | None:
+        known = self.years[self.years > 0]
+        return (int(known.min()), int(known.max())) if len(known) else None
+
+    def keyword_frequency(self, k: int = TOP_KEYWORDS) -> dict:
+        top = self.top_keywords(k)
+        return {self.vocab[i]: int(self.keyword_counts[i]) for i in top}
+
+    def themes(self, k: int = THEME_KEYWORDS) -> list:
+        """One theme per top keyword, with the first papers listing it"""
+        themes = []
+        for keyword_id in self.top_keywords(k):
+            related = self.papers_with(keyword_id)
+            themes.append({
+                "theme_name": self.vocab[keyword_id].capitalize(),
+                "paper_count": len(related),
+                "papers": self.paper_refs(related[:THEME_PAPERS].tolist()),
+            })
+        return themes
+
+    def cooccurrence(self, k: int = THEME_KEYWORDS) -> dict:
+        """Papers sharing each pair of the top ``k`` keywords, plus the strongest pairs"""
+        top = self.top_keywords(k)
+        matrix = self.incidence(top)
+        counts = (matrix.T @ matrix).astype(np.int64)
+        paper_counts = np.diag(counts)
+        i, j = np.triu_indices(len(top), 1)
+        shared = counts[i, j]
+        jaccard = shared / np.maximum(paper_counts[i] + paper_counts[j] - shared, 1)
+        order = np.lexsort((-jaccard, -shared))[:k]
+        return {
+            "keywords": [self.vocab[t] for t in top],
+            "matrix": counts.tolist(),
+            "top_pairs": [
+                {"keywords": [self.vocab[top[i[p]]], self.vocab[top[j[p]]]],
+                 "papers": int(shared[p]), "jaccard": round(float(jaccard[p]), 3)}
+                for p in order if shared[p]
+            ],
+        }
+
+    def theme_clusters(self, k: int = CLUSTER_KEYWORDS, min_similarity: float = CLUSTER_SIMILARITY) -> list:
+        """Group the top ``k`` keywords into themes by how often they share papers.
+
+        Keywords are taken by frequency; each joins the cluster with the
+        highest mean cosine similarity to its members if that reaches
+        ``min_similarity``, otherwise it starts a new cluster. A cluster's
+        papers are ranked by how many of its keywords they list.
+        """
+        top = self.top_keywords(k)
+        if not len(top):
+            return []
+        matrix = self.incidence(top)
+        counts = matrix.T @ matrix
+        norms = np.sqrt(np.maximum(np.diag(counts), 1.0))
+        similarity = counts / np.outer(norms, norms)
+
+        clusters = []
+        for column in range(len(top)):
+            scores = [similarity[column, members].mean() for members in clusters]
+            best = int(np.argmax(scores)) if scores else -1
+            if best >= 0 and scores[best] >= min_similarity:
+                clusters[best].append(column)
+            else:
+                clusters.append([column])
+
+        themes = []
+        for members in clusters:
+            matches = matrix[:, members].sum(axis=1)
+            rows = np.flatnonzero(matches)
+            ranked = rows[np.argsort(-matches[rows], kind="stable")]
+            keywords = [self.vocab[top[m]] for m in members]
+            themes.append({
+                "theme_name": " / ".join(word.capitalize() for word in keywords[:3]),
+                "keywords": keywords,
+                "paper_count": len(rows),
+                "papers": self.paper_refs(ranked[:THEME_PAPERS].tolist()),
+            })
+        themes.sort(key=lambda t: -t["paper_count"])
+        return themes
+
+    def statistics(self) -> dict:
+        n = len(self.papers)
+        return {
+            "avg_text_length": int(self.text_lengths.sum()) // n if n else 0,
+            "papers_with_methodology": int(self.has_methodology.sum()),
+            "papers_with_conclusion": int(self.has_conclusion.sum()),
+            "unique_authors": self.unique_authors,
+        }
+
+    def year_groups(self, year_range: tuple | None) -> dict:
+        """Papers in the last RECENT_YEARS of ``year_range``, the earlier years, and outside it"""
+        known = self.years > 0
+        groups = {"year_range": list(year_range) if year_range else None}
+        if year_range:
+            start, end = year_range
+            recent_from = max(start, end - RECENT_YEARS + 1)
+            groups["recent_papers"] = int(np.count_nonzero((self.years >= recent_from) & (self.years <= end)))
+            groups["older_papers"] = int(np.count_nonzero((self.years >= start) & (self.years < recent_from)))
+            groups["outside_range"] = int(np.count_nonzero(known & ((self.years < start) | (self.years > end))))
+        else:
+            groups.update(recent_papers=0, older_papers=0, outside_range=0)
+        groups["unknown_year"] = int(np.count_nonzero(~known))
+        return groups
@@ -2,112 +2,67 @@
 import json
 import os
 from typing import Type
-from collections import Counter
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from ..tracing import traced_tool
+from .corpus_analysis import CorpusIndex
+from .paper_record import load_paper_records
+from .relevance import strategy_year_range
+
 
 class DataAnalysisInput(BaseModel):
     """Input schema for DataAnalysisTool"""
-    extracted_content_file: str = Field(..., description="Path to extracted_content.json")
+    extracted_content_file: str = Field(..., description="Path to extracted_content.json (or .jsonl)")
+    strategy_file: str = Field(default=None, description="research_strategy.json whose year_range sets the year buckets")
 
 
 class DataAnalysisTool(BaseTool):
     name: str = "Data Analysis Tool"
     description: str = """
     Analyzes extracted paper content to identify themes, patterns, and statistics.
-    Groups papers by common topics and generates analytical insights.
-    Input: Path to extracted_content.json file.
+    Groups papers by common topics and generates analytical insights, including
+    keyword co-occurrence and keyword clusters.
+    Input: Path to extracted_content.json file, optional strategy_file
+    (default: research_strategy.json in the output directory) for the year range.
     """
     args_schema: Type[BaseModel] = DataAnalysisInput
+    # Where synthesis.json is written (one directory per topic in batch runs)
+    output_dir: str = "outputs"
 
-    def _run(self, extracted_content_file: str) -> str:
+    @traced_tool
+    def _run(self, extracted_content_file: str, strategy_file: str = None) -> str:
         """Analyze paper content"""
         print(f"\n📊 Analyzing data from: {extracted_content_file}")
         
         if not os.path.exists(extracted_content_file):
             return json.dumps({"error": f"File not found: {extracted_content_file}"})
         
-        with open(extracted_content_file, 'r', encoding='utf-8') as f:
-            papers = json.load(f)
+        # Accepts both .json arrays and streamed .jsonl artifacts
+        papers = load_paper_records(extracted_content_file)
+        # One pass over the papers; everything below reads the index
+        index = CorpusIndex(papers)
+        strategy_file = strategy_file or os.path.join(self.output_dir, "research_strategy.json")
+        year_range = strategy_year_range(strategy_file) or index.year_span()
         
         # Perform analysis
         analysis = {
             "total_papers": len(papers),
-            "year_distribution": self._analyze_years(papers),
-            "keyword_frequency": self._analyze_keywords(papers),
-            "themes": self._identify_themes(papers),
-            "statistics": self._calculate_stats(papers),
-            "paper_groupings": self._group_papers(papers)
+            "year_distribution": index.year_distribution(),
+            "keyword_frequency": index.keyword_frequency(),
+            "themes": index.themes(),
+            "theme_clusters": index.theme_clusters(),
+            "keyword_cooccurrence": index.cooccurrence(),
+            "statistics": index.statistics(),
+            "paper_groupings": index.year_groups(year_range)
         }
         
         # Save analysis
-        output_path = os.path.join("outputs", "synthesis.json")
+        output_path = os.path.join(self.output_dir, "synthesis.json")
+        os.makedirs(self.output_dir, exist_ok=True)
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(analysis, f, indent=2, ensure_ascii=False)
         
         print(f"✅ Analysis complete: {len(analysis['themes'])} themes identified")
         
         return json.dumps(analysis, indent=2, ensure_ascii=False)
-    
-    def _analyze_years(self, papers: list) -> dict:
-        """Analyze publication year distribution"""
-        years = [p.get("year") for p in papers if p.get("year")]
-        year_counts = Counter(years)
-        return dict(sorted(year_counts.items()))
-    
-    def _analyze_keywords(self, papers: list) -> dict:
-        """Analyze keyword frequency across papers"""
-        all_keywords = []
-        for paper in papers:
-            all_keywords.extend(paper.get("keywords", []))
-        
-        keyword_counts = Counter(all_keywords)
-        return dict(keyword_counts.most_common(20))
-    
-    def _identify_themes(self, papers: list) -> list:
-        """Identify common themes in papers"""
-        all_keywords = []
-        for paper in papers:
-            all_keywords.extend(paper.get("keywords", []))
-        
-        keyword_freq = Counter(all_keywords)
-        top_keywords = [k for k, v in keyword_freq.most_common(10)]
-        
-        themes = []
-        for keyword in top_keywords:
-            related_papers = []
-            for paper in papers:
-                if keyword in paper.get("keywords", []):
-                    related_papers.append({
-                        "title": paper.get("title"),
-                        "year": paper.get("year")
-                    })
-            
-            if related_papers:
-                themes.append({
-                    "theme_name": keyword.capitalize(),
-                    "paper_count": len(related_papers),
-                    "papers": related_papers[:5]
-                })
-        
-        return themes
-    
-    def _calculate_stats(self, papers: list) -> dict:
-        """Calculate various statistics"""
-        return {
-            "avg_text_length": sum(p.get("full_text_length", 0) for p in papers) // len(papers) if papers else 0,
-            "papers_with_methodology": sum(1 for p in papers if p.get("methodology")),
-            "papers_with_conclusion": sum(1 for p in papers if p.get("conclusion")),
-            "unique_authors": len(set(author for p in papers for author in p.get("authors", []) if author))
-        }
-    
-    def _group_papers(self, papers: list) -> dict:
-        """Group papers by year ranges"""
-        recent = [p for p in papers if str(p.get("year", "")).startswith(("2024", "2025"))]
-        older = [p for p in papers if str(p.get("year", "")).startswith(("2020", "2021", "2022", "2023"))]
-        
-        return {
-            "recent_papers": len(recent),
-            "older_papers": len(older)
-        }
@@ -0,0 +1,18 @@
+# tools/doi.py
+import re
+
+# doi.org / dx.doi.org URLs and "doi:" prefixes in front of the bare DOI
+DOI_PREFIX_RE = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+
+
+def normalize_doi(doi: str | None) -> str | None:
+    """Bare DOI ("10.1234/abc") from a DOI, "doi:" string or doi.org URL"""
+    if not doi:
+        return None
+    return DOI_PREFIX_RE.sub("", doi.strip()) or None
+
+
+def doi_key(doi: str | None) -> str | None:
+    """Lookup key for a DOI (normalized, case-insensitive)"""
+    doi_norm = normalize_doi(doi)
+    return doi_norm.lower() if doi_norm else None
@@ -0,0 +1,110 @@
+# tools/keyword_engine.py
+import re
+from collections import Counter
+
+import numpy as np
+
+# Tokens are lowercase alphabetic runs of 4+ letters (hyphenated compounds kept),
+# so shorter words ("et", "al", "doi", "pp") never need a stopword entry
+TOKEN_RE = re.compile(r"[a-z][a-z]{2,}(?:-[a-z]+)*[a-z]")
+
+# Terms kept per paper for the corpus matrix; the long tail never ranks
+TERM_LIMIT = 500
+
+STOPWORDS = frozenset("""
+    about above across after afterwards again against almost alone along already also although always among
+    amongst another anyone anything anyway anywhere around because become becomes becoming been before
+    beforehand behind being below beside besides between beyond both cannot could does doing done down
+    during each either else elsewhere enough even ever every everyone everything everywhere except
+    first following former formerly from further furthermore given have having hence here hereafter hereby
+    herein however indeed into itself just last latter least less made make makes many maybe might more
+    moreover most mostly much must myself namely neither never nevertheless next none nobody noone nothing
+    nowhere often once only onto other others otherwise ours ourselves over overall perhaps
+    please quite rather same second seem seemed seeming seems several should show shown shows since some
+    someone something sometime sometimes somewhere still such than that their theirs them themselves then
+    thence there thereafter thereby therefore therein thereupon these they third this those though three
+    through throughout thru thus together toward towards under until upon used using very well were what
+    whatever when whence whenever where whereafter whereas whereby wherein whereupon wherever whether which
+    while whither whoever whole whom whose will with within without would year years your yours yourself
+    able according based different discussed figure figures table tables section sections paper
+    papers study studies research article articles author authors journal review reviews work works proposed
+    approach approaches result results method methods analysis conclusion introduction abstract example
+    important include includes including provide provides provided related respectively various within
+    http https ieee elsevier springer copyright rights reserved license licensed
+    available online accessed university department
+""".split())
+
+
+def term_counts(text: str, limit: int = TERM_LIMIT) -> dict:
+    """Stopword-filtered term counts for one document (top ``limit`` terms)"""
+    counts = Counter(TOKEN_RE.findall(text.lower()))
+    for word in STOPWORDS.intersection(counts):
+        del counts[word]
+    return dict(counts.most_common(limit))
+
+
+def tfidf_keywords(documents: list, top_k: int = 10) -> list:
+    """Rank each document's terms by TF-IDF across the whole corpus.
+
+    ``documents`` is a list of {term: count} dicts (see ``term_counts``).
+    Builds a sparse term-document matrix in COO form with NumPy and returns
+    the top ``top_k`` terms per document, in input order.
+    """
+    if not documents:
+        return []
+
+    lengths = np.fromiter((len(d) for d in documents), dtype=np.int64, count=len(documents))
+    if not lengths.sum():
+        return [[] for _ in documents]
+    terms = np.array([t for d in documents for t in d])
+    counts = np.fromiter((c for d in documents for c in d.values()), dtype=np.float64, count=len(terms))
+    rows = np.repeat(np.arange(len(documents)), lengths)
+
+    # Column ids in sorted-vocabulary order, so ties break alphabetically
+    vocab, cols = np.unique(terms, return_inverse=True)
+    df = np.bincount(cols, minlength=len(vocab))
+
+    # Sublinear tf, smoothed idf, L2-normalized rows
+    n_docs = len(documents)
+    idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+    scores = (1.0 + np.log(counts)) * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=scores * scores, minlength=n_docs))
+    scores /= norms[rows]
+
+    # Sort by document, then descending score, then term; take each row's head
+    order = np.lexsort((cols, -scores, rows))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    rank = np.arange(len(order)) - np.repeat(starts, lengths)
+    top = order[rank < top_k]
+
+    keywords = [[] for _ in documents]
+    for row, term in zip(rows[top].tolist(), vocab[cols[top]].tolist()):
+        keywords[row].append(term)
+    return keywords
+
+
+class IncrementalTfidf:
+    """Streaming counterpart of ``tfidf_keywords``.
+
+    Each added document is ranked against the documents seen so far
+    (itself included), so records can be emitted before the corpus is
+    complete; the last one sees the full corpus. Provisional: the parser
+    replaces these with ``tfidf_keywords`` once every paper is counted.
+    """
+
+    def __init__(self, top_k: int = 10):
+        self.top_k = top_k
+        self.df = Counter()
+        self.n_docs = 0
+
+    def add(self, counts: dict) -> list:
+        self.n_docs += 1
+        self.df.update(counts.keys())
+        if not counts:
+            return []
+        terms = sorted(counts)
+        tf = np.fromiter((counts[t] for t in terms), dtype=np.float64, count=len(terms))
+        df = np.fromiter((self.df[t] for t in terms), dtype=np.float64, count=len(terms))
+        scores = (1.0 + np.log(tf)) * (np.log((1.0 + self.n_docs) / (1.0 + df)) + 1.0)
+        order = np.lexsort((np.arange(len(terms)), -scores))
+        return [terms[i] for i in order[:self.top_k]]
@@ -0,0 +1,125 @@
+# tools/near_duplicates.py
+import os
+import re
+import zlib
+
+import numpy as np
+
+# 128 MinHash values split into 32 LSH bands of 4 rows: pairs above ~0.42
+# estimated Jaccard usually share a bucket and are then checked exactly
+NUM_PERM = 128
+LSH_BANDS = 32
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", 0.6))
+SHINGLE_WORDS = 3
+# Shingles hashed per block, bounding memory to block x NUM_PERM values
+HASH_BLOCK = 4096
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Fixed seed: signatures must be comparable across processes and runs
+_rng = np.random.default_rng(0x6D696E68)
+_A = _rng.integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+_SHIFT = np.uint64(32)
+
+
+def shingles(text: str, k: int = SHINGLE_WORDS) -> np.ndarray:
+    """CRC32 hashes of the distinct ``k``-word shingles of ``text`` (lowercased, punctuation dropped)"""
+    words = WORD_RE.findall(text.lower())
+    if len(words) <= k:
+        grams = {" ".join(words)} if words else set()
+    else:
+        grams = {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def minhash(text: str) -> np.ndarray | None:
+    """MinHash signature (NUM_PERM uint32 values) of ``text``, or None if it has no words.
+
+    Each permutation is a multiply-shift hash ((a * x + b) mod 2^64) >> 32,
+    evaluated for all shingles at once with NumPy.
+    """
+    values = shingles(text)
+    if not len(values):
+        return None
+    signature = np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+    for start in range(0, len(values), HASH_BLOCK):
+        block = values[start:start + HASH_BLOCK, None]
+        np.minimum(signature, ((block * _A + _B) >> _SHIFT).min(axis=0), out=signature)
+    return signature.astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def near_duplicate_note(item: dict, original: dict, score: float) -> dict:
+    """Report entry for a paper skipped as a near-duplicate of ``original`` (and print it)"""
+    print(f"⏭️ Near-duplicate ({score:.0%}) of '{original.get('title')}', skipping: {item.get('title')}")
+    return {
+        "title": item.get("title"),
+        "doi": item.get("doi"),
+        "duplicate_of": original.get("doi") or original.get("title"),
+        "similarity": round(score, 3),
+    }
+
+
+class NearDuplicateIndex:
+    """Streaming near-duplicate clustering with MinHash signatures and LSH buckets.
+
+    Each item is hashed into one bucket per band and only compared with the
+    items already in its buckets, so adding costs O(bands) on average rather
+    than a comparison with every earlier item. The first item of a cluster
+    is its representative.
+    """
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD, bands: int = LSH_BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.buckets = {}      # (band, band bytes) -> [keys]
+        self.signatures = {}   # key -> signature
+        self.cluster_of = {}   # key -> representative key
+
+    def _band_keys(self, signature: np.ndarray) -> list:
+        data = signature.tobytes()
+        width = self.rows * signature.itemsize
+        return [(band, data[band * width:(band + 1) * width]) for band in range(self.bands)]
+
+    def match(self, signature: np.ndarray | None) -> tuple:
+        """(representative, similarity) of the closest clustered item above the threshold, else (None, 0.0)"""
+        if signature is None:
+            return None, 0.0
+        signature = np.asarray(signature, dtype=np.uint32)
+        best, best_similarity = None, 0.0
+        seen = set()
+        for bucket in self._band_keys(signature):
+            for key in self.buckets.get(bucket, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                score = similarity(signature, self.signatures[key])
+                if score >= self.threshold and score > best_similarity:
+                    best, best_similarity = key, score
+        if best is None:
+            return None, 0.0
+        return self.cluster_of[best], best_similarity
+
+    def add(self, key, signature: np.ndarray | None) -> tuple:
+        """Cluster ``key``; returns (representative, similarity), the representative being ``key`` if it is new"""
+        representative, score = self.match(signature)
+        self.cluster_of[key] = representative if representative is not None else key
+        if signature is not None:
+            signature = np.asarray(signature, dtype=np.uint32)
+            self.signatures[key] = signature
+            for bucket in self._band_keys(signature):
+                self.buckets.setdefault(bucket, []).append(key)
+        return self.cluster_of[key], score
+
+    def clusters(self) -> dict:
+        """{representative: [keys]} for every cluster with more than one member"""
+        groups = {}
+        for key, representative in self.cluster_of.items():
+            groups.setdefault(representative, []).append(key)
+        return {rep: keys for rep, keys in groups.items() if len(keys) > 1}
@@ -0,0 +1,56 @@
+# tools/openalex_cache.py
+import hashlib
+import json
+import os
+import threading
+
+from .sqlite_cache import SQLiteCache
+
+# Only the fields the pipeline reads; keeps pages (and the cache) small
+OPENALEX_SELECT = ",".join([
+    "id",
+    "title",
+    "publication_year",
+    "doi",
+    "authorships",
+    "best_oa_location",
+    "primary_location",
+    "locations",
+    "abstract_inverted_index",
+])
+OPENALEX_MAX_PAGE_SIZE = 200
+
+# default: serve fresh entries, fetch and record misses
+# refresh: always fetch and record
+# offline: replay recorded responses only (expired ones too), never fetch
+# off:     bypass the cache entirely
+CACHE_MODES = ("default", "refresh", "offline", "off")
+OPENALEX_CACHE_TTL = float(os.getenv("OPENALEX_CACHE_TTL", 7 * 24 * 3600))
+OPENALEX_CACHE_MAX_BYTES = int(os.getenv("OPENALEX_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_openalex_cache() -> SQLiteCache:
+    """Process-wide OpenAlex response cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SQLiteCache("openalex.sqlite", max_bytes=OPENALEX_CACHE_MAX_BYTES)
+        return _cache
+
+
+def openalex_cache_mode(mode: str | None = None) -> str:
+    """Resolve the cache mode from the argument or OPENALEX_CACHE_MODE"""
+    mode = (mode or os.getenv("OPENALEX_CACHE_MODE", "default")).lower()
+    if mode not in CACHE_MODES:
+        raise ValueError(f"Unknown OpenAlex cache mode: {mode} (expected one of {', '.join(CACHE_MODES)})")
+    return mode
+
+
+def response_key(base_url: str, params: dict) -> str:
+    """Cache key for one page request: endpoint, query, filters, cursor, page size and fields"""
+    relevant = {k: v for k, v in params.items() if k != "mailto"}
+    payload = json.dumps([base_url, relevant], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -1,18 +1,81 @@
 # tools/paper_download_tool.py
+import hashlib
 import os
 import json
 import time
+import queue
+import threading
+from collections import deque
 import requests
+import urllib3
 import subprocess
 import tempfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Type
+from urllib.parse import urlparse
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
 
-# Session for API requests
-SESSION = requests.Session()
+from ..tracing import span, traced_tool
+from .artifacts import JSONLWriter, artifact_format, artifact_path
+from .doi import normalize_doi
+from .near_duplicates import NearDuplicateIndex, minhash, near_duplicate_note
+from .openalex_cache import (
+    OPENALEX_SELECT,
+    OPENALEX_MAX_PAGE_SIZE,
+    OPENALEX_CACHE_TTL,
+    get_openalex_cache,
+    openalex_cache_mode,
+    response_key,
+)
+from .paper_record import PaperRecord, write_paper_records
+from .pdf_store import PDFStore, get_pdf_store
+from .relevance import CANDIDATE_POOL, relevance_scores, strategy_keywords
+from .unpaywall_resolver import RateLimiter, UnpaywallResolver
+
+# Downloads over this size are abandoned (up front when the server announces the size)
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", 100 * 1024 * 1024))
+# Requests per PDF URL: a transfer that breaks off is resumed where it stopped
+PDF_DOWNLOAD_ATTEMPTS = int(os.getenv("PDF_DOWNLOAD_ATTEMPTS", 3))
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+# PDF requests per second to any one host in concurrent mode, which spreads
+# downloads across hosts instead of the sequential loop's 0.8 s sleep after
+# each paper (0 turns the limit off)
+PDF_HOST_RATE = float(os.getenv("PDF_HOST_RATE", 1.25))
+# Screened candidates per requested paper whose Unpaywall answers are
+# resolved in one concurrent batch before downloading starts
+UNPAYWALL_PREFETCH = int(os.getenv("UNPAYWALL_PREFETCH", 2))
+PDF_MAGIC = b"%PDF-"
+# Readers accept the header anywhere in the first KB; %%EOF must close the file's last KBs
+PDF_HEADER_WINDOW = 1024
+PDF_TRAILER_WINDOW = 2048
+# Content-Type fragments of responses that are never the PDF (paywall, login and error pages)
+NOT_PDF_TYPES = ("text/", "html", "json", "xml", "image/")
+
+# Session for API requests (pool sized for the concurrent acquisition mode)
+class TracedSession(requests.Session):
+    """requests.Session recording one "http" span per request while tracing is on"""
+
+    def request(self, method, url, *args, **kwargs):
+        with span(f"{method} {urlparse(url).netloc}", "http", url=url) as s:
+            response = super().request(method, url, *args, **kwargs)
+            if s.active:
+                # Streamed bodies are read later; their size comes from the headers
+                size = response.headers.get("Content-Length")
+                if size and size.isdigit():
+                    size = int(size)
+                else:
+                    size = None if kwargs.get("stream") else len(response.content)
+                s.set(status=response.status_code, bytes=size)
+            return response
+
+
+SESSION = TracedSession()
 SESSION.headers.update({"User-Agent": "PaperFetcher/1.1"})
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
 
 def sanitize_filename(name, max_len=80):
     """Sanitize filename for safe file creation"""
@@ -21,16 +84,6 @@ def sanitize_filename(name, max_len=80):
     safe = "".join(c for c in name if c.isalnum() or c in " _-").strip()
     return (safe[:max_len]).rstrip(" .")
 
-def normalize_doi(doi: str | None) -> str | None:
-    """Normalize DOI format"""
-    if not doi:
-        return None
-    doi = doi.strip()
-    for prefix in ("https://doi.org/", "http://doi.org/", "doi:", "DOI:"):
-        if doi.lower().startswith(prefix):
-            return doi[len(prefix):]
-    return doi
-
 def get_pdf_url_from_openalex(paper: dict) -> str | None:
     """Extract PDF URL from OpenAlex paper data"""
     loc = paper.get("best_oa_location") or {}
@@ -46,24 +99,68 @@ def get_pdf_url_from_openalex(paper: dict) -> str | None:
             return l["pdf_url"]
     return None
 
+def abstract_from_inverted_index(inverted_index: dict | None) -> str:
+    """Rebuild abstract text from OpenAlex's {word: [positions]} form"""
+    if not inverted_index:
+        return ""
+    # Positions are dense, so fill a list instead of sorting them
+    size = 1 + max((max(positions) for positions in inverted_index.values() if positions), default=-1)
+    words = [""] * size
+    for word, positions in inverted_index.items():
+        for position in positions:
+            words[position] = word
+    return " ".join(word for word in words if word)
+
+def paper_abstract(paper: dict) -> str:
+    """Readable abstract of an OpenAlex record (already rebuilt by screening, if it ran)"""
+    if "abstract" in paper:
+        return paper["abstract"]
+    return abstract_from_inverted_index(paper.get("abstract_inverted_index"))
+
+def candidate_signature(paper: dict):
+    """MinHash of a candidate's title and abstract (None if it has neither)"""
+    return minhash(f"{paper.get('title') or ''} {paper_abstract(paper)}")
+
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+_host_limiters = {}
+_host_limiters_lock = threading.Lock()
+
+
+def wait_for_host(url: str, cancel: threading.Event | None = None):
+    """Keep PDF requests to ``url``'s host within PDF_HOST_RATE across worker threads"""
+    host = urlparse(url).netloc
+    with _host_limiters_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            limiter = _host_limiters[host] = RateLimiter(PDF_HOST_RATE)
+    limiter.wait(cancel)
+
+
+
+def get_unpaywall_resolver(email: str) -> UnpaywallResolver:
+    """Process-wide Unpaywall resolver (cached, rate-limited) for ``email``"""
+    with _resolvers_lock:
+        if email not in _resolvers:
+            _resolvers[email] = UnpaywallResolver(SESSION, email)
+        return _resolvers[email]
+
 def get_pdf_url_from_unpaywall(doi: str, email: str) -> str | None:
-    """Get PDF URL from Unpaywall API"""
-    doi_norm = normalize_doi(doi)
-    if not doi_norm:
+    """Get PDF URL from Unpaywall API (answers, including "no OA copy", are cached)"""
+    if not normalize_doi(doi):
         return None
-    url = f"https://api.unpaywall.org/v2/{doi_norm}?email={email}"
-    try:
-        r = SESSION.get(url, timeout=20)
-        time.sleep(0.4)
-        if r.status_code != 200:
-            return None
-        data = r.json()
-        loc = data.get("best_oa_location")
-        if loc and loc.get("url_for_pdf"):
-            return loc["url_for_pdf"]
-    except Exception:
-        pass
-    return None
+    return get_unpaywall_resolver(email).resolve(doi)
+
+def prefetch_unpaywall(candidates: list, email: str, max_workers: int = 8) -> dict:
+    """Resolve, as one rate-limited batch, the DOIs of ``candidates`` that have no
+    OpenAlex PDF link (they will need Unpaywall); the answers land in its cache"""
+    dois = [p["doi"] for p in candidates if normalize_doi(p.get("doi")) and not get_pdf_url_from_openalex(p)]
+    if not dois:
+        return {}
+    resolved = get_unpaywall_resolver(email).resolve_many(dois, max_workers)
+    print(f"🔓 Unpaywall: {sum(1 for url in resolved.values() if url)} of {len(resolved)} "
+          f"DOIs without an OpenAlex PDF link have an OA copy")
+    return resolved
 
 def download_from_scihub(doi: str, output_path: str) -> bool:
     """Download PDF from Sci-Hub using scidownl"""
@@ -90,6 +187,9 @@ def download_from_scihub(doi: str, output_path: str) -> bool:
             downloaded_files = os.listdir(temp_dir)
             pdf_files = [f for f in downloaded_files if f.lower().endswith('.pdf')]
             
+            if pdf_files and not is_pdf_file(os.path.join(temp_dir, pdf_files[0])):
+                print("   ⚠️ Sci-Hub returned a broken or non-PDF file")
+                return False
             if pdf_files:
                 source_pdf = os.path.join(temp_dir, pdf_files[0])
                 os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -110,33 +210,209 @@ def download_from_scihub(doi: str, output_path: str) -> bool:
             print(f"   ↪️ Sci-Hub error: {e}")
             return False
 
-def download_pdf(pdf_url, filepath):
-    """Download PDF from URL"""
+class DownloadRejected(Exception):
+    """A download abandoned for ``reason``: not_pdf, too_large, truncated, cancelled or the HTTP status"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def partial_path(filepath: str, url: str) -> str:
+    """Temp file a download of ``url`` streams into, next to ``filepath`` so the
+    final rename is atomic; named per URL so only the same source is resumed"""
+    return f"{filepath}.{hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]}.part"
+
+
+def pdf_header_ok(head: bytes) -> bool:
+    return PDF_MAGIC in head[:PDF_HEADER_WINDOW]
+
+
+def pdf_trailer_ok(path: str) -> bool:
+    """Whether the file ends like a whole PDF (its last %%EOF marker), i.e. wasn't cut short"""
+    with open(path, "rb") as f:
+        f.seek(max(0, os.path.getsize(path) - PDF_TRAILER_WINDOW))
+        return b"%%EOF" in f.read()
+
+
+def is_pdf_file(path: str) -> bool:
+    with open(path, "rb") as f:
+        head = f.read(PDF_HEADER_WINDOW)
+    return pdf_header_ok(head) and pdf_trailer_ok(path)
+
+
+def _expected_size(response, offset: int) -> int | None:
+    """Full size of the file being fetched, from Content-Range or Content-Length"""
+    if response.status_code == 206:
+        total = response.headers.get("Content-Range", "").rpartition("/")[2]
+        if total.isdigit():
+            return int(total)
+    length = response.headers.get("Content-Length", "")
+    return offset + int(length) if length.isdigit() else None
+
+
+def _body_chunks(response):
+    """Body chunks as they arrive, so a dropped connection loses none of what was received
+    (``iter_content`` waits for whole chunks and drops a partial one)"""
+    raw = response.raw
+    if not hasattr(raw, "read1"):  # urllib3 < 2
+        yield from response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES)
+        return
+    while True:
+        chunk = raw.read1(DOWNLOAD_CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _fetch_part(pdf_url: str, partial: str, offset: int, validator: str | None,
+                cancel: threading.Event | None) -> tuple[bool, str | None, bool]:
+    """One GET of ``pdf_url`` into ``partial``, continuing at ``offset`` with a Range request.
+
+    Returns (complete, validator, resumable): whether the body arrived in
+    full, the ETag/Last-Modified to resume against, and whether the server
+    takes Range requests. Raises DownloadRejected for anything that isn't
+    the PDF, before reading more of it than necessary.
+    """
+    # Uncompressed, so sizes and Range offsets count bytes of the file itself
+    headers = {"Accept": "application/pdf", "Accept-Encoding": "identity"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        if validator:
+            headers["If-Range"] = validator
+    with SESSION.get(pdf_url, headers=headers, timeout=60, stream=True, allow_redirects=True) as r:
+        if r.status_code == 416 and offset:
+            # Nothing past what we have: the partial file already is the whole body
+            return True, validator, True
+        if r.status_code == 206 and not r.headers.get("Content-Range", "").startswith(f"bytes {offset}-"):
+            raise DownloadRejected("bad_range")
+        if r.status_code not in (200, 206):
+            raise DownloadRejected(f"HTTP {r.status_code}")
+        if r.status_code == 200:
+            # A fresh copy: the server ignored the Range or the file changed since
+            offset = 0
+        content_type = r.headers.get("Content-Type", "").lower()
+        if any(marker in content_type for marker in NOT_PDF_TYPES):
+            raise DownloadRejected("not_pdf")
+        expected = _expected_size(r, offset)
+        if expected is not None and expected > PDF_MAX_BYTES:
+            raise DownloadRejected("too_large")
+        validator = r.headers.get("ETag") or r.headers.get("Last-Modified") or validator
+        resumable = r.status_code == 206 or r.headers.get("Accept-Ranges", "").lower() == "bytes"
+
+        size = offset
+        # The header is checked before anything is written, on the first chunks of a fresh copy
+        head = b"" if offset == 0 else None
+        with open(partial, "ab" if offset else "wb") as f:
+            try:
+                for chunk in _body_chunks(r):
+                    if cancel is not None and cancel.is_set():
+                        raise DownloadRejected("cancelled")
+                    if head is not None:
+                        head += chunk
+                        if len(head) < PDF_HEADER_WINDOW:
+                            continue
+                        chunk, head = head, None
+                        if not pdf_header_ok(chunk):
+                            raise DownloadRejected("not_pdf")
+                    f.write(chunk)
+                    size += len(chunk)
+                    if size > PDF_MAX_BYTES:
+                        raise DownloadRejected("too_large")
+            except (requests.RequestException, urllib3.exceptions.HTTPError):
+                # Connection dropped mid-body: keep what arrived for a Range request
+                return False, validator, resumable
+            if head is not None:
+                if not pdf_header_ok(head):
+                    raise DownloadRejected("not_pdf")
+                f.write(head)
+                size += len(head)
+    complete = size >= expected if expected is not None else pdf_trailer_ok(partial)
+    return complete, validator, resumable
+
+
+def download_pdf(pdf_url, filepath, cancel: threading.Event | None = None):
+    """Download a PDF from ``pdf_url`` to ``filepath``, only if it is one.
+
+    The body streams into a ``.part`` file renamed into place once complete,
+    so ``filepath`` never holds a partial download. HTML paywall and error
+    pages are rejected by Content-Type or the ``%PDF`` header on the first
+    chunk, bodies over PDF_MAX_BYTES as soon as that is known, and a transfer
+    that breaks off is resumed with a Range request (up to PDF_DOWNLOAD_ATTEMPTS
+    tries; a later run resumes it too). Aborts and removes the partial file if
+    ``cancel`` is set.
+    """
+    partial = partial_path(filepath, pdf_url)
+    keep_partial = False
     try:
-        with SESSION.get(
-            pdf_url,
-            headers={"Accept": "application/pdf"},
-            timeout=60,
-            stream=True,
-            allow_redirects=True,
-        ) as r:
-            if r.status_code != 200:
-                return False
+        with span("download_pdf", "download", url=pdf_url) as s:
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            with open(filepath, "wb") as f:
-                for chunk in r.iter_content(chunk_size=1024 * 64):
-                    if chunk:
-                        f.write(chunk)
+            validator = None
+            attempts = max(1, PDF_DOWNLOAD_ATTEMPTS)
+            for attempt in range(1, attempts + 1):
+                offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+                complete, validator, resumable = _fetch_part(pdf_url, partial, offset, validator, cancel)
+                if complete:
+                    break
+                # A server taking Range requests can finish the transfer now or in a later run
+                keep_partial = resumable
+                if not resumable or attempt == attempts:
+                    raise DownloadRejected("truncated")
+                print(f"   ↪️ Transfer cut off at {os.path.getsize(partial)} bytes, resuming")
+            keep_partial = False
+            if not pdf_trailer_ok(partial):
+                # Delivered in full, but the file itself is cut short
+                raise DownloadRejected("truncated")
+            s.set(status=200, bytes=os.path.getsize(partial), attempts=attempt)
+            os.replace(partial, filepath)
         print(f"✅ Downloaded: {filepath}")
         return True
+    except DownloadRejected as e:
+        if e.reason != "cancelled":
+            print(f"⚠️ Not a usable PDF ({e.reason}): {pdf_url}")
+        keep_partial = keep_partial and e.reason == "truncated"
     except Exception as e:
         print(f"❌ Error: {e}")
-        return False
+    if not keep_partial:
+        try:
+            os.remove(partial)
+        except OSError:
+            pass
+    return False
 
-def stream_openalex_papers(topic, from_year=None, to_year=None, page_size=25):
-    """Stream papers from OpenAlex API"""
-    OPENALEX_BASE = "https://api.openalex.org/works"
+def fetch_openalex_page(base_url: str, params: dict, cache_mode: str) -> dict | None:
+    """Fetch one OpenAlex page through the response cache"""
+    cache = get_openalex_cache() if cache_mode != "off" else None
+    key = response_key(base_url, params) if cache else None
+
+    if cache and cache_mode in ("default", "offline"):
+        data = cache.get_json(key, allow_expired=cache_mode == "offline")
+        if data is not None:
+            return data
+    if cache_mode == "offline":
+        print("⚠️ OpenAlex offline replay: no recorded response for this page")
+        return None
+
+    try:
+        resp = SESSION.get(base_url, params=params, timeout=20)
+        time.sleep(0.5)
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception as e:
+        print(f"❌ OpenAlex request failed: {e}")
+        return None
+
+    if cache:
+        cache.set_json(key, data, ttl=OPENALEX_CACHE_TTL)
+    return data
+
+
+def stream_openalex_papers(topic, from_year=None, to_year=None, page_size=25, cache_mode=None):
+    """Stream papers from OpenAlex API (projected to the fields we use, cached on disk)"""
+    OPENALEX_BASE = os.getenv("OPENALEX_BASE_URL", "https://api.openalex.org/works")
     OPENALEX_MAILTO = os.getenv("OPENALEX_MAILTO", "research@example.com")
+    cache_mode = openalex_cache_mode(cache_mode)
+    page_size = max(1, min(page_size, OPENALEX_MAX_PAGE_SIZE))
     
     filters = ["is_oa:true"]
     if from_year:
@@ -151,15 +427,11 @@ def stream_openalex_papers(topic, from_year=None, to_year=None, page_size=25):
             "filter": ",".join(filters),
             "per_page": page_size,
             "cursor": cursor,
+            "select": OPENALEX_SELECT,
             "mailto": OPENALEX_MAILTO,
         }
-        try:
-            resp = SESSION.get(OPENALEX_BASE, params=params, timeout=20)
-            time.sleep(0.5)
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as e:
-            print(f"❌ OpenAlex request failed: {e}")
+        data = fetch_openalex_page(OPENALEX_BASE, params, cache_mode)
+        if data is None:
             return
 
         results = data.get("results", []) or []
@@ -175,12 +447,276 @@ def stream_openalex_papers(topic, from_year=None, to_year=None, page_size=25):
         cursor = next_cursor
 
 
+def prefetch_openalex_papers(topic, from_year, to_year, stop: threading.Event, buffer_size=50, **stream_kwargs):
+    """Page OpenAlex on a background thread so the next page is fetched while
+    earlier candidates are still being resolved and downloaded"""
+    buffer = queue.Queue(maxsize=buffer_size)
+    end = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for paper in stream_openalex_papers(topic, from_year, to_year, **stream_kwargs):
+                if not put(paper):
+                    return
+        finally:
+            put(end)
+
+    threading.Thread(target=produce, name="openalex-prefetch", daemon=True).start()
+    while True:
+        item = buffer.get()
+        if item is end:
+            return
+        yield item
+
+
+def screen_candidates(topic, from_year, to_year, keywords: list, pool_size: int = CANDIDATE_POOL,
+                      **stream_kwargs) -> list:
+    """Over-fetch up to ``pool_size`` candidates and rank them by relevance to ``keywords``.
+
+    Abstracts are rebuilt once here (stored as "abstract", with the score as
+    "relevance"); ties keep OpenAlex order.
+    """
+    candidates = []
+    for paper in stream_openalex_papers(topic, from_year, to_year, **stream_kwargs):
+        paper = dict(paper)
+        paper["abstract"] = abstract_from_inverted_index(paper.pop("abstract_inverted_index", None))
+        candidates.append(paper)
+        if len(candidates) >= pool_size:
+            break
+    if not candidates:
+        return []
+    scores = relevance_scores([p.get("title") for p in candidates], [p["abstract"] for p in candidates], keywords)
+    for paper, score in zip(candidates, scores):
+        paper["relevance"] = round(float(score), 3)
+    ranked = sorted(candidates, key=lambda p: -p["relevance"])
+    print(f"🎯 Screened {len(ranked)} candidates against {len(keywords)} keywords "
+          f"(relevance {ranked[-1]['relevance']} to {ranked[0]['relevance']})")
+    return ranked
+
+
+def build_paper_metadata(paper: dict, filepath: str, sha256: str | None = None) -> PaperRecord:
+    """Build the paper_metadata.json record for a downloaded paper"""
+    return PaperRecord(
+        title=paper.get("title") or "untitled",
+        year=paper.get("publication_year"),
+        doi=paper.get("doi"),
+        authors=[(a.get("author") or {}).get("display_name") for a in (paper.get("authorships") or [])[:3]],
+        file_path=filepath,
+        sha256=sha256,
+        relevance=paper.get("relevance"),
+        abstract=paper_abstract(paper),
+    )
+
+
+def acquire_paper(paper: dict, save_dir: str, unpaywall_email: str,
+                  cancel: threading.Event | None = None, store: PDFStore | None = None,
+                  throttle: float = 0.0, host_limited: bool = False) -> PaperRecord | None:
+    """Try store → OpenAlex → Unpaywall → Sci-Hub for one paper, return its metadata on success.
+
+    ``throttle`` seconds are slept after a successful network download;
+    with ``host_limited`` each PDF request waits for its host's rate limit.
+    """
+    title = paper.get("title") or "untitled"
+    year = paper.get("publication_year") or "Unknown"
+    doi = paper.get("doi")
+
+    print(f"\n📄 {title}")
+
+    filename = f"{year}-{sanitize_filename(title)}.pdf"
+    filepath = os.path.join(save_dir, filename)
+
+    # A PDF already fetched for another topic or run costs no network request
+    if store is not None:
+        sha = store.lookup(doi)
+        if sha:
+            store.link(sha, filepath)
+            print(f"♻️ From store: {filepath}")
+            return build_paper_metadata(paper, filepath, sha)
+
+    def cancelled() -> bool:
+        return cancel is not None and cancel.is_set()
+
+    # Try OpenAlex → Unpaywall → Sci-Hub
+    pdf_url = get_pdf_url_from_openalex(paper)
+    success = False
+
+    def download(url) -> bool:
+        if host_limited:
+            wait_for_host(url, cancel)
+        return not cancelled() and download_pdf(url, filepath, cancel)
+
+    if pdf_url:
+        success = download(pdf_url)
+
+    if not success and doi and not cancelled():
+        if get_unpaywall_resolver(unpaywall_email).is_known_negative(doi):
+            print("⏭️ Unpaywall has no OA copy (cached)")
+        else:
+            pdf_url = get_pdf_url_from_unpaywall(doi, unpaywall_email)
+            if pdf_url and not cancelled():
+                success = download(pdf_url)
+
+    if not success and doi and not cancelled():
+        success = download_from_scihub(doi, filepath)
+
+    if not success:
+        return None
+    if throttle:
+        time.sleep(throttle)
+    sha = store.add(filepath, doi) if store is not None else None
+    return build_paper_metadata(paper, filepath, sha)
+
+
+def is_duplicate(metadata: PaperRecord, seen_hashes: set) -> bool:
+    """True if the same PDF content was already accepted under another title"""
+    sha = metadata.sha256
+    if not sha:
+        return False
+    if sha in seen_hashes:
+        return True
+    seen_hashes.add(sha)
+    return False
+
+
+def acquire_papers_concurrently(topic, target_count, from_year, to_year, save_dir,
+                                unpaywall_email, max_workers=8, store: PDFStore | None = None,
+                                near_duplicates: list | None = None, ranked: list | None = None,
+                                **stream_kwargs) -> list:
+    """Resolve and download candidates on a bounded worker pool.
+
+    Returns the first ``target_count`` successes in OpenAlex stream order
+    (or in the order of ``ranked`` screened candidates), i.e. the same list
+    the sequential loop produces. Near-duplicate
+    candidates (see ``candidate_signature``) wait behind the attempt for
+    their cluster and are only tried if it fails; skipped ones are appended
+    to ``near_duplicates``. PDF requests are spaced per host (PDF_HOST_RATE).
+    Returns only once every worker has finished or given up.
+    """
+    stop = threading.Event()
+    if ranked is not None:
+        candidates = iter(ranked)
+    else:
+        candidates = prefetch_openalex_papers(topic, from_year, to_year, stop, **stream_kwargs)
+    outcomes = {}   # stream index -> PaperRecord, or None on failure
+    pending = {}    # future -> stream index
+    submitted = 0
+    exhausted = False
+    dedup = NearDuplicateIndex()
+    papers = {}     # stream index -> OpenAlex record
+    cluster_of = {}  # stream index -> (representative index, similarity)
+    waiting = {}    # representative -> deque of stream indexes behind the attempt in flight
+    won = set()     # representatives with an acquired paper
+
+    def selection() -> list | None:
+        # Settled once every candidate ahead of the target_count-th success is resolved
+        chosen = []
+        seen_hashes = set()
+        if target_count <= 0:
+            return chosen
+        for index in range(submitted):
+            if index not in outcomes:
+                return None
+            if outcomes[index] is not None and not is_duplicate(outcomes[index], seen_hashes):
+                chosen.append(outcomes[index])
+                if len(chosen) >= target_count:
+                    return chosen
+        return chosen if exhausted and not pending else None
+
+    def submit(index):
+        future = pool.submit(acquire_paper, papers[index], save_dir, unpaywall_email, stop, store,
+                             host_limited=True)
+        pending[future] = index
+
+    def skip(index):
+        outcomes[index] = None
+        representative, score = cluster_of[index]
+        if near_duplicates is not None:
+            near_duplicates.append(near_duplicate_note(papers[index], papers[representative], score))
+
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="paper-acquire")
+    try:
+        while True:
+            seen_hashes = set()
+            successes = sum(1 for m in outcomes.values() if m is not None and not is_duplicate(m, seen_hashes))
+            while not exhausted and successes < target_count and len(pending) < max_workers:
+                paper = next(candidates, None)
+                if paper is None:
+                    exhausted = True
+                    break
+                index = submitted
+                submitted += 1
+                papers[index] = paper
+                cluster_of[index] = dedup.add(index, candidate_signature(paper))
+                representative = cluster_of[index][0]
+                if representative in won:
+                    skip(index)
+                elif representative in waiting:
+                    waiting[representative].append(index)
+                else:
+                    waiting[representative] = deque()
+                    submit(index)
+
+            chosen = selection()
+            if chosen is not None:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                outcomes[index] = future.result()
+                representative = cluster_of[index][0]
+                queued = waiting[representative]
+                if outcomes[index] is not None:
+                    won.add(representative)
+                    del waiting[representative]
+                    for other in queued:
+                        skip(other)
+                elif queued:
+                    submit(queued.popleft())
+                else:
+                    del waiting[representative]
+    finally:
+        stop.set()
+        # In-flight attempts see ``stop`` and remove their partial files; wait
+        # for them so nothing is still writing once the tool has returned
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    # Remove PDFs fetched by workers that raced past the cut-off
+    kept = {m.file_path for m in chosen}
+    late = [f.result() for f in pending if not f.cancelled() and f.exception() is None]
+    for metadata in list(outcomes.values()) + late:
+        if metadata is not None and metadata.file_path not in kept:
+            try:
+                os.remove(metadata.file_path)
+            except OSError:
+                pass
+
+    return chosen
+
+
 class PaperDownloadInput(BaseModel):
     """Input schema for PaperDownloadTool"""
     topic: str = Field(..., description="Research topic to search for")
     target_count: int = Field(default=5, description="Number of papers to download")
     from_year: int = Field(default=None, description="Start year for paper search")
     to_year: int = Field(default=None, description="End year for paper search")
+    concurrent: bool = Field(default=False, description="Resolve and download candidates on a worker pool")
+    max_workers: int = Field(default=8, description="Worker pool size for concurrent mode")
+    use_store: bool = Field(default=True, description="Reuse PDFs from the shared content-addressed store")
+    cache_mode: str = Field(default=None, description="OpenAlex cache mode: default, refresh, offline or off")
+    output_format: str = Field(default=None, description="Artifact format: json or jsonl (streamed per paper)")
+    strategy_file: str = Field(default=None, description="research_strategy.json whose keywords rank the candidates")
+    rank_candidates: bool = Field(default=True, description="Screen an over-fetched candidate pool on metadata and download the most relevant")
+    candidate_pool: int = Field(default=None, description="Candidates screened when ranking (default: CANDIDATE_POOL)")
 
 
 class PaperDownloadTool(BaseTool):
@@ -188,72 +724,125 @@ class PaperDownloadTool(BaseTool):
     description: str = """
     Searches for academic papers on OpenAlex and downloads PDFs using 
     Unpaywall and Sci-Hub. Returns paths to downloaded papers and metadata.
-    Input: topic (required), target_count (default=5), from_year (optional), to_year (optional)
+    Input: topic (required), target_count (default=5), from_year (optional), to_year (optional),
+    concurrent (default=False), max_workers (default=8), use_store (default=True),
+    cache_mode (optional: default/refresh/offline/off), output_format (optional: json/jsonl),
+    strategy_file (default: research_strategy.json in the output directory), rank_candidates (default=True),
+    candidate_pool (optional).
+    Candidates are ranked on title and abstract against the strategy keywords before downloading.
+    Versions of the same paper (preprint, conference, journal) are fetched only once.
     """
     args_schema: Type[BaseModel] = PaperDownloadInput
+    # Where paper_metadata.json is written (one directory per topic in batch runs)
+    output_dir: str = "outputs"
 
-    def _run(self, topic: str, target_count: int = 5, from_year: int = None, to_year: int = None) -> str:
+    @traced_tool
+    def _run(self, topic: str, target_count: int = 5, from_year: int = None, to_year: int = None,
+             concurrent: bool = False, max_workers: int = 8, use_store: bool = True,
+             cache_mode: str = None, output_format: str = None, strategy_file: str = None,
+             rank_candidates: bool = True, candidate_pool: int = None) -> str:
         """Execute paper download"""
         print(f"\n🔎 Searching papers on: '{topic}'")
         
+        try:
+            cache_mode = openalex_cache_mode(cache_mode)
+            output_format = artifact_format(output_format)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        
         save_dir = os.path.join("papers", sanitize_filename(topic))
         os.makedirs(save_dir, exist_ok=True)
         
-        downloaded = 0
         metadata_list = []
+        # Candidates skipped as near-duplicates (preprint / conference / journal versions)
+        near_duplicates = []
         unpaywall_email = os.getenv("UNPAYWALL_EMAIL", "research@example.com")
+        store = get_pdf_store() if use_store else None
+        # Over-fetch a little so failed candidates rarely cost an extra page
+        stream_kwargs = {
+            "page_size": min(OPENALEX_MAX_PAGE_SIZE, max(25, target_count * 2)),
+            "cache_mode": cache_mode,
+        }
         
-        for paper in stream_openalex_papers(topic, from_year, to_year):
-            if downloaded >= target_count:
-                break
-                
-            title = paper.get("title") or "untitled"
-            year = paper.get("publication_year") or "Unknown"
-            doi = paper.get("doi")
-            
-            print(f"\n📄 {title}")
-            
-            filename = f"{year}-{sanitize_filename(title)}.pdf"
-            filepath = os.path.join(save_dir, filename)
-            
-            # Try OpenAlex → Unpaywall → Sci-Hub
-            pdf_url = get_pdf_url_from_openalex(paper)
-            success = False
-            
-            if pdf_url:
-                success = download_pdf(pdf_url, filepath)
-            
-            if not success and doi:
-                pdf_url = get_pdf_url_from_unpaywall(doi, unpaywall_email)
-                if pdf_url:
-                    success = download_pdf(pdf_url, filepath)
-            
-            if not success and doi:
-                success = download_from_scihub(doi, filepath)
-            
-            if success:
-                downloaded += 1
-                metadata_list.append({
-                    "title": title,
-                    "year": year,
-                    "doi": doi,
-                    "file_path": filepath,
-                    "authors": [a.get("author", {}).get("display_name") for a in paper.get("authorships", [])[:3]],
-                    "abstract": paper.get("abstract_inverted_index")
-                })
-                time.sleep(0.8)
+        ranked = None
+        if rank_candidates:
+            # Downloads are the expensive step: spend them on the most relevant candidates
+            strategy_file = strategy_file or os.path.join(self.output_dir, "research_strategy.json")
+            keywords = strategy_keywords(strategy_file) or [topic]
+            pool_size = max(candidate_pool or CANDIDATE_POOL, target_count)
+            ranked = screen_candidates(
+                topic, from_year, to_year, keywords, pool_size,
+                **{**stream_kwargs, "page_size": min(OPENALEX_MAX_PAGE_SIZE, pool_size)}
+            )
+            # The candidates likely to be tried are known now: look their DOIs up together
+            prefetch_unpaywall(ranked[:target_count * UNPAYWALL_PREFETCH], unpaywall_email,
+                               max_workers=max(1, max_workers))
+
+        metadata_path = artifact_path(os.path.join(self.output_dir, "paper_metadata.json"), output_format)
+        os.makedirs(self.output_dir, exist_ok=True)
+        # JSON Lines: append each paper as it is acquired, so a crash keeps what was downloaded
+        writer = JSONLWriter(metadata_path) if output_format == "jsonl" else None
+        
+        try:
+            if concurrent:
+                metadata_list = acquire_papers_concurrently(
+                    topic, target_count, from_year, to_year, save_dir,
+                    unpaywall_email, max_workers=max(1, max_workers), store=store,
+                    near_duplicates=near_duplicates, ranked=ranked, **stream_kwargs
+                )
+                if writer:
+                    for metadata in metadata_list:
+                        writer.write(metadata)
+            else:
+                seen_hashes = set()
+                dedup = NearDuplicateIndex()
+                papers = []
+                acquired_clusters = set()
+                if ranked is None:
+                    candidates = stream_openalex_papers(topic, from_year, to_year, **stream_kwargs)
+                else:
+                    candidates = ranked
+                for paper in candidates:
+                    if len(metadata_list) >= target_count:
+                        break
+
+                    # Only one version of a paper is fetched; later ones are tried if it failed
+                    representative, score = dedup.add(len(papers), candidate_signature(paper))
+                    papers.append(paper)
+                    if representative in acquired_clusters:
+                        near_duplicates.append(near_duplicate_note(paper, papers[representative], score))
+                        continue
+
+                    metadata = acquire_paper(paper, save_dir, unpaywall_email, store=store, throttle=0.8)
+                    if metadata and is_duplicate(metadata, seen_hashes):
+                        print(f"⏭️ Same PDF already downloaded, skipping: {metadata.file_path}")
+                        if metadata.file_path not in {m.file_path for m in metadata_list}:
+                            os.remove(metadata.file_path)
+                    elif metadata:
+                        acquired_clusters.add(representative)
+                        metadata_list.append(metadata)
+                        if writer:
+                            writer.write(metadata)
+        finally:
+            if writer:
+                writer.close()
+        
+        downloaded = len(metadata_list)
         
         # Save metadata
-        metadata_path = os.path.join("outputs", "paper_metadata.json")
-        os.makedirs("outputs", exist_ok=True)
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(metadata_list, f, indent=2, ensure_ascii=False)
+        if not writer:
+            write_paper_records(metadata_path, metadata_list)
         
         result = {
             "downloaded_count": downloaded,
             "papers_directory": save_dir,
             "metadata_file": metadata_path,
-            "papers": metadata_list
+            "format": output_format,
+            "near_duplicates_skipped": near_duplicates
         }
+        if ranked is not None:
+            result["screened_candidates"] = len(ranked)
+        if not writer:
+            result["papers"] = [m.to_dict() for m in metadata_list]
         
         return json.dumps(result, indent=2, ensure_ascii=False)
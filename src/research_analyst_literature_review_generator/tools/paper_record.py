@@ -0,0 +1,211 @@
+# tools/paper_record.py
+import gc
+import json
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    import orjson  # installed with crewai's dependencies; plain json otherwise
+except ImportError:
+    orjson = None
+
+# Serialized in this order; fields a record doesn't have are left out
+FIELDS = (
+    "title", "year", "doi", "authors", "file_path", "sha256", "relevance",
+    "full_text_length", "abstract", "introduction", "methodology", "results", "conclusion", "keywords",
+)
+# Extracted records used to carry the PDF hash under this name
+FIELD_ALIASES = {"pdf_sha256": "sha256"}
+_KNOWN_KEYS = frozenset(FIELDS) | frozenset(FIELD_ALIASES)
+
+# Parsed artifacts kept in memory, keyed by path, mtime and size
+RECORD_CACHE_FILES = 8
+
+
+def _year(value) -> int | None:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+
+def _str_list(value) -> tuple:
+    # A tuple, so records shared through the artifact cache can't be changed in place
+    if not isinstance(value, (list, tuple)):
+        return ()
+    if None not in value and "" not in value:
+        return tuple(value)
+    return tuple(s for s in (str(v).strip() for v in value if v) if s)
+
+
+class PaperRecord:
+    """One paper as every tool sees it: download metadata plus extracted content.
+
+    Slots instead of a per-record dict keep large corpora small, and values
+    are normalized once on the way in: ``year`` is an int or None (never
+    "Unknown"), ``authors`` and ``keywords`` are tuples of strings without
+    None entries (``to_dict`` returns them as new lists). Keys outside the
+    schema (e.g. fields an agent added) are kept in ``extra`` and written
+    back unchanged.
+    """
+
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, title: str | None = None, year=None, doi: str | None = None, authors=None, **fields):
+        self.title = title or None
+        self.year = _year(year)
+        self.doi = doi or None
+        self.authors = _str_list(authors)
+        self.keywords = _str_list(fields.pop("keywords", None))
+        for name in FIELDS[4:]:
+            if name != "keywords":
+                setattr(self, name, fields.pop(name, None))
+        self.extra = fields or None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PaperRecord":
+        # Fills the slots directly: this is the hot path when loading artifacts
+        record = cls.__new__(cls)
+        get = data.get
+        year = get("year")
+        record.title = get("title") or None
+        record.year = year if type(year) is int else _year(year)
+        record.doi = get("doi") or None
+        record.authors = _str_list(get("authors"))
+        record.file_path = get("file_path")
+        record.sha256 = get("sha256") or get("pdf_sha256")
+        record.relevance = get("relevance")
+        record.full_text_length = get("full_text_length")
+        record.abstract = get("abstract")
+        record.introduction = get("introduction")
+        record.methodology = get("methodology")
+        record.results = get("results")
+        record.conclusion = get("conclusion")
+        record.keywords = _str_list(get("keywords"))
+        unknown = data.keys() - _KNOWN_KEYS
+        record.extra = {key: data[key] for key in data if key in unknown} if unknown else None
+        return record
+
+    def to_dict(self) -> dict:
+        data = {}
+        for name in FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = list(value) if type(value) is tuple else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return f"PaperRecord({self.title!r}, {self.year!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, PaperRecord) and self.to_dict() == other.to_dict()
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+def dumps(data, indent: bool = False) -> bytes:
+    """JSON bytes for records (or anything JSON-serializable containing them)"""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(data, default=_default, option=option)
+    return json.dumps(data, default=_default, ensure_ascii=False, indent=2 if indent else None,
+                      separators=None if indent else (",", ":")).encode("utf-8")
+
+
+def loads(data: bytes | str):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _default(value):
+    if isinstance(value, PaperRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def iter_json_records(path: str):
+    """Yield the raw items of a .json array or .jsonl file (a torn final line is ignored).
+
+    Every artifact goes through this codec; ``iter_paper_records`` builds
+    PaperRecords from it, ``artifacts.iter_records`` hands out the items as is.
+    """
+    with open(path, "rb") as f:
+        if not path.endswith(".jsonl"):
+            yield from loads(f.read())
+            return
+        pending = None
+        for line in f:
+            if pending is not None:
+                raise ValueError(f"Corrupt record in {path}: {pending[:80]!r}")
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = loads(line)
+            except ValueError:
+                # Tolerated only as the last line (an interrupted write)
+                pending = line
+                continue
+            yield item
+
+
+def iter_paper_records(path: str):
+    """Yield records from a .json array or .jsonl file (a torn final line is ignored)"""
+    return map(PaperRecord.from_dict, iter_json_records(path))
+
+
+def _parse_all(path: str) -> tuple:
+    # Records are acyclic, so the cyclic collector has nothing to find while
+    # they are built; pausing it avoids repeated full traversals of a heap
+    # that grows by tens of thousands of objects
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return tuple(iter_paper_records(path))
+    finally:
+        if enabled:
+            gc.enable()
+
+
+_record_cache = OrderedDict()
+_record_cache_lock = threading.Lock()
+
+
+def load_paper_records(path: str) -> list:
+    """All records of an artifact, parsed once per file version.
+
+    Tools reading the same artifact in one process (e.g. a citation run per
+    style) share the parsed records, so treat them as read-only.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _record_cache_lock:
+        records = _record_cache.get(key)
+        if records is not None:
+            _record_cache.move_to_end(key)
+            return list(records)
+    records = _parse_all(path)
+    with _record_cache_lock:
+        _record_cache[key] = records
+        while len(_record_cache) > RECORD_CACHE_FILES:
+            _record_cache.popitem(last=False)
+    return list(records)
+
+
+def write_paper_records(path: str, records: list):
+    """Write records as an indented .json array or a .jsonl file, in one pass"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        if path.endswith(".jsonl"):
+            for record in records:
+                f.write(dumps(record) + b"\n")
+        else:
+            f.write(dumps(list(records), indent=True))
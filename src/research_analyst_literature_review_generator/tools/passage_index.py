@@ -0,0 +1,424 @@
+# tools/passage_index.py
+import bisect
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+from collections import Counter
+
+import numpy as np
+
+from .sqlite_cache import CACHE_DIR
+
+# Bump whenever chunking or tokenization changes; a stale index is rebuilt
+INDEX_VERSION = "1"
+PASSAGE_WORDS = int(os.getenv("PASSAGE_WORDS", 120))
+PASSAGE_OVERLAP = int(os.getenv("PASSAGE_OVERLAP", 30))
+# Compact once there are more segments than this (each one costs a lookup per query term)
+MAX_SEGMENTS = int(os.getenv("PASSAGE_INDEX_MAX_SEGMENTS", 8))
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+SECTION_NAMES = ("abstract", "introduction", "methodology", "results", "conclusion", "body")
+
+WORD_RE = re.compile(r"\S+")
+TERM_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+MAX_TERM_CHARS = 32
+
+# Only function words: domain terms like "method" or "results" matter for retrieval
+STOPWORDS = frozenset("""
+    a an and are as at be been but by can do does for from had has have he her his how i if in into is it its
+    may more most not of on or our she should so such than that the their them then there these they this
+    those to was we were what when where which while who why will with would you your
+""".split())
+
+ARRAYS = ("vocab", "offsets", "postings", "tf", "lengths", "passage_doc", "passage_section", "text_offsets")
+
+
+def passage_index_enabled() -> bool:
+    return os.getenv("PASSAGE_INDEX", "1").lower() not in ("0", "false", "off", "no")
+
+
+def tokenize(text: str) -> list:
+    """Lowercase terms without function words, with a light plural fold ("models" -> "model")"""
+    terms = []
+    for term in TERM_RE.findall(text.lower()):
+        if len(term) < 2 or len(term) > MAX_TERM_CHARS or term in STOPWORDS:
+            continue
+        if len(term) > 3 and term[-1] == "s" and term[-2] not in "sui":
+            term = term[:-1]
+        terms.append(term)
+    return terms
+
+
+def chunk_passages(text: str, spans: dict | None = None, words: int = PASSAGE_WORDS,
+                   overlap: int = PASSAGE_OVERLAP) -> list:
+    """Split ``text`` into overlapping windows of ``words`` words.
+
+    Returns (section, passage) pairs; the section is the one of ``spans``
+    ({name: (start, end)}) the passage starts in, else "body".
+    """
+    matches = list(WORD_RE.finditer(text))
+    ordered = sorted((start, end, name) for name, (start, end) in (spans or {}).items())
+    starts = [start for start, _, _ in ordered]
+    step = max(1, words - overlap)
+    passages = []
+    for i in range(0, max(len(matches) - overlap, 1), step):
+        window = matches[i:i + words]
+        if not window:
+            break
+        position = window[0].start()
+        k = bisect.bisect_right(starts, position) - 1
+        section = ordered[k][2] if k >= 0 and position < ordered[k][1] else "body"
+        passages.append((section, " ".join(m.group() for m in window)))
+    return passages
+
+
+def _segments_dir(root: str) -> str:
+    return os.path.join(root, "segments")
+
+
+def _doc_segment_name(sha: str) -> str:
+    return f"doc-{sha}"
+
+
+def _write_segment(root: str, name: str, docs: list, arrays: dict, text_parts: list) -> bool:
+    """Write a segment into a scratch directory and rename it into place.
+
+    ``text_parts`` are bytes or paths of text.bin files to concatenate; the
+    rename makes the segment visible only once complete. Returns False if a
+    segment of that name already exists.
+    """
+    final = os.path.join(_segments_dir(root), name)
+    tmp = os.path.join(_segments_dir(root), f".tmp-{uuid.uuid4().hex}")
+    os.makedirs(tmp)
+    try:
+        for key in ARRAYS:
+            np.save(os.path.join(tmp, f"{key}.npy"), arrays[key])
+        with open(os.path.join(tmp, "text.bin"), "wb") as out:
+            for part in text_parts:
+                if isinstance(part, bytes):
+                    out.write(part)
+                else:
+                    with open(part, "rb") as f:
+                        shutil.copyfileobj(f, out)
+        with open(os.path.join(tmp, "docs.json"), "w", encoding="utf-8") as f:
+            json.dump(docs, f, ensure_ascii=False)
+        os.rename(tmp, final)
+        return True
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if os.path.isdir(final):
+            return False
+        raise
+
+
+def _postings(terms: np.ndarray, pids: np.ndarray, tfs: np.ndarray) -> dict:
+    """CSR postings: sorted vocabulary, per-term offsets, passage ids and term frequencies"""
+    if not len(terms):
+        return {"vocab": np.array([], dtype="<U1"), "offsets": np.zeros(1, dtype=np.int64),
+                "postings": np.zeros(0, dtype=np.int32), "tf": np.zeros(0, dtype=np.uint16)}
+    vocab, inverse = np.unique(terms, return_inverse=True)
+    order = np.lexsort((pids, inverse))
+    offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(inverse, minlength=len(vocab)), out=offsets[1:])
+    return {"vocab": vocab, "offsets": offsets, "postings": pids[order].astype(np.int32),
+            "tf": np.minimum(tfs[order], np.iinfo(np.uint16).max).astype(np.uint16)}
+
+
+def index_document(root: str, sha: str, meta: dict, text: str, spans: dict | None = None) -> bool:
+    """Chunk one paper's full text and write it as its own segment under ``root``.
+
+    Safe to call from worker processes: it never touches the manifest, the
+    parent registers new segments with ``PassageIndex.refresh``.
+    """
+    name = _doc_segment_name(sha)
+    if os.path.isdir(os.path.join(_segments_dir(root), name)):
+        return False
+    passages = chunk_passages(text, spans)
+    terms, pids, tfs, lengths, blobs = [], [], [], [], []
+    for pid, (_, passage) in enumerate(passages):
+        tokens = tokenize(passage)
+        counts = Counter(tokens)
+        terms.extend(counts)
+        tfs.extend(counts.values())
+        pids.extend([pid] * len(counts))
+        lengths.append(len(tokens))
+        blobs.append(passage.encode("utf-8"))
+
+    arrays = _postings(np.array(terms, dtype=str), np.array(pids, dtype=np.int32), np.array(tfs, dtype=np.int64))
+    text_offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in blobs], out=text_offsets[1:])
+    arrays.update({
+        "lengths": np.array(lengths, dtype=np.int32),
+        "passage_doc": np.zeros(len(passages), dtype=np.int32),
+        "passage_section": np.array([SECTION_NAMES.index(s) for s, _ in passages], dtype=np.int8),
+        "text_offsets": text_offsets,
+    })
+    doc = {"sha": sha, "title": meta.get("title"), "year": meta.get("year"), "doi": meta.get("doi")}
+    return _write_segment(root, name, [doc], arrays, [b"".join(blobs)])
+
+
+class Segment:
+    """Read-only view of one segment; every array is memory-mapped"""
+
+    def __init__(self, path: str):
+        self.path = path
+        for key in ARRAYS:
+            setattr(self, key, np.load(os.path.join(path, f"{key}.npy"), mmap_mode="r"))
+        with open(os.path.join(path, "docs.json"), "r", encoding="utf-8") as f:
+            self.docs = json.load(f)
+        size = os.path.getsize(os.path.join(path, "text.bin"))
+        self.text = np.memmap(os.path.join(path, "text.bin"), dtype=np.uint8, mode="r") if size else None
+
+    def lookup(self, term: str) -> tuple | None:
+        """(passage ids, term frequencies) for ``term``, or None if absent"""
+        i = int(np.searchsorted(self.vocab, term))
+        if i < len(self.vocab) and self.vocab[i] == term:
+            start, end = self.offsets[i], self.offsets[i + 1]
+            return self.postings[start:end], self.tf[start:end]
+        return None
+
+    def passage(self, pid: int) -> str:
+        return self.text[self.text_offsets[pid]:self.text_offsets[pid + 1]].tobytes().decode("utf-8")
+
+
+class PassageIndex:
+    """Persistent BM25 index over chunked full-text passages of every parsed paper.
+
+    Papers are added as immutable segments (one per paper, written by the
+    parser workers) and the smallest segments are merged once there are more
+    than ``max_segments``. Layout::
+
+        <root>/manifest.json               {"version", "segments": {name: {"passages", "tokens"}},
+                                            "docs": {sha: segment name}}
+        <root>/segments/<name>/*.npy        CSR postings, passage lengths, sections and text offsets
+        <root>/segments/<name>/text.bin     passage text (UTF-8)
+        <root>/segments/<name>/docs.json    [{"sha", "title", "year", "doi"}]
+    """
+
+    def __init__(self, root: str | None = None, max_segments: int = MAX_SEGMENTS):
+        self.root = os.path.abspath(root or os.path.join(CACHE_DIR, "passages"))
+        self.manifest_path = os.path.join(self.root, "manifest.json")
+        self.max_segments = max_segments
+        self.version = f"{INDEX_VERSION}:{PASSAGE_WORDS}:{PASSAGE_OVERLAP}"
+        self._lock = threading.RLock()
+        self._segments = {}
+        self._mtime = None
+        os.makedirs(_segments_dir(self.root), exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> dict:
+        try:
+            self._mtime = os.path.getmtime(self.manifest_path)
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = None
+        if manifest is None or manifest.get("version") != self.version:
+            if manifest is not None:
+                print("♻️ Passage index format changed, rebuilding")
+            shutil.rmtree(_segments_dir(self.root), ignore_errors=True)
+            os.makedirs(_segments_dir(self.root), exist_ok=True)
+            manifest = {"version": self.version, "segments": {}, "docs": {}}
+        return manifest
+
+    def _save_manifest(self):
+        tmp = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False)
+        os.replace(tmp, self.manifest_path)
+        self._mtime = os.path.getmtime(self.manifest_path)
+
+    def _reload_if_changed(self):
+        try:
+            mtime = os.path.getmtime(self.manifest_path)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.manifest = self._load_manifest()
+
+    def _segment(self, name: str) -> Segment:
+        segment = self._segments.get(name)
+        if segment is None:
+            segment = self._segments[name] = Segment(os.path.join(_segments_dir(self.root), name))
+        return segment
+
+    def has(self, sha: str) -> bool:
+        """Whether the paper with this PDF hash is indexed (or written and awaiting ``refresh``)"""
+        with self._lock:
+            if sha in self.manifest["docs"]:
+                return True
+        return os.path.isdir(os.path.join(_segments_dir(self.root), _doc_segment_name(sha)))
+
+    def add(self, sha: str, meta: dict, text: str, spans: dict | None = None):
+        """Index one paper in-process (the parser does this in its workers)"""
+        if not self.has(sha):
+            index_document(self.root, sha, meta, text, spans)
+        self.refresh()
+
+    def refresh(self) -> int:
+        """Register segments written since the last call, compacting if needed; returns papers added"""
+        added = 0
+        with self._lock:
+            self._reload_if_changed()
+            for name in sorted(os.listdir(_segments_dir(self.root))):
+                if name.startswith(".") or name in self.manifest["segments"]:
+                    continue
+                segment = Segment(os.path.join(_segments_dir(self.root), name))
+                shas = [doc["sha"] for doc in segment.docs]
+                if all(sha in self.manifest["docs"] for sha in shas):
+                    # Already merged elsewhere (written twice by concurrent runs)
+                    shutil.rmtree(segment.path, ignore_errors=True)
+                    continue
+                self._segments[name] = segment
+                self.manifest["segments"][name] = {"passages": len(segment.lengths),
+                                                   "tokens": int(np.sum(segment.lengths, dtype=np.int64))}
+                for sha in shas:
+                    self.manifest["docs"][sha] = name
+                added += len(shas)
+            if added:
+                if len(self.manifest["segments"]) > self.max_segments:
+                    self._compact()
+                self._save_manifest()
+        return added
+
+    def _compact(self):
+        """Merge the smallest segments into one, leaving about half of ``max_segments``"""
+        by_size = sorted(self.manifest["segments"], key=lambda n: self.manifest["segments"][n]["passages"])
+        names = by_size[:max(2, len(by_size) - self.max_segments // 2)]
+        segments = [self._segment(name) for name in names]
+
+        docs, terms, pids, tfs, text_parts = [], [], [], [], []
+        lengths, passage_doc, passage_section, text_offsets = [], [], [], [np.zeros(1, dtype=np.int64)]
+        passage_base = byte_base = 0
+        for segment in segments:
+            terms.append(np.repeat(np.asarray(segment.vocab), np.diff(segment.offsets)))
+            pids.append(np.asarray(segment.postings, dtype=np.int64) + passage_base)
+            tfs.append(np.asarray(segment.tf, dtype=np.int64))
+            lengths.append(segment.lengths)
+            passage_doc.append(np.asarray(segment.passage_doc) + len(docs))
+            passage_section.append(segment.passage_section)
+            text_offsets.append(np.asarray(segment.text_offsets[1:]) + byte_base)
+            text_parts.append(os.path.join(segment.path, "text.bin"))
+            docs.extend(segment.docs)
+            passage_base += len(segment.lengths)
+            byte_base += int(segment.text_offsets[-1])
+
+        arrays = _postings(np.concatenate(terms), np.concatenate(pids), np.concatenate(tfs))
+        arrays.update({
+            "lengths": np.concatenate(lengths).astype(np.int32),
+            "passage_doc": np.concatenate(passage_doc).astype(np.int32),
+            "passage_section": np.concatenate(passage_section).astype(np.int8),
+            "text_offsets": np.concatenate(text_offsets),
+        })
+        name = f"merged-{uuid.uuid4().hex[:12]}"
+        _write_segment(self.root, name, docs, arrays, text_parts)
+
+        self.manifest["segments"][name] = {
+            "passages": passage_base,
+            "tokens": sum(self.manifest["segments"][n]["tokens"] for n in names),
+        }
+        for n in names:
+            del self.manifest["segments"][n]
+            self._segments.pop(n, None)
+        for doc in docs:
+            self.manifest["docs"][doc["sha"]] = name
+        self._save_manifest()
+        # Open memory maps keep the old files readable until they are dropped
+        for segment in segments:
+            shutil.rmtree(segment.path, ignore_errors=True)
+        print(f"🗜️ Merged {len(names)} passage index segments ({passage_base} passages)")
+
+    def search(self, query: str, top_k: int = 5, shas=None, max_per_paper: int | None = None) -> list:
+        """Top ``top_k`` passages for ``query`` by BM25, best first.
+
+        ``shas`` restricts the search to those papers; ``max_per_paper`` caps
+        how many (overlapping) passages one paper may contribute.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or top_k <= 0:
+            return []
+        with self._lock:
+            self._reload_if_changed()
+            segments = [self._segment(name) for name in self.manifest["segments"]]
+            total = sum(s["passages"] for s in self.manifest["segments"].values())
+            tokens = sum(s["tokens"] for s in self.manifest["segments"].values())
+        if not total:
+            return []
+        avgdl = tokens / total
+
+        hits = [[segment.lookup(term) for term in terms] for segment in segments]
+        df = np.zeros(len(terms))
+        for segment_hits in hits:
+            df += [len(hit[0]) if hit else 0 for hit in segment_hits]
+        idf = np.log1p((total - df + 0.5) / (df + 0.5))
+
+        # Enough candidates per segment to fill top_k after the per-paper cap
+        depth = top_k * (4 if max_per_paper else 1)
+        candidates = []
+        for segment, segment_hits in zip(segments, hits):
+            if not any(segment_hits):
+                continue
+            scores = np.zeros(len(segment.lengths), dtype=np.float32)
+            for weight, hit in zip(idf, segment_hits):
+                if hit:
+                    pids, tf = hit
+                    tf = tf.astype(np.float32)
+                    norm = K1 * (1 - B + B * segment.lengths[pids] / avgdl)
+                    scores[pids] += weight * tf * (K1 + 1) / (tf + norm)
+            found = np.flatnonzero(scores)
+            if shas is not None:
+                allowed = [i for i, doc in enumerate(segment.docs) if doc["sha"] in shas]
+                found = found[np.isin(segment.passage_doc[found], allowed)]
+            if len(found) > depth:
+                found = found[np.argpartition(-scores[found], depth - 1)[:depth]]
+            candidates.extend((float(scores[pid]), segment, int(pid)) for pid in found)
+
+        results = []
+        per_paper = Counter()
+        for score, segment, pid in sorted(candidates, key=lambda c: -c[0]):
+            doc = segment.docs[segment.passage_doc[pid]]
+            if max_per_paper and per_paper[doc["sha"]] >= max_per_paper:
+                continue
+            per_paper[doc["sha"]] += 1
+            results.append({
+                "score": round(score, 3),
+                "title": doc.get("title"),
+                "year": doc.get("year"),
+                "doi": doc.get("doi"),
+                "section": SECTION_NAMES[segment.passage_section[pid]],
+                "passage": segment.passage(pid),
+                "sha256": doc["sha"],
+            })
+            if len(results) == top_k:
+                break
+        return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._reload_if_changed()
+            segments = self.manifest["segments"]
+            return {
+                "papers": len(self.manifest["docs"]),
+                "passages": sum(s["passages"] for s in segments.values()),
+                "segments": len(segments),
+            }
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_passage_index(root: str | None = None) -> PassageIndex:
+    """Shared index per root (default ``<cache dir>/passages``)"""
+    key = os.path.abspath(root or os.path.join(CACHE_DIR, "passages"))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = PassageIndex(key)
+        return index
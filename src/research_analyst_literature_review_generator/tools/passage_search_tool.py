@@ -0,0 +1,83 @@
+# tools/passage_search_tool.py
+import json
+import os
+import time
+from typing import Type
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from ..checkpoints import resolve_artifact
+from ..tracing import traced_tool
+from .paper_record import load_paper_records
+from .passage_index import get_passage_index
+
+PASSAGE_TOP_K = int(os.getenv("PASSAGE_TOP_K", 5))
+# Adjacent passages overlap, so one paper shouldn't fill the whole answer
+PASSAGES_PER_PAPER = 2
+
+
+def topic_papers(output_dir: str) -> dict:
+    """{pdf sha256: extracted record} for the papers parsed into ``output_dir``"""
+    path = resolve_artifact(os.path.join(output_dir, "extracted_content.json"))
+    if not os.path.exists(path):
+        return {}
+    return {record.sha256: record for record in load_paper_records(path) if record.sha256}
+
+
+class PassageSearchInput(BaseModel):
+    """Input schema for PassageSearchTool"""
+    query: str = Field(..., description="Question or keywords to find evidence for")
+    top_k: int = Field(default=None, description="Number of passages to return (default: PASSAGE_TOP_K)")
+    paper: str = Field(default=None, description="Only search papers whose title or DOI contains this text")
+    all_papers: bool = Field(default=False, description="Search every indexed paper, not just this review's")
+
+
+class PassageSearchTool(BaseTool):
+    name: str = "Passage Search Tool"
+    description: str = """
+    Finds the full-text passages most relevant to a question across the parsed papers (BM25 ranking).
+    Use it to pull concrete evidence - methods, datasets, numbers, limitations - beyond the
+    extracted section summaries.
+    Input: query (required), top_k (optional), paper (optional title/DOI filter),
+    all_papers (default=False: only papers of this review).
+    """
+    args_schema: Type[BaseModel] = PassageSearchInput
+    # Where extracted_content.json lives; it scopes searches to this review's papers
+    output_dir: str = "outputs"
+
+    @traced_tool
+    def _run(self, query: str, top_k: int = None, paper: str = None, all_papers: bool = False) -> str:
+        """Search the passage index"""
+        top_k = top_k or PASSAGE_TOP_K
+        print(f"\n🔎 Searching passages: {query}")
+        start = time.perf_counter()
+
+        index = get_passage_index()
+        shas = None
+        if not all_papers or paper:
+            records = topic_papers(self.output_dir)
+            if paper:
+                needle = paper.lower()
+                records = {sha: r for sha, r in records.items()
+                           if needle in (r.title or "").lower() or needle in (r.doi or "").lower()}
+                if not records:
+                    return json.dumps({"error": f"No parsed paper matches: {paper}"})
+            if records:
+                shas = set(records)
+            elif not all_papers:
+                return json.dumps({"error": f"No extracted content in {self.output_dir}; run the PDF Parser Tool first"})
+
+        hits = index.search(query, top_k=top_k, shas=shas, max_per_paper=PASSAGES_PER_PAPER)
+        results = []
+        for rank, hit in enumerate(hits, 1):
+            hit.pop("sha256")
+            results.append({"rank": rank, **hit})
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"✅ {len(results)} passages in {elapsed_ms:.1f} ms")
+
+        return json.dumps({
+            "query": query,
+            "searched_papers": len(shas) if shas is not None else index.stats()["papers"],
+            "results": results,
+            "elapsed_ms": round(elapsed_ms, 2),
+        }, indent=2, ensure_ascii=False)
@@ -0,0 +1,96 @@
+# tools/pdf_extraction.py
+# Text and section extraction for one PDF, kept free of crewai so the
+# sandbox process that runs it (pdf_limits) starts quickly
+import os
+
+import pymupdf  # PyMuPDF
+
+from .keyword_engine import term_counts
+from .near_duplicates import minhash
+from .paper_record import PaperRecord
+from .passage_index import index_document
+from .pdf_limits import ParseLimits
+from .section_segmenter import PageBudget, segment_document, segment_text, select_sections
+
+SECTION_CHARS = 1000
+# PageBudget stops where a limit left part of a document unread (an early
+# "sections" stop leaves it unread too, but nothing the paper needs)
+TRUNCATING_STOPS = ("pages", "text", "timeout")
+
+
+def extract_sections(text: str, spans: dict | None = None) -> dict:
+    """Slice paper sections out of ``text`` using segmenter offsets.
+
+    ``spans`` maps section name to (start, end) offsets; without it the text
+    is segmented with a single scan for heading lines.
+    """
+    if spans is None:
+        spans = select_sections(segment_text(text))
+    return {
+        section: text[start:min(end, start + SECTION_CHARS)]
+        for section, (start, end) in spans.items()
+    }
+
+
+def extract_content(paper: PaperRecord, sha: str | None = None, passage_root: str | None = None,
+                    limits: ParseLimits | None = None) -> dict | None:
+    """The body of ``parse_paper``; ``limits`` bound the pages and text read.
+
+    The content records how much of the document was read under
+    "processing", with the limits it stopped early under. Passages are
+    indexed once per PDF, so a parse that indexes them reads past the
+    point where every section is found.
+    """
+    file_path = paper.file_path
+    budget = None
+    if limits is not None:
+        early_stop = limits.stop_when_complete and not (passage_root and sha)
+        budget = PageBudget(limits.max_pages, limits.max_chars, limits.deadline(),
+                            SECTION_CHARS if early_stop else 0, limits.skip_textless)
+    try:
+        print(f"📄 Parsing: {os.path.basename(file_path)}")
+
+        # Extract text and section boundaries in one pass over the pages
+        with pymupdf.open(file_path) as doc:
+            full_text, boundaries = segment_document(doc, budget)
+
+        spans = select_sections(boundaries)
+        sections = extract_sections(full_text, spans)
+
+        # Reference lists are mostly author names and venues; keep them out of the keywords
+        body_end = next((b.start for b in boundaries
+                         if b.name is None and b.title.lower().startswith(("references", "bibliography"))),
+                        len(full_text))
+        if passage_root and sha:
+            index_document(passage_root, sha, paper.to_dict(), full_text[:body_end], spans)
+        signature = minhash(full_text[:body_end])
+
+        return {
+            "full_text_length": len(full_text),
+            "abstract": sections.get("abstract", "")[:1000],
+            "introduction": sections.get("introduction", "")[:1500],
+            "methodology": sections.get("methodology", "")[:1500],
+            "results": sections.get("results", "")[:1500],
+            "conclusion": sections.get("conclusion", "")[:1000],
+            # Ranked into "keywords" by TF-IDF once the whole corpus is parsed
+            "term_counts": term_counts(full_text[:body_end]),
+            # MinHash of the body text, to drop other versions of the same paper
+            "minhash": None if signature is None else signature.tolist(),
+            "processing": processing_report(budget, limits),
+        }
+
+    except MemoryError:
+        print(f"❌ Out of memory parsing {file_path}")
+        return {"skipped": "memory"}
+    except Exception as e:
+        print(f"❌ Error parsing {file_path}: {e}")
+        return None
+
+
+def processing_report(budget: PageBudget | None, limits: ParseLimits | None) -> dict | None:
+    if budget is None:
+        return None
+    report = budget.report()
+    if report["stopped"]:
+        report["limits"] = limits.signature
+    return report
@@ -0,0 +1,187 @@
+# tools/pdf_limits.py
+import importlib
+import io
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Connection
+from typing import NamedTuple
+
+try:
+    import resource
+except ImportError:  # Windows: no address-space limit (nor sandbox process, see run_isolated)
+    resource = None
+
+# Bounded parsing (PDF_BOUNDED=0 turns every limit off)
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 200))
+PDF_MAX_TEXT_CHARS = int(os.getenv("PDF_MAX_TEXT_CHARS", 2_000_000))
+# Seconds per document before the parse is killed; extraction winds down
+# at SOFT_TIMEOUT of it so the pages read so far are still used
+PDF_TIMEOUT = float(os.getenv("PDF_TIMEOUT", 60))
+SOFT_TIMEOUT = 0.8
+# Memory a document's parse may add on top of the sandbox process's own footprint
+PDF_MEMORY_MB = int(os.getenv("PDF_MEMORY_MB", 1024))
+
+
+def bounded_default() -> bool:
+    return os.getenv("PDF_BOUNDED", "1").lower() in ("1", "true", "yes")
+
+
+class ParseLimits(NamedTuple):
+    """Per-document budget for PDF parsing (0 means unlimited)"""
+    max_pages: int = 0
+    max_chars: int = 0
+    timeout: float = 0
+    memory_mb: int = 0
+    stop_when_complete: bool = False
+    skip_textless: bool = False
+
+    @classmethod
+    def from_env(cls, bounded: bool | None = None) -> "ParseLimits":
+        if not (bounded_default() if bounded is None else bounded):
+            return cls()
+        return cls(PDF_MAX_PAGES, PDF_MAX_TEXT_CHARS, PDF_TIMEOUT, PDF_MEMORY_MB, True, True)
+
+    @property
+    def isolated(self) -> bool:
+        """Whether each document runs in its own process, where it can be killed or capped"""
+        return bool(self.timeout or self.memory_mb)
+
+    @property
+    def signature(self) -> str:
+        """The limits that shape extraction output, to tell whether a partial cache entry still applies"""
+        return f"p{self.max_pages}:c{self.max_chars}" + (":s" if self.stop_when_complete else "")
+
+    def deadline(self) -> float | None:
+        return time.monotonic() + SOFT_TIMEOUT * self.timeout if self.timeout else None
+
+
+def _vm_bytes() -> int:
+    """Current address-space size of this process (0 if unknown)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def serve(fd: int, memory_mb: int, preload: str = ""):
+    """Sandbox process: import ``preload``, cap memory, then run calls
+    arriving on socket ``fd`` until it closes or memory ran out"""
+    if preload:
+        importlib.import_module(preload)
+    if memory_mb and resource is not None:
+        current = _vm_bytes()
+        if current:
+            limit = current + memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    conn = Connection(fd)
+    while True:
+        try:
+            fn, args = conn.recv()
+        except EOFError:
+            break
+        try:
+            result, exhausted = fn(*args), False
+        except MemoryError:
+            result, exhausted = {"skipped": "memory"}, True
+        try:
+            conn.send(result)
+        except MemoryError:
+            conn.send({"skipped": "memory"})
+            exhausted = True
+        if exhausted:
+            # The heap may be left fragmented at the cap; the next call gets a fresh process
+            break
+    conn.close()
+
+
+def _stdout():
+    """Where the sandbox prints: this process's stdout, or nowhere while it is redirected in memory"""
+    try:
+        return sys.stdout.fileno()
+    except (AttributeError, ValueError, io.UnsupportedOperation):
+        return subprocess.DEVNULL
+
+
+class Sandbox:
+    """A separate Python process that runs calls one at a time under a memory cap.
+
+    The process is a fresh interpreter (exec'd, never forked, so it is safe
+    to start from any thread) that imports only the ``preload`` module the
+    calls need. It is reused, keeping isolation to a socket round trip per
+    document, and only replaced after a call that timed out, crashed or ran
+    out of memory.
+    """
+
+    def __init__(self, memory_mb: int = 0, preload: str = ""):
+        self.memory_mb = memory_mb
+        self.preload = preload
+        self.pid = os.getpid()
+        self.process = None
+        self.conn = None
+
+    def _start(self):
+        parent, child = socket.socketpair()
+        command = f"import sys; from {__name__} import serve; serve(int(sys.argv[1]), int(sys.argv[2]), sys.argv[3])"
+        # The child resolves the package and the calls' modules the way this process does
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(path for path in sys.path if path)}
+        with child:
+            self.process = subprocess.Popen(
+                [sys.executable, "-c", command, str(child.fileno()), str(self.memory_mb), self.preload],
+                pass_fds=(child.fileno(),), env=env, stdin=subprocess.DEVNULL, stdout=_stdout())
+        self.conn = Connection(parent.detach())
+
+    def stop(self):
+        if self.process is None:
+            return
+        self.conn.close()
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        self.process = self.conn = None
+
+    def call(self, fn, args: tuple, timeout: float = 0):
+        """``fn(*args)`` in the sandbox, or ``{"skipped": reason}`` ("timeout",
+        "memory" or "crashed") when it didn't answer within ``timeout`` seconds"""
+        if self.process is None or self.process.poll() is not None:
+            self.stop()
+            self._start()
+        try:
+            self.conn.send((fn, args))
+            if not self.conn.poll(timeout or None):
+                self.stop()
+                return {"skipped": "timeout"}
+            return self.conn.recv()
+        except (EOFError, OSError):
+            self.stop()
+            return {"skipped": "crashed"}
+
+    def __del__(self):
+        if self.pid == os.getpid():
+            self.stop()
+
+
+_sandboxes = threading.local()
+
+
+def run_isolated(fn, args: tuple, timeout: float = 0, memory_mb: int = 0):
+    """Call ``fn(*args)`` in this thread's sandbox process, capped at
+    ``memory_mb`` more memory than the sandbox needs to import ``fn``'s
+    module and killed after ``timeout`` seconds. A pathological document
+    costs at most the sandbox, never the run. On Windows, where a socket
+    can't be handed to a child process this way, ``fn`` runs in this
+    process under its soft deadline only.
+    """
+    if os.name != "posix":
+        return fn(*args)
+    sandbox = getattr(_sandboxes, "sandbox", None)
+    if sandbox is None or sandbox.pid != os.getpid() or sandbox.memory_mb != memory_mb \
+            or sandbox.preload != fn.__module__:
+        if sandbox is not None and sandbox.pid == os.getpid():
+            sandbox.stop()
+        sandbox = _sandboxes.sandbox = Sandbox(memory_mb, fn.__module__)
+    return sandbox.call(fn, args, timeout)
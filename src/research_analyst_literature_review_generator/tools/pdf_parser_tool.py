@@ -1,121 +1,303 @@
 # tools/pdf_parser_tool.py
 import json
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Type
-import pymupdf  # PyMuPDF
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from ..tracing import traced, traced_tool
+from .artifacts import JSONLWriter, artifact_format, artifact_path
+from .keyword_engine import IncrementalTfidf, tfidf_keywords
+from .near_duplicates import NearDuplicateIndex, near_duplicate_note
+from .paper_record import PaperRecord, load_paper_records, write_paper_records
+from .passage_index import get_passage_index, passage_index_enabled
+from .pdf_extraction import TRUNCATING_STOPS, extract_content
+from .pdf_limits import ParseLimits, run_isolated
+from .pdf_store import sha256_file
+from .sqlite_cache import SQLiteCache
+
+# Bump whenever extraction output changes so stale cache entries are ignored
+PARSER_VERSION = "6"
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", 128 * 1024 * 1024))
+
+_extraction_cache = None
+_parse_pools = {}
+_parse_pool_lock = threading.Lock()
+
+
+def get_extraction_cache() -> SQLiteCache:
+    """Persistent cache of extracted content keyed by PDF SHA-256 and parser version"""
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = SQLiteCache("extraction.sqlite", max_bytes=EXTRACTION_CACHE_MAX_BYTES)
+    return _extraction_cache
+
+
+def get_parse_pool(max_workers: int | None = None) -> ProcessPoolExecutor:
+    """Process pool of ``max_workers`` processes shared by every parse in this
+    process that asks for that size (e.g. all topics of a batch).
+
+    One pool per size: later calls reuse it instead of paying worker start-up
+    again, and a pool in use by another topic is never resized under it.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    with _parse_pool_lock:
+        pool = _parse_pools.get(workers)
+        if pool is None:
+            pool = _parse_pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def parse_parallel_default() -> bool:
+    return os.getenv("PARSE_PARALLEL", "0").lower() in ("1", "true", "yes")
+
+
+def extraction_cache_key(sha: str) -> str:
+    return f"{PARSER_VERSION}:{sha}"
+
+
+def invalidate_extraction_cache(sha: str | None = None):
+    """Drop the cached extraction for one PDF hash, or everything if ``sha`` is None"""
+    cache = get_extraction_cache()
+    if sha:
+        cache.delete(extraction_cache_key(sha))
+    else:
+        cache.clear()
+
+
+@traced("pdf")
+def parse_paper(paper: PaperRecord, sha: str | None = None, passage_root: str | None = None,
+                limits: ParseLimits | None = None) -> dict | None:
+    """Parse one PDF into its extracted content (None on failure).
+
+    Module-level so it can run in a worker process; only the compact content
+    travels back to the parent, never the full text. With ``passage_root``
+    the body text is also chunked into a passage index segment for ``sha``.
+    Under ``limits`` the document is parsed in a child process that is
+    killed at the timeout or memory cap; it then comes back as
+    ``{"skipped": reason}``.
+    """
+    if limits is None or not limits.isolated:
+        return extract_content(paper, sha, passage_root, limits)
+    content = run_isolated(extract_content, (paper, sha, passage_root, limits), limits.timeout, limits.memory_mb)
+    if content is not None and "skipped" in content:
+        print(f"⛔ Skipped {os.path.basename(paper.file_path)}: {content['skipped']}")
+    return content
+
+
+def cache_usable(content: dict, limits: ParseLimits | None) -> bool:
+    """Whether a cached extraction serves a parse under ``limits``: complete
+    ones always do; ones that stopped early (at a limit, or once every section
+    was found) cover less text, so only under the limits they were read with"""
+    processing = content.get("processing")
+    if not processing or not processing["stopped"]:
+        return True
+    return limits is not None and processing.get("limits") == limits.signature
+
+
+def cacheable(content: dict | None) -> bool:
+    """Skipped documents and timed-out extractions depend on the machine, not the PDF"""
+    if content is None or "skipped" in content:
+        return False
+    return (content.get("processing") or {}).get("stopped") != "timeout"
+
+
+def build_extracted_record(paper: PaperRecord, content: dict, keywords: list, sha: str | None = None) -> PaperRecord:
+    """Combine paper metadata with (possibly cached) extracted content"""
+    fields = {key: value for key, value in content.items() if key not in ("term_counts", "minhash", "processing")}
+    # The PDF hash links the record to its passages in the passage index
+    return PaperRecord(title=paper.title, year=paper.year, doi=paper.doi, authors=paper.authors,
+                       sha256=sha, keywords=keywords, **fields)
+
+
+def report_processing(contents, skipped: list, truncated: list):
+    """Pass (paper, sha, content) through, noting documents the limits cut
+    short: skipped ones (no content, passed on as None) are appended to
+    ``skipped``, partly read or text-less ones to ``truncated``"""
+    for paper, sha, content in contents:
+        if content is not None and "skipped" in content:
+            skipped.append({"title": paper.title, "file": paper.file_path, "reason": content["skipped"]})
+            content = None
+        elif content is not None and content.get("processing"):
+            processing = content["processing"]
+            reason = "no_text" if processing["pages"] and processing["textless_pages"] == processing["pages"] \
+                else processing["stopped"] if processing["stopped"] in TRUNCATING_STOPS else None
+            if reason:
+                print(f"✂️ Truncated {os.path.basename(paper.file_path)}: {reason} "
+                      f"({processing['pages_read']} of {processing['pages']} pages read)")
+                truncated.append({"title": paper.title, "file": paper.file_path, "reason": reason,
+                                  "pages": processing["pages"], "pages_read": processing["pages_read"],
+                                  "textless_pages": processing["textless_pages"]})
+        yield paper, sha, content
+
+
+def drop_near_duplicates(contents, skipped: list):
+    """Pass (paper, sha, content) through, dropping papers whose body text
+    near-duplicates an earlier one (e.g. preprint and journal version);
+    dropped ones are appended to ``skipped``"""
+    dedup = NearDuplicateIndex()
+    kept = {}
+    for paper, sha, content in contents:
+        if content is not None:
+            representative, score = dedup.add(sha, content.get("minhash"))
+            if representative != sha:
+                skipped.append(near_duplicate_note(paper.to_dict(), kept[representative].to_dict(), score))
+                continue
+            kept[sha] = paper
+        yield paper, sha, content
+
+
+def iter_contents(to_parse: list, refresh_cache: bool = False, pool=None, passage_index=None,
+                  limits: ParseLimits | None = None):
+    """Yield (paper, sha, content) in input order as each paper becomes available.
+
+    Cache hits are served immediately; misses are parsed on ``pool`` when
+    given (``map()`` keeps input order) and written back to the cache. With
+    ``passage_index``, papers it lacks are parsed too (even if cached) so
+    their passages get indexed, and new segments are registered at the end.
+    Every parse is bounded by ``limits``.
+    """
+    cache = get_extraction_cache()
+    cached = [None if refresh_cache else cache.get_json(extraction_cache_key(sha)) for _, sha in to_parse]
+    cached = [hit if hit is not None and cache_usable(hit, limits) else None for hit in cached]
+    unindexed = [passage_index is not None and not passage_index.has(sha) for _, sha in to_parse]
+    pending = [(paper, sha, passage_index.root if missing else None, limits)
+               for (paper, sha), hit, missing in zip(to_parse, cached, unindexed) if hit is None or missing]
+    args = [list(column) for column in zip(*pending)] or [[], [], [], []]
+    parsed = pool.map(parse_paper, *args) if pool else map(parse_paper, *args)
+
+    for (paper, sha), content, missing in zip(to_parse, cached, unindexed):
+        if content is not None and not missing:
+            print(f"♻️ Cached: {os.path.basename(paper.file_path)}")
+        else:
+            parsed_content = next(parsed)
+            if content is None and cacheable(parsed_content):
+                cache.set_json(extraction_cache_key(sha), parsed_content)
+            content = content or parsed_content
+        yield paper, sha, content
+    print(f"📦 Parsed {len(pending)} PDFs, {len(to_parse) - len(pending)} from cache")
+    if passage_index is not None:
+        added = passage_index.refresh()
+        if added:
+            print(f"🔎 Indexed passages of {added} papers ({passage_index.stats()['passages']} passages in total)")
+
 
 class PDFParserInput(BaseModel):
     """Input schema for PDFParserTool"""
-    metadata_file: str = Field(..., description="Path to paper_metadata.json file")
+    metadata_file: str = Field(..., description="Path to paper_metadata.json (or .jsonl) file")
+    parallel: bool = Field(default=None, description="Parse papers on the shared process pool (default: PARSE_PARALLEL)")
+    max_workers: int = Field(default=None, description="Process pool size (default: number of cores)")
+    refresh_cache: bool = Field(default=False, description="Ignore cached extractions and re-parse every PDF")
+    output_format: str = Field(default=None, description="Artifact format: json or jsonl (streamed per paper)")
+    index_passages: bool = Field(default=None, description="Add full-text passages to the passage search index (default: PASSAGE_INDEX)")
+    bounded: bool = Field(default=None, description="Cap pages, text, time and memory per PDF (default: PDF_BOUNDED)")
 
 
 class PDFParserTool(BaseTool):
     name: str = "PDF Parser Tool"
     description: str = """
-    Extracts text content from research paper PDFs. 
+    Extracts text content from research paper PDFs.
     Parses abstract, methodology, findings, and conclusions.
-    Input: Path to metadata JSON file containing paper file paths.
+    Input: Path to metadata JSON file containing paper file paths,
+    parallel (default from PARSE_PARALLEL), max_workers (optional), refresh_cache (default=False),
+    output_format (optional: json/jsonl), index_passages (default from PASSAGE_INDEX),
+    bounded (default from PDF_BOUNDED).
+    Unchanged PDFs are served from the extraction cache; near-duplicate versions
+    of a paper are dropped. Bounded parsing stops reading a PDF once its sections
+    are found or its page, text or time budget runs out, and skips PDFs that
+    time out or exceed their memory cap; both are listed in the result.
     """
     args_schema: Type[BaseModel] = PDFParserInput
+    # Where extracted_content.json is written (one directory per topic in batch runs)
+    output_dir: str = "outputs"
 
-    def _run(self, metadata_file: str) -> str:
+    @traced_tool
+    def _run(self, metadata_file: str, parallel: bool = None, max_workers: int = None,
+             refresh_cache: bool = False, output_format: str = None, index_passages: bool = None,
+             bounded: bool = None) -> str:
         """Extract content from PDFs"""
         print(f"\n📖 Parsing PDFs from: {metadata_file}")
-        
+
+        try:
+            output_format = artifact_format(output_format)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+
         if not os.path.exists(metadata_file):
             return json.dumps({"error": f"Metadata file not found: {metadata_file}"})
-        
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            papers = json.load(f)
-        
-        extracted_data = []
-        
-        for paper in papers:
-            file_path = paper.get("file_path")
+
+        to_parse = []
+        seen_hashes = set()
+
+        for paper in load_paper_records(metadata_file):
+            file_path = paper.file_path
             if not file_path or not os.path.exists(file_path):
                 print(f"⚠️ File not found: {file_path}")
                 continue
-            
-            try:
-                print(f"📄 Parsing: {os.path.basename(file_path)}")
-                
-                # Extract text using PyMuPDF
-                doc = pymupdf.open(file_path)
-                full_text = ""
-                for page in doc:
-                    full_text += page.get_text()
-                doc.close()
-                
-                # Extract sections (simple heuristic)
-                sections = self._extract_sections(full_text)
-                
-                extracted_data.append({
-                    "title": paper.get("title"),
-                    "year": paper.get("year"),
-                    "doi": paper.get("doi"),
-                    "authors": paper.get("authors", []),
-                    "full_text_length": len(full_text),
-                    "abstract": sections.get("abstract", "")[:1000],
-                    "introduction": sections.get("introduction", "")[:1500],
-                    "methodology": sections.get("methodology", "")[:1500],
-                    "results": sections.get("results", "")[:1500],
-                    "conclusion": sections.get("conclusion", "")[:1000],
-                    "keywords": self._extract_keywords(full_text)
-                })
-                
-            except Exception as e:
-                print(f"❌ Error parsing {file_path}: {e}")
+
+            # Identical PDFs stored under different titles are parsed once;
+            # hash the file itself so a changed PDF never hits a stale entry
+            sha = sha256_file(file_path)
+            if sha in seen_hashes:
+                print(f"⏭️ Duplicate PDF, skipping: {os.path.basename(file_path)}")
                 continue
-        
-        # Save extracted content
-        output_path = os.path.join("outputs", "extracted_content.json")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(extracted_data, f, indent=2, ensure_ascii=False)
-        
-        print(f"✅ Extracted content from {len(extracted_data)} papers")
-        
-        return json.dumps({
-            "extracted_papers": len(extracted_data),
+            seen_hashes.add(sha)
+            to_parse.append((paper, sha))
+
+        output_path = artifact_path(os.path.join(self.output_dir, "extracted_content.json"), output_format)
+        os.makedirs(self.output_dir, exist_ok=True)
+        if parallel is None:
+            parallel = parse_parallel_default()
+        workers = max_workers or os.cpu_count() or 1
+        pool = get_parse_pool(workers) if parallel and workers > 1 and len(to_parse) > 1 else None
+        if index_passages is None:
+            index_passages = passage_index_enabled()
+        limits = ParseLimits.from_env(bounded)
+        near_duplicates, skipped, truncated = [], [], []
+        contents = drop_near_duplicates(report_processing(
+            iter_contents(to_parse, refresh_cache, pool, get_passage_index() if index_passages else None, limits),
+            skipped, truncated), near_duplicates)
+        if output_format == "jsonl":
+            # Append each record as soon as its paper is done, so a crash keeps
+            # what was parsed (with keywords ranked against the papers so far)
+            ranker = IncrementalTfidf()
+            parsed_papers = []
+            with JSONLWriter(output_path) as writer:
+                for paper, sha, content in contents:
+                    if content is not None:
+                        parsed_papers.append((paper, sha, content))
+                        writer.write(build_extracted_record(paper, content, ranker.add(content["term_counts"]), sha))
+        else:
+            parsed_papers = [(paper, sha, content) for paper, sha, content in contents if content is not None]
+        # Either way the saved keywords are ranked against the whole corpus
+        keywords = tfidf_keywords([content["term_counts"] for _, _, content in parsed_papers])
+        extracted_data = [
+            build_extracted_record(paper, content, paper_keywords, sha)
+            for (paper, sha, content), paper_keywords in zip(parsed_papers, keywords)
+        ]
+        extracted_count = len(extracted_data)
+        if output_format == "jsonl":
+            # Swap the final records in over the streamed ones in one step
+            root, ext = os.path.splitext(output_path)
+            tmp = f"{root}.{os.getpid()}.tmp{ext}"
+            write_paper_records(tmp, extracted_data)
+            os.replace(tmp, output_path)
+        else:
+            # Save extracted content
+            write_paper_records(output_path, extracted_data)
+
+        print(f"✅ Extracted content from {extracted_count} papers")
+
+        result = {
+            "extracted_papers": extracted_count,
             "output_file": output_path,
-            "papers": extracted_data
-        }, indent=2, ensure_ascii=False)
-    
-    def _extract_sections(self, text: str) -> dict:
-        """Extract paper sections using keyword matching"""
-        text_lower = text.lower()
-        sections = {}
-        
-        # Simple section extraction
-        section_keywords = {
-            "abstract": ["abstract"],
-            "introduction": ["introduction", "1. introduction"],
-            "methodology": ["methodology", "methods", "materials and methods"],
-            "results": ["results", "findings"],
-            "conclusion": ["conclusion", "discussion"]
+            "format": output_format,
+            "near_duplicates_skipped": near_duplicates,
+            "skipped_documents": skipped,
+            "truncated_documents": truncated
         }
-        
-        for section, keywords in section_keywords.items():
-            for keyword in keywords:
-                idx = text_lower.find(keyword)
-                if idx != -1:
-                    sections[section] = text[idx:idx+1000]
-                    break
-        
-        return sections
-    
-    def _extract_keywords(self, text: str) -> list:
-        """Extract potential keywords from text"""
-        common_words = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for"}
-        words = text.lower().split()
-        word_freq = {}
-        
-        for word in words:
-            word_clean = ''.join(c for c in word if c.isalnum())
-            if len(word_clean) > 4 and word_clean not in common_words:
-                word_freq[word_clean] = word_freq.get(word_clean, 0) + 1
-        
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, freq in sorted_words[:10]]
+        if output_format != "jsonl":
+            result["papers"] = [record.to_dict() for record in extracted_data]
+        return json.dumps(result, indent=2, ensure_ascii=False)
@@ -0,0 +1,119 @@
+# tools/pdf_store.py
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+from .doi import doi_key
+
+# Shared across topics and runs; topic directories hold hard links into it
+STORE_DIR = os.getenv("PAPER_STORE_DIR", os.path.join("papers", ".store"))
+
+
+def sha256_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def link_or_copy(source: str, target: str):
+    """Hard-link ``source`` to ``target`` (copy across filesystems), replacing ``target``"""
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    if os.path.exists(target) and os.path.samefile(source, target):
+        return
+    tmp = f"{target}.{threading.get_ident()}.tmp"
+    try:
+        os.link(source, tmp)
+    except OSError:
+        shutil.copyfile(source, tmp)
+    os.replace(tmp, target)
+
+
+class PDFStore:
+    """Content-addressed PDF store keyed by SHA-256 and normalized DOI.
+
+    Layout::
+
+        <root>/objects/<sha[:2]>/<sha>.pdf
+        <root>/index.json            {"doi": {doi_key: sha}}
+    """
+
+    def __init__(self, root: str | None = None):
+        self.root = root or STORE_DIR
+        self.index_path = os.path.join(self.root, "index.json")
+        self._lock = threading.Lock()
+        self._doi_index = self._load_index()
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("doi", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        # Merge with entries written by other processes since we loaded
+        merged = self._load_index()
+        merged.update(self._doi_index)
+        self._doi_index = merged
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"doi": merged}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.index_path)
+
+    def object_path(self, sha: str) -> str:
+        return os.path.join(self.root, "objects", sha[:2], f"{sha}.pdf")
+
+    def lookup(self, doi: str | None) -> str | None:
+        """SHA-256 of the stored PDF for ``doi``, if present"""
+        key = doi_key(doi)
+        if not key:
+            return None
+        with self._lock:
+            sha = self._doi_index.get(key)
+        if sha and os.path.exists(self.object_path(sha)):
+            return sha
+        return None
+
+    def link(self, sha: str, filepath: str):
+        """Materialize a stored PDF at ``filepath``"""
+        link_or_copy(self.object_path(sha), filepath)
+
+    def add(self, filepath: str, doi: str | None = None) -> str:
+        """Move a downloaded PDF into the store and link it back; returns its SHA-256.
+
+        If identical content is already stored, the new copy is dropped in
+        favour of the existing object.
+        """
+        sha = sha256_file(filepath)
+        obj = self.object_path(sha)
+        with self._lock:
+            if os.path.exists(obj):
+                os.remove(filepath)
+            else:
+                os.makedirs(os.path.dirname(obj), exist_ok=True)
+                shutil.move(filepath, obj)
+            key = doi_key(doi)
+            if key and self._doi_index.get(key) != sha:
+                self._doi_index[key] = sha
+                self._save_index()
+        self.link(sha, filepath)
+        return sha
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_pdf_store(root: str | None = None) -> PDFStore:
+    """One shared store per root, so concurrent topics update a single index"""
+    root = os.path.abspath(root or STORE_DIR)
+    with _stores_lock:
+        if root not in _stores:
+            _stores[root] = PDFStore(root)
+        return _stores[root]
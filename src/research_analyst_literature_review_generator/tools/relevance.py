@@ -0,0 +1,87 @@
+# tools/relevance.py
+import os
+import re
+
+import numpy as np
+
+from .artifacts import parse_json_text
+from .passage_index import tokenize
+
+# Candidates screened on metadata before any PDF is downloaded
+CANDIDATE_POOL = int(os.getenv("CANDIDATE_POOL", 500))
+
+# A title term counts as this many abstract terms
+TITLE_WEIGHT = 2
+# Added per occurrence (up to 3) of a multi-word keyword, on top of its terms
+PHRASE_BONUS = 1.0
+K1 = 1.2
+B = 0.75
+
+YEAR_RE = re.compile(r"\b\d{4}\b")
+
+
+def read_strategy(path: str) -> dict:
+    """research_strategy.json as a dict ({} if the file is missing or unreadable)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            strategy = parse_json_text(f.read())
+    except (OSError, ValueError):
+        return {}
+    return strategy if isinstance(strategy, dict) else {}
+
+
+def strategy_keywords(path: str) -> list:
+    """Keywords from research_strategy.json ([] if the file is missing or unreadable)"""
+    keywords = read_strategy(path).get("keywords")
+    return [k for k in keywords or [] if isinstance(k, str) and k.strip()]
+
+
+def strategy_year_range(path: str) -> tuple | None:
+    """(first, last) year of research_strategy.json's year_range, e.g. [2020, 2025] or "2020-2025" """
+    year_range = read_strategy(path).get("year_range")
+    if isinstance(year_range, str):
+        year_range = YEAR_RE.findall(year_range)
+    if not isinstance(year_range, (list, tuple)):
+        return None
+    years = [int(y) for y in year_range if str(y).strip().isdigit()]
+    return (min(years), max(years)) if len(years) == 2 else None
+
+
+def relevance_scores(titles: list, abstracts: list, keywords: list) -> np.ndarray:
+    """BM25 score of every candidate's title and abstract against ``keywords``.
+
+    Candidates are tokenized once; term frequencies for the keyword
+    vocabulary are gathered into a (candidates x terms) matrix with one
+    ``bincount`` and scored with a single matrix-vector product. Multi-word
+    keywords also earn a bonus per verbatim occurrence.
+    """
+    phrases = list(dict.fromkeys(" ".join(tokenize(k)) for k in keywords))
+    phrases = [p for p in phrases if p]
+    vocab = {term: i for i, term in enumerate(dict.fromkeys(t for p in phrases for t in p.split()))}
+    scores = np.zeros(len(titles))
+    if not vocab or not titles:
+        return scores
+
+    docs, terms, lengths, texts = [], [], [], []
+    for i, (title, abstract) in enumerate(zip(titles, abstracts)):
+        title_tokens, abstract_tokens = tokenize(title or ""), tokenize(abstract or "")
+        ids = [vocab[t] for t in title_tokens * TITLE_WEIGHT + abstract_tokens if t in vocab]
+        terms.extend(ids)
+        docs.extend([i] * len(ids))
+        lengths.append(len(title_tokens) * TITLE_WEIGHT + len(abstract_tokens))
+        texts.append(f" {' '.join(title_tokens)} {' '.join(abstract_tokens)} ")
+
+    n, v = len(titles), len(vocab)
+    tf = np.bincount(np.array(docs, dtype=np.int64) * v + np.array(terms, dtype=np.int64),
+                     minlength=n * v).reshape(n, v).astype(np.float64)
+    lengths = np.array(lengths, dtype=np.float64)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    norm = K1 * (1 - B + B * lengths / max(lengths.mean(), 1.0))
+    scores = (tf * (K1 + 1) / (tf + norm[:, None])) @ idf
+
+    texts = np.array(texts)
+    for phrase in phrases:
+        if " " in phrase:
+            scores += PHRASE_BONUS * np.minimum(np.char.count(texts, f" {phrase} "), 3)
+    return scores
@@ -0,0 +1,273 @@
+# tools/section_segmenter.py
+import re
+import time
+from collections import Counter
+from typing import NamedTuple
+
+import pymupdf  # PyMuPDF
+
+TARGET_SECTIONS = ("abstract", "introduction", "methodology", "results", "conclusion")
+
+# Heading titles we recognise (Title case or UPPER case), with a priority per
+# section (lower wins). Spelled out instead of re.IGNORECASE, which is several
+# times slower to scan with.
+_TITLES = [
+    ("abstract", 0, r"Abstract|ABSTRACT|[Aa] [Bb] [Ss] [Tt] [Rr] [Aa] [Cc] [Tt]"),
+    ("introduction", 0, r"Introduction|INTRODUCTION"),
+    ("methodology", 0, r"Materials and [Mm]ethods|(?:Research |Review |Proposed )?[Mm]ethodology|Methods?"
+                       r"|MATERIALS AND METHODS|(?:RESEARCH |REVIEW |PROPOSED )?METHODOLOGY|METHODS?"),
+    ("results", 0, r"Results and [Dd]iscussions?|(?:Experimental )?[Rr]esults|Findings"
+                   r"|RESULTS AND DISCUSSIONS?|(?:EXPERIMENTAL )?RESULTS|FINDINGS"),
+    ("conclusion", 0, r"Conclusions?(?: [Aa]nd [A-Za-z ]{1,40})?|Concluding [Rr]emarks"
+                      r"|CONCLUSIONS?(?: AND [A-Z ]{1,40})?|CONCLUDING REMARKS"),
+    ("conclusion", 1, r"Discussions?(?: [Aa]nd [A-Za-z ]{1,40})?|DISCUSSIONS?(?: AND [A-Z ]{1,40})?"),
+    (None, 0, r"References|REFERENCES|Bibliography|BIBLIOGRAPHY|Acknowledge?ments?|ACKNOWLEDGE?MENTS?"
+              r"|Appendix|APPENDIX"),
+]
+_NUMBER = r"(?:(?P<num>\d{1,2}(?:\.\d{1,2})*|[IVX]{1,5})\.?[ \t]+)?"
+_TITLE = "|".join(f"(?P<t{i}>{pattern})" for i, (_, _, pattern) in enumerate(_TITLES))
+# Inline headings ("Abstract—Since ...") end at a delimiter; others own the line
+_TAIL = r"(?P<inline>[ \t]*[—–:.][ \t]*)?(?P<rest>[^\n]*)"
+
+# Text mode: one scan for known titles at line starts. The literal "\n" prefix
+# and the lookahead on the first character keep the regex engine in its
+# fast search loop instead of trying every offset; the class must hold the
+# first character of every title in _TITLES (and of the numbering).
+HEADING_RE = re.compile(r"\n(?=[ \t\dIVXABCDEFMPRa])[ \t]*" + _NUMBER + f"(?:{_TITLE})" + r"\b" + _TAIL)
+TITLE_RE = re.compile(r"^" + _NUMBER + f"(?:{_TITLE})" + r"\b" + _TAIL + r"$")
+TOP_LEVEL_RE = re.compile(r"^(?:\d{1,2}|[IVX]{1,5})\.?[ \t]+[A-Z][^\n]{2,100}$")
+
+BOLD_FLAG = 16
+
+
+class Section(NamedTuple):
+    """A section boundary: canonical ``name`` (None for other headings), the
+    heading ``title`` and the ``start``/``end`` offsets of its content"""
+    name: str | None
+    title: str
+    start: int
+    end: int
+    priority: int = 0
+
+
+def _classify(match) -> tuple[str | None, int, bool] | None:
+    """(name, priority, marked) for a title match, or None if it isn't a heading.
+
+    ``marked`` means the line carries its own heading evidence (numbering, an
+    inline delimiter or letter-spaced small caps) beyond the title itself.
+    """
+    index = next(i for i in range(len(_TITLES)) if match.group(f"t{i}"))
+    name, priority, _ = _TITLES[index]
+    title = match.group(f"t{index}")
+    spaced = name == "abstract" and len(title) > len("abstract")  # "A B S T R A C T"
+    if not (title[0].isupper() or spaced):
+        # "results. The ..." / "methods are ..." are sentence fragments
+        return None
+    numbered = bool(match.group("num"))
+    inline = bool(match.group("inline"))
+    if not inline and match.group("rest").strip() and not numbered:
+        return None
+    return name, priority, numbered or inline or spaced
+
+
+def _close(boundaries: list, text_length: int) -> list:
+    """Turn (name, title, content_start, heading_start, priority) into Sections ending at the next heading"""
+    boundaries.sort(key=lambda b: b[3])
+    sections = []
+    for i, (name, title, start, _, priority) in enumerate(boundaries):
+        end = boundaries[i + 1][3] if i + 1 < len(boundaries) else text_length
+        sections.append(Section(name, title, start, max(start, end), priority))
+    return sections
+
+
+def _scan(text: str, base: int = 0) -> list:
+    """(name, title, content_start, heading_start, priority) for the heading
+    lines in ``text``, with offsets shifted by ``base``"""
+    boundaries = []
+    for match in HEADING_RE.finditer(text):
+        classified = _classify(match)
+        if classified is None:
+            continue
+        name, priority, _ = classified
+        heading_start = match.start() + 1
+        # Content starts after the delimiter of an inline heading, or on the next line
+        content_start = match.end("inline") if match.group("inline") else min(match.end() + 1, len(text))
+        title = text[heading_start:match.end()].strip() if not match.group("inline") else match.group(0).strip()[:80]
+        boundaries.append((name, title, content_start + base, heading_start + base, priority))
+    return boundaries
+
+
+def segment_text(text: str) -> list:
+    """Find section boundaries in plain text with a single regex scan"""
+    return _close(_scan(text), len(text))
+
+
+class PageBudget:
+    """Limits on one ``segment_document`` walk, and what the walk did under them.
+
+    The walk stops before a page once ``max_pages`` pages or ``max_chars``
+    characters have been read or ``deadline`` (a ``time.monotonic()`` value)
+    has passed, and after a page once every target section has a heading
+    and ``section_chars`` of content (or a following heading). Pages without
+    text operators or form XObjects (scans, full-page figures) are skipped
+    without running text extraction. A limit of 0 or None is off.
+    """
+
+    def __init__(self, max_pages: int = 0, max_chars: int = 0, deadline: float | None = None,
+                 section_chars: int = 0, skip_textless: bool = True):
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.deadline = deadline
+        self.section_chars = section_chars
+        self.skip_textless = skip_textless
+        self.pages = 0
+        self.pages_read = 0
+        self.textless_pages = 0
+        # Why the walk ended before the last page: "sections", "pages", "text" or "timeout"
+        self.stopped = None
+
+    def exhausted(self, pages_seen: int, chars: int) -> str | None:
+        if self.max_pages and pages_seen >= self.max_pages:
+            return "pages"
+        if self.max_chars and chars >= self.max_chars:
+            return "text"
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "timeout"
+        return None
+
+    def sections_complete(self, headings: list, chars: int) -> bool:
+        """Whether every target section's best heading and extract are already fixed.
+
+        ``headings`` are (name, priority, content_start, heading_start) in
+        document order. Later headings can't displace a first priority-0
+        one, and its extract can't change once it's ``section_chars`` long
+        or closed by the next heading.
+        """
+        if not self.section_chars:
+            return False
+        complete = set()
+        for i, (name, priority, start, _) in enumerate(headings):
+            if name is None or priority or name in complete:
+                continue
+            end = headings[i + 1][3] if i + 1 < len(headings) else None
+            if end is not None or chars - start >= self.section_chars:
+                complete.add(name)
+        return len(complete) == len(TARGET_SECTIONS)
+
+    def report(self) -> dict:
+        return {"pages": self.pages, "pages_read": self.pages_read,
+                "textless_pages": self.textless_pages, "stopped": self.stopped}
+
+
+def is_textless(page) -> bool:
+    """True for a page that can't yield text: no text operators in its
+    content stream and no form XObjects (which may carry their own)"""
+    return b"BT" not in page.read_contents() and not page.get_xobjects()
+
+
+def _heading(stripped: str, size: float, bold: bool, body_size: float):
+    """(name, priority, match) for a candidate line that is a heading, else None"""
+    styled = bold or size >= body_size + 0.8
+    match = TITLE_RE.match(stripped)
+    classified = _classify(match) if match else None
+    if classified and (styled or classified[2]):
+        return classified[0], classified[1], match
+    if styled and TOP_LEVEL_RE.match(stripped):
+        return None, 0, None
+    return None
+
+
+def _layout_boundaries(doc, page_numbers: list, full_text: str) -> list:
+    """Heading boundaries from font size, the bold flag and numbered-heading
+    patterns in the PyMuPDF blocks of ``page_numbers`` (whose text makes up
+    ``full_text``)"""
+    offset = 0
+    sizes = Counter()
+    candidates = []
+    for page_number in page_numbers:
+        for block in doc[page_number].get_text("dict", flags=pymupdf.TEXTFLAGS_TEXT)["blocks"]:
+            for line in block.get("lines", ()):
+                spans = line["spans"]
+                text = "".join([span["text"] for span in spans])
+                if spans:
+                    size = round(spans[0]["size"], 1)
+                    sizes[size] += len(text)
+                    stripped = text.strip()
+                    if 0 < len(stripped) <= 100:
+                        bold = bool(spans[0]["flags"] & BOLD_FLAG) or "bold" in spans[0]["font"].lower()
+                        candidates.append((offset, len(text), stripped, size, bold))
+                offset += len(text) + 1
+    body_size = sizes.most_common(1)[0][0] if sizes else 0.0
+
+    boundaries = []
+    for line_start, length, stripped, size, bold in candidates:
+        heading = _heading(stripped, size, bold, body_size)
+        if heading is None:
+            continue
+        name, priority, match = heading
+        if match is None:
+            boundaries.append((None, stripped, line_start + length + 1, line_start, 0))
+            continue
+        if match.group("inline"):
+            line = full_text[line_start:line_start + length]
+            content_start = line_start + (len(line) - len(line.lstrip())) + match.end("inline")
+        else:
+            content_start = line_start + length + 1
+        boundaries.append((name, stripped[:80], content_start, line_start, priority))
+    return boundaries
+
+
+def segment_document(doc, budget: PageBudget | None = None, layout: bool = False) -> tuple[str, list]:
+    """Read each page's text once, returning the full text and its section boundaries.
+
+    Headings are found with the plain-text scan page by page. The layout
+    pass (font size, bold flag, numbered headings), which costs more than
+    the text extraction itself, only runs when that scan finds no target
+    section, or always with ``layout``. Without ``budget`` the text is
+    identical to joining ``page.get_text()`` over all pages; with one, the
+    walk skips text-less pages and ends early as the budget says.
+    """
+    parts = []
+    offset = 0
+    page_numbers = []
+    boundaries = []
+
+    if budget is not None:
+        budget.pages = len(doc)
+    for page_number, page in enumerate(doc):
+        if budget is not None:
+            budget.stopped = budget.exhausted(page_number, offset)
+            if budget.stopped:
+                break
+            if budget.skip_textless and is_textless(page):
+                budget.textless_pages += 1
+                continue
+            budget.pages_read += 1
+        page_text = page.get_text(flags=pymupdf.TEXTFLAGS_TEXT)
+        page_numbers.append(page_number)
+        # The leading "\n" lets a heading open the page (or the document)
+        boundaries.extend(_scan("\n" + page_text, offset - 1))
+        parts.append(page_text)
+        offset += len(page_text)
+        if budget is not None and budget.section_chars and page_number + 1 < len(doc) and not layout:
+            headings = [(name, priority, start, heading_start) for name, _, start, heading_start, priority in boundaries]
+            if budget.sections_complete(headings, offset):
+                budget.stopped = "sections"
+                break
+
+    full_text = "".join(parts)
+    if layout or not any(name for name, *_ in boundaries):
+        boundaries = _layout_boundaries(doc, page_numbers, full_text)
+    return full_text, _close(boundaries, len(full_text))
+
+
+def select_sections(sections: list) -> dict:
+    """Pick one span per target section: best priority, then first occurrence"""
+    chosen = {}
+    for section in sections:
+        if section.name is None:
+            continue
+        best = chosen.get(section.name)
+        if best is None or section.priority < best.priority:
+            chosen[section.name] = section
+    return {name: (s.start, s.end) for name, s in chosen.items()}
@@ -0,0 +1,116 @@
+# tools/sqlite_cache.py
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# Persistent caches (API responses, parsed PDFs, ...) live here by default
+CACHE_DIR = os.getenv("RESEARCH_CACHE_DIR", ".cache")
+# Writes between exact size counts; in between, a running total decides
+# whether eviction is due
+SIZE_CHECK_WRITES = 64
+# Eviction frees space down to this share of max_bytes, so it isn't due
+# again on the very next write
+EVICT_TO = 0.9
+
+
+class SQLiteCache:
+    """Small persistent key/value cache with per-entry TTL and LRU size eviction.
+
+    Values are zlib-compressed bytes; ``get_json``/``set_json`` wrap them for
+    JSON payloads. Safe to share between threads; WAL mode lets several
+    processes use the same file.
+    """
+
+    def __init__(self, filename: str, max_bytes: int = 256 * 1024 * 1024, path: str | None = None):
+        self.path = os.path.abspath(path or os.path.join(CACHE_DIR, filename))
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        # Estimated total size (other processes' writes aren't in it); None until counted
+        self._total = None
+        self._writes = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+            " expires REAL, accessed REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._conn.commit()
+
+    def get(self, key: str, allow_expired: bool = False) -> bytes | None:
+        """Cached value, or None if missing (or expired unless ``allow_expired``)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires = row
+            if expires is not None and expires < now and not allow_expired:
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return zlib.decompress(value)
+
+    def set(self, key: str, value: bytes, ttl: float | None = None):
+        """Store ``value``; ``ttl`` seconds until it expires (None = never)"""
+        now = time.time()
+        blob = zlib.compress(value)
+        expires = now + ttl if ttl is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires, accessed, size) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, expires, now, len(blob)),
+            )
+            self._evict(len(blob))
+            self._conn.commit()
+
+    def get_json(self, key: str, allow_expired: bool = False):
+        value = self.get(key, allow_expired=allow_expired)
+        return None if value is None else json.loads(value)
+
+    def set_json(self, key: str, value, ttl: float | None = None):
+        self.set(key, json.dumps(value, ensure_ascii=False).encode("utf-8"), ttl=ttl)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._total = 0
+
+    def _evict(self, added: int):
+        # Expired entries are kept for offline replay; only size evicts (LRU).
+        # The running total only grows (replaced and deleted entries still
+        # count), which just brings the exact count forward; other processes'
+        # writes are picked up by the periodic count
+        self._writes += 1
+        if self._total is not None and self._writes % SIZE_CHECK_WRITES:
+            self._total += added
+            if self._total <= self.max_bytes:
+                return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICT_TO
+            while total > target:
+                oldest = self._conn.execute(
+                    "SELECT key, size FROM entries ORDER BY accessed LIMIT 256"
+                ).fetchall()
+                if not oldest:
+                    break
+                for key, size in oldest:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    total -= size
+                    if total <= target:
+                        break
+        self._total = total
@@ -0,0 +1,161 @@
+# tools/unpaywall_resolver.py
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .doi import doi_key
+from .sqlite_cache import SQLiteCache
+
+# Positive answers change rarely; "no OA copy" is re-checked sooner. A failed
+# lookup (timeout, 5xx) is no answer: it only holds off retries for a while
+UNPAYWALL_POSITIVE_TTL = float(os.getenv("UNPAYWALL_POSITIVE_TTL", 30 * 24 * 3600))
+UNPAYWALL_NEGATIVE_TTL = float(os.getenv("UNPAYWALL_NEGATIVE_TTL", 7 * 24 * 3600))
+UNPAYWALL_ERROR_TTL = float(os.getenv("UNPAYWALL_ERROR_TTL", 15 * 60))
+UNPAYWALL_RATE = float(os.getenv("UNPAYWALL_RATE", 10))  # requests per second
+# Longest Retry-After a 429 may pause lookups for
+UNPAYWALL_MAX_RETRY_AFTER = 60.0
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart across threads"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self, cancel: threading.Event | None = None):
+        """Block until this call's slot (returns early once ``cancel`` is set)"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            if cancel is not None:
+                cancel.wait(slot - now)
+            else:
+                time.sleep(slot - now)
+
+    def pause(self, seconds: float):
+        """Hold every caller off for ``seconds`` (e.g. after a 429)"""
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+
+
+def retry_after(response, default: float = 1.0) -> float:
+    """Seconds a 429 response asks to wait (Retry-After in seconds), capped"""
+    try:
+        seconds = float(response.headers.get("Retry-After", default))
+    except (TypeError, ValueError):
+        seconds = default
+    return min(max(seconds, 0.0), UNPAYWALL_MAX_RETRY_AFTER)
+
+
+class UnpaywallResolver:
+    """DOI → OA PDF URL resolution with a persistent positive/negative cache.
+
+    Concurrent lookups of the same DOI share one request, and
+    ``resolve_many`` resolves a batch on a thread pool within the rate limit.
+    Failed lookups
+    are remembered briefly so they aren't retried on every call, but never
+    count as "no OA copy"; a 429 pauses all lookups and isn't cached.
+    """
+
+    def __init__(self, session, email: str, rate: float = UNPAYWALL_RATE, cache: SQLiteCache | None = None):
+        self.session = session
+        self.email = email
+        self.limiter = RateLimiter(rate)
+        self.cache = cache or SQLiteCache("unpaywall.sqlite")
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def cached(self, doi: str | None) -> tuple[bool, str | None]:
+        """(known, pdf_url) from the cache without any network request
+        (a recently failed lookup is unknown)"""
+        key = doi_key(doi)
+        if not key:
+            return True, None
+        entry = self.cache.get_json(key)
+        if entry is None or entry.get("error"):
+            return False, None
+        return True, entry.get("url")
+
+    def is_known_negative(self, doi: str | None) -> bool:
+        known, url = self.cached(doi)
+        return known and url is None
+
+    def resolve(self, doi: str | None) -> str | None:
+        """OA PDF URL for ``doi``, or None"""
+        key = doi_key(doi)
+        if not key:
+            return None
+        entry = self.cache.get_json(key)
+        if entry is not None:
+            # Includes a failed lookup still backing off: no URL, no request
+            return entry.get("url")
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            url = self._fetch(key)
+            future.set_result(url)
+            return url
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def resolve_many(self, dois: list, max_workers: int = 8) -> dict:
+        """Resolve a batch of DOIs concurrently; returns {doi: pdf_url or None}.
+        Answers already cached cost no request or thread"""
+        results = {}
+        unknown = []
+        for doi in dict.fromkeys(d for d in dois if d):
+            known, url = self.cached(doi)
+            if known:
+                results[doi] = url
+            else:
+                unknown.append(doi)
+        if unknown:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unknown))),
+                                    thread_name_prefix="unpaywall") as pool:
+                results.update(zip(unknown, pool.map(self.resolve, unknown)))
+        return results
+
+    def _fetch(self, key: str) -> str | None:
+        base = os.getenv("UNPAYWALL_BASE_URL", "https://api.unpaywall.org/v2")
+        url = f"{base}/{key}?email={self.email}"
+        self.limiter.wait()
+        try:
+            r = self.session.get(url, timeout=20)
+        except Exception:
+            self.cache.set_json(key, {"url": None, "error": True}, ttl=UNPAYWALL_ERROR_TTL)
+            return None
+
+        if r.status_code == 429:
+            self.limiter.pause(retry_after(r))
+            return None
+        if r.status_code == 404:
+            self.cache.set_json(key, {"url": None}, ttl=UNPAYWALL_NEGATIVE_TTL)
+            return None
+        if r.status_code != 200:
+            self.cache.set_json(key, {"url": None, "error": True}, ttl=UNPAYWALL_ERROR_TTL)
+            return None
+
+        try:
+            loc = r.json().get("best_oa_location") or {}
+        except ValueError:
+            loc = {}
+        pdf_url = loc.get("url_for_pdf")
+        ttl = UNPAYWALL_POSITIVE_TTL if pdf_url else UNPAYWALL_NEGATIVE_TTL
+        self.cache.set_json(key, {"url": pdf_url}, ttl=ttl)
+        return pdf_url
@@ -0,0 +1,266 @@
+# src/research_analyst_literature_review_generator/tracing.py
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+# Span categories, outermost first
+TRACE_CATEGORIES = ("task", "agent", "llm", "tool", "download", "http", "pdf")
+TRACE_FILENAME = "trace.json"
+
+_tracer = None
+_stage = contextvars.ContextVar("trace_stage", default=None)
+
+
+def tracing_enabled(trace: bool | None = None) -> bool:
+    """Resolve the per-run switch from the argument or TRACE"""
+    if trace is None:
+        return os.getenv("TRACE", "0").lower() not in ("", "0", "false", "off", "no")
+    return trace
+
+
+class NullSpan:
+    """What ``span`` returns while tracing is off: every operation is a no-op"""
+    active = False
+
+    def set(self, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    active = True
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, stage: str | None, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.stage = stage
+        self.args = args
+        self._token = None
+
+    def set(self, **args):
+        """Attach results known only at the end (status, bytes, tokens, ...)"""
+        self.args.update(args)
+
+    def __enter__(self):
+        if self.cat == "task":
+            self._token = _stage.set(self.stage)
+            self.tracer.current_stage = self.stage
+        self.tid = threading.get_ident()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+        if self.cat == "task":
+            _stage.reset(self._token)
+        self.tracer.complete(self.name, self.cat, self.start, end, self.tid, self.stage, self.args)
+        return False
+
+
+class Tracer:
+    """Collects timed spans from every thread of a run.
+
+    Events are kept as Chrome trace-event "complete" records, so a run can be
+    opened in chrome://tracing or Perfetto; ``summary`` rolls them up per
+    pipeline stage and category.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.current_stage = None
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._threads = {}
+        # Agent loops hop between asyncio worker threads, so iterations are
+        # keyed by agent and drawn on one synthetic track per agent
+        self._iterations = {}  # agent key -> [role, index, start ns, stage]
+        self._agent_tracks = {}
+
+    def span(self, name: str, cat: str, stage: str | None = None, **args) -> Span:
+        # Worker threads don't inherit the context; fall back to the latest stage
+        stage = stage or (name if cat == "task" else _stage.get() or self.current_stage)
+        return Span(self, name, cat, stage, args)
+
+    def complete(self, name, cat, start, end, tid, stage, args, thread_name: str | None = None):
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start - self._origin) / 1000,
+            "dur": (end - start) / 1000,
+            "pid": os.getpid(),
+            "tid": tid,
+            "args": {"stage": stage, **args},
+        }
+        with self._lock:
+            self.events.append(event)
+            if tid not in self._threads:
+                self._threads[tid] = thread_name or threading.current_thread().name
+
+    def agent_iteration(self, key: int, role: str):
+        """Mark the start of an agent iteration (one LLM call plus the tool it asks for)"""
+        now = time.perf_counter_ns()
+        with self._lock:
+            previous = self._iterations.get(key)
+            index = previous[1] + 1 if previous else 1
+            self._iterations[key] = [role, index, now, _stage.get() or self.current_stage]
+            track = self._agent_tracks.setdefault(key, len(self._agent_tracks) + 1)
+        if previous:
+            self._complete_iteration(previous, now, track)
+
+    def end_iteration(self, key: int):
+        """Close the agent's open iteration (it gave its final answer)"""
+        with self._lock:
+            iteration = self._iterations.get(key)
+            if iteration:
+                # Keep the index: the agent may run another task
+                self._iterations[key] = [iteration[0], iteration[1], None, None]
+            track = self._agent_tracks.get(key)
+        if iteration and iteration[2] is not None:
+            self._complete_iteration(iteration, time.perf_counter_ns(), track)
+
+    def close_iterations(self):
+        for key in list(self._iterations):
+            self.end_iteration(key)
+
+    def _complete_iteration(self, iteration: list, end: int, track: int):
+        role, index, start, stage = iteration
+        if start is None:
+            return
+        self.complete(f"{role} #{index}", "agent", start, end, track, stage, {"agent": role, "iteration": index},
+                      thread_name=f"agent: {role}")
+
+    def chrome_trace(self) -> dict:
+        with self._lock:
+            events = sorted(self.events, key=lambda e: e["ts"])
+            threads = dict(self._threads)
+        metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                    for tid, name in threads.items()]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms",
+                "otherData": {"summary": self.summary()}}
+
+    def summary(self) -> list:
+        """One row per (stage, category): span count, total and max milliseconds, bytes and tokens"""
+        rows = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "bytes": 0,
+                                    "prompt_tokens": 0, "completion_tokens": 0, "errors": 0})
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            args = event["args"]
+            row = rows[(args.get("stage") or "-", event["cat"])]
+            ms = event["dur"] / 1000
+            row["count"] += 1
+            row["total_ms"] += ms
+            row["max_ms"] = max(row["max_ms"], ms)
+            row["bytes"] += args.get("bytes") or 0
+            row["prompt_tokens"] += args.get("prompt_tokens") or 0
+            row["completion_tokens"] += args.get("completion_tokens") or 0
+            row["errors"] += "error" in args
+        order = {cat: i for i, cat in enumerate(TRACE_CATEGORIES)}
+        stages = list(dict.fromkeys(e["args"].get("stage") or "-" for e in sorted(events, key=lambda e: e["ts"])))
+        return [
+            {"stage": stage, "category": cat, **{k: round(v, 2) if isinstance(v, float) else v for k, v in row.items()}}
+            for (stage, cat), row in sorted(rows.items(), key=lambda kv: (stages.index(kv[0][0]),
+                                                                             order.get(kv[0][1], len(order))))
+        ]
+
+    def export(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+        return path
+
+
+def format_summary(rows: list) -> str:
+    """The per-stage summary as a plain-text table"""
+    header = f"{'stage':<30} {'category':<9} {'count':>6} {'total ms':>11} {'max ms':>10} {'bytes':>11} " \
+             f"{'tok in':>8} {'tok out':>8}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(f"{row['stage'][:30]:<30} {row['category']:<9} {row['count']:>6} {row['total_ms']:>11.1f} "
+                     f"{row['max_ms']:>10.1f} {row['bytes']:>11} {row['prompt_tokens']:>8} "
+                     f"{row['completion_tokens']:>8}")
+    return "\n".join(lines)
+
+
+def get_tracer() -> Tracer | None:
+    return _tracer
+
+
+def start_tracing() -> Tracer:
+    """Start collecting spans process-wide (returns the already active tracer, if any)"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing() -> Tracer | None:
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.close_iterations()
+    return tracer
+
+
+def span(name: str, cat: str, stage: str | None = None, **args):
+    """A timed span, or the shared no-op span when tracing is off"""
+    tracer = _tracer
+    if tracer is None:
+        return NULL_SPAN
+    return tracer.span(name, cat, stage, **args)
+
+
+def agent_iteration(agent) -> None:
+    tracer = _tracer
+    if tracer is not None and agent is not None:
+        tracer.agent_iteration(id(agent), getattr(agent, "role", str(agent)).strip())
+
+
+def agent_finished(agent) -> None:
+    tracer = _tracer
+    if tracer is not None and agent is not None:
+        tracer.end_iteration(id(agent))
+
+
+def traced(cat: str, name: str | None = None):
+    """Decorator: run the function inside a span of category ``cat``"""
+    def decorator(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return fn(*args, **kwargs)
+            with _tracer.span(label, cat):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def traced_tool(run):
+    """Decorator for a tool's ``_run``: one "tool" span named after the tool"""
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs):
+        if _tracer is None:
+            return run(self, *args, **kwargs)
+        with _tracer.span(self.name, "tool") as s:
+            result = run(self, *args, **kwargs)
+            s.set(result_chars=len(result) if isinstance(result, str) else None)
+            return result
+    return wrapper